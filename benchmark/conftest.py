@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import importlib.util
+
+import pytest
+
+from benchmark.synthetic import SIZES, make_system
+
+if (
+    importlib.util.find_spec("pytest_codspeed") is None
+    and importlib.util.find_spec("pytest_benchmark") is None
+):
+    # without a benchmark plugin, the benchmarks are run once as smoke tests
+
+    def pytest_configure(config):
+        config.addinivalue_line("markers", "benchmark: mark a benchmark")
+
+    @pytest.fixture
+    def benchmark():
+        def run(func, *args, **kwargs):
+            return func(*args, **kwargs)
+
+        return run
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: "natoms{}-nframes{}".format(*size))
+def system(request):
+    """A random labeled system of each size."""
+    natoms, nframes = request.param
+    return make_system(natoms, nframes)
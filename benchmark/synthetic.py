@@ -0,0 +1,311 @@
+"""Synthetic systems and input files for benchmarks.
+
+The data are generated on the fly with a fixed random seed, so the
+benchmarks do not depend on large files stored in the repository. The
+writers only emit what the corresponding dpdata readers parse.
+"""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+import dpdata
+
+ATOM_NAMES = ["O", "H"]
+# (natoms, nframes) of the benchmarked systems
+SIZES = [(16, 10), (16, 100), (128, 10)]
+
+
+def make_system(
+    natoms: int, nframes: int, labeled: bool = True, seed: int = 0
+) -> dpdata.System:
+    """Generate a random water-like system.
+
+    Parameters
+    ----------
+    natoms : int
+        number of atoms, one third of which are O
+    nframes : int
+        number of frames
+    labeled : bool, default=True
+        whether to generate energies, forces and virials
+    seed : int, default=0
+        random seed
+
+    Returns
+    -------
+    dpdata.System or dpdata.LabeledSystem
+        the generated system
+    """
+    rng = np.random.default_rng(seed)
+    n_o = max(natoms // 3, 1)
+    atom_numbs = [n_o, natoms - n_o]
+    # about the density of water
+    length = (natoms * 10.0) ** (1.0 / 3.0)
+    cells = np.tile(np.eye(3) * length, (nframes, 1, 1))
+    data = {
+        "atom_names": list(ATOM_NAMES),
+        "atom_numbs": atom_numbs,
+        "atom_types": np.repeat(np.arange(2), atom_numbs),
+        "orig": np.zeros(3),
+        "cells": cells,
+        "coords": rng.random((nframes, natoms, 3)) * length,
+    }
+    if not labeled:
+        return dpdata.System(data=data)
+    virials = rng.normal(size=(nframes, 3, 3))
+    data["energies"] = rng.normal(size=nframes) - 10.0 * natoms
+    data["forces"] = rng.normal(size=(nframes, natoms, 3))
+    data["virials"] = (virials + virials.transpose(0, 2, 1)) / 2
+    return dpdata.LabeledSystem(data=data)
+
+
+def _format_rows(array: np.ndarray, prefix: list[str] | None = None) -> str:
+    """Format a 2D array as lines of fixed-width floats."""
+    rows = [" ".join(f"{xx:16.10f}" for xx in row) for row in array]
+    if prefix is not None:
+        rows = [f"{pp} {rr}" for pp, rr in zip(prefix, rows)]
+    return "".join(f" {rr}\n" for rr in rows)
+
+
+def _symbols(system: dpdata.System) -> list[str]:
+    return [system["atom_names"][tt] for tt in system["atom_types"]]
+
+
+def write_outcar(fname: str, system: dpdata.LabeledSystem) -> None:
+    """Write a system as a VASP OUTCAR file.
+
+    Parameters
+    ----------
+    fname : str
+        the OUTCAR file
+    system : dpdata.LabeledSystem
+        the system
+    """
+    lines = [f"   TITEL  = PAW_PBE {name} 08Apr2002\n" for name in system["atom_names"]]
+    lines.append(
+        "   ions per type =  " + " ".join(f"{nn:4d}" for nn in system["atom_numbs"])
+    )
+    lines.append("\n   NWRITE =      2\n   NELM   =     60;\n")
+    for ii in range(system.get_nframes()):
+        cell = system["cells"][ii]
+        volume = np.linalg.det(cell)
+        # virials in eV; the reader converts the stress in kB back to eV
+        stress = system["virials"][ii] / volume * 1602.1766208
+        lines.append(
+            f"-------------------- Iteration    {ii + 1}(   1)  --------------------\n"
+        )
+        lines.append(" VOLUME and BASIS-vectors are now :\n")
+        lines.append(" " + "-" * 60 + "\n")
+        lines.append("  energy-cutoff  :      400.00\n")
+        lines.append(f"  volume of cell : {volume:12.2f}\n")
+        lines.append(
+            "      direct lattice vectors                 reciprocal lattice\n"
+        )
+        lines.append(_format_rows(np.concatenate((cell, np.linalg.inv(cell).T), 1)))
+        lines.append("\n  FORCE on cell =-STRESS in cart. coord.  units (eV):\n")
+        lines.append("\n" * 13)
+        lines.append(
+            "  in kB "
+            + " ".join(
+                f"{stress[aa, bb]:12.5f}"
+                for aa, bb in ((0, 0), (1, 1), (2, 2), (0, 1), (1, 2), (2, 0))
+            )
+            + "\n\n"
+        )
+        lines.append(
+            " POSITION                                       TOTAL-FORCE (eV/Angst)\n"
+        )
+        lines.append(" " + "-" * 80 + "\n")
+        lines.append(
+            _format_rows(
+                np.concatenate((system["coords"][ii], system["forces"][ii]), 1)
+            )
+        )
+        lines.append(" " + "-" * 80 + "\n")
+        lines.append(f"  free  energy   TOTEN  = {system['energies'][ii]:18.8f} eV\n\n")
+    with open(fname, "w") as fp:
+        fp.write("".join(lines))
+
+
+def write_vasprun(fname: str, system: dpdata.LabeledSystem) -> None:
+    """Write a system as a VASP vasprun.xml file.
+
+    Parameters
+    ----------
+    fname : str
+        the vasprun.xml file
+    system : dpdata.LabeledSystem
+        the system
+    """
+
+    def varray(name, array):
+        rows = "".join(
+            "   <v>" + " ".join(f"{xx:16.8f}" for xx in row) + " </v>\n"
+            for row in array
+        )
+        return f'  <varray name="{name}" >\n{rows}  </varray>\n'
+
+    lines = ['<?xml version="1.0" encoding="ISO-8859-1"?>\n<modeling>\n']
+    lines.append(
+        ' <parameters>\n  <i type="int" name="NELM">     60</i>\n </parameters>\n'
+    )
+    lines.append(' <atominfo>\n  <array name="atoms" >\n   <set>\n')
+    for tt in system["atom_types"]:
+        name = system["atom_names"][tt]
+        lines.append(f"    <rc><c>{name:2s}</c><c>   {tt + 1}</c></rc>\n")
+    lines.append("   </set>\n  </array>\n </atominfo>\n")
+    for ii in range(system.get_nframes()):
+        cell = system["cells"][ii]
+        volume = np.linalg.det(cell)
+        stress = system["virials"][ii] / volume * 1602.1766208
+        frac = np.linalg.solve(cell.T, system["coords"][ii].T).T
+        lines.append(" <calculation>\n")
+        lines.append("  <scstep>\n   <energy>\n   </energy>\n  </scstep>\n" * 3)
+        lines.append("  <structure>\n   <crystal>\n")
+        lines.append(varray("basis", cell))
+        lines.append("   </crystal>\n")
+        lines.append(varray("positions", frac))
+        lines.append("  </structure>\n")
+        lines.append(varray("forces", system["forces"][ii]))
+        lines.append(varray("stress", stress))
+        lines.append(
+            "  <energy>\n"
+            f'   <i name="e_fr_energy"> {system["energies"][ii]:16.8f} </i>\n'
+            "  </energy>\n"
+        )
+        lines.append(" </calculation>\n")
+    lines.append("</modeling>\n")
+    with open(fname, "w") as fp:
+        fp.write("".join(lines))
+
+
+def write_cp2k_aimd(directory: str, system: dpdata.LabeledSystem) -> None:
+    """Write a system as CP2K AIMD output, i.e. a log and an xyz file.
+
+    The cell of the first frame is used for all frames, and the virials
+    are not written.
+
+    Parameters
+    ----------
+    directory : str
+        the output directory, in which cp2k.log and pos.xyz are written
+    system : dpdata.LabeledSystem
+        the system
+    """
+    hartree = dpdata.unit.EnergyConversion("eV", "hartree").value()
+    force_unit = dpdata.unit.ForceConversion("eV/angstrom", "hartree/bohr").value()
+    bohr = dpdata.unit.LengthConversion("angstrom", "bohr").value()
+    natoms = system.get_natoms()
+    symbols = _symbols(system)
+    cell = system["cells"][0]
+    lengths = np.linalg.norm(cell, axis=1) * bohr
+    energies = system["energies"] * hartree
+
+    log = [
+        " GLOBAL| Global print level                                         MEDIUM\n"
+    ]
+    for name, vec in zip("abc", cell):
+        log.append(
+            f" CELL| Vector {name} [angstrom]: "
+            + " ".join(f"{xx:16.8f}" for xx in vec)
+            + f"    |{name}| = {np.linalg.norm(vec):16.8f}\n"
+        )
+    for ii, name in enumerate(system["atom_names"]):
+        log.append(
+            f"  {ii + 1}. Atomic kind: {name:<10s} Number of atoms: "
+            f"{system['atom_numbs'][ii]:8d}\n"
+        )
+    kinds = [f"{tt + 1:8d} {ss:>6s}" for tt, ss in zip(system["atom_types"], symbols)]
+    xyz = []
+    for ii in range(system.get_nframes()):
+        log.append(
+            "\n ATOMIC FORCES in [a.u.]\n\n # Atom   Kind   Element          X              Y              Z\n"
+        )
+        log.append(
+            _format_rows(
+                system["forces"][ii] * force_unit,
+                [f"{jj + 1:6d} {kk}" for jj, kk in enumerate(kinds)],
+            )
+        )
+        log.append(" SUM OF ATOMIC FORCES          0.0 0.0 0.0    0.0\n\n")
+        if ii == 0:
+            log.append(f" {' GO CP2K GO! ':*^79s}\n")
+            log.append(
+                f" INITIAL POTENTIAL ENERGY[hartree]     = {energies[ii]:24.15f}\n"
+            )
+            log.append(
+                " INITIAL CELL LNTHS[bohr]   = "
+                + " ".join(f"{xx:16.8f}" for xx in lengths)
+                + "\n"
+            )
+            log.append(" INITIAL CELL ANGLS[deg]    =   90.000   90.000   90.000\n")
+            log.append(f" {' GO CP2K GO! ':*^79s}\n")
+        else:
+            log.append(" " + "*" * 79 + "\n")
+            log.append(" ENSEMBLE TYPE                =   NVT\n")
+            log.append(
+                f" POTENTIAL ENERGY[hartree]    = {energies[ii]:24.15f} {energies[ii]:24.15f}\n"
+            )
+            log.append(" " + "*" * 79 + "\n")
+        xyz.append(
+            f"{natoms:8d}\n i = {ii:8d}, time = {ii * 0.5:12.3f}, E = {energies[ii]:24.15f}\n"
+        )
+        xyz.append(_format_rows(system["coords"][ii], symbols))
+    with open(os.path.join(directory, "cp2k.log"), "w") as fp:
+        fp.write("".join(log))
+    with open(os.path.join(directory, "pos.xyz"), "w") as fp:
+        fp.write("".join(xyz))
+
+
+def write_abacus_md(directory: str, system: dpdata.LabeledSystem) -> None:
+    """Write a system as an ABACUS MD job.
+
+    Parameters
+    ----------
+    directory : str
+        the job directory, in which INPUT, STRU and OUT.abacus are written
+    system : dpdata.LabeledSystem
+        the system
+    """
+    out_dir = os.path.join(directory, "OUT.abacus")
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(directory, "INPUT"), "w") as fp:
+        fp.write(
+            "INPUT_PARAMETERS\nsuffix abacus\ncalculation md\nmd_dumpfreq 1\n"
+            "cal_stress 1\n"
+        )
+    system[0].to(
+        "abacus/stru",
+        os.path.join(directory, "STRU"),
+        pp_file=[f"{name}.upf" for name in system["atom_names"]],
+    )
+    symbols = _symbols(system)
+    # virials in eV; MD_dump prints the virial in kbar
+    volumes = np.linalg.det(system["cells"])
+    virials = system["virials"] / volumes[:, None, None] * 1602.1766208
+    labels = [f"{ii:6d} {ss:>4s}" for ii, ss in enumerate(symbols)]
+    dump = []
+    log = []
+    for ii in range(system.get_nframes()):
+        dump.append(
+            f"MDSTEP:  {ii}\nLATTICE_CONSTANT: 1.000000000000 Angstrom\nLATTICE_VECTORS\n"
+        )
+        dump.append(_format_rows(system["cells"][ii]))
+        dump.append("VIRIAL (KBAR)\n")
+        dump.append(_format_rows(virials[ii]))
+        dump.append("INDEX    LABEL    POSITION (Angstrom)    FORCE (eV/Angstrom)\n")
+        dump.append(
+            _format_rows(
+                np.concatenate((system["coords"][ii], system["forces"][ii]), 1),
+                labels,
+            )
+        )
+        dump.append("\n\n")
+        log.append(f" final etot is {system['energies'][ii]:.10f} eV\n")
+    with open(os.path.join(out_dir, "MD_dump"), "w") as fp:
+        fp.write("".join(dump))
+    with open(os.path.join(out_dir, "running_md.log"), "w") as fp:
+        fp.write("".join(log))
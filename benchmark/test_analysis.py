@@ -0,0 +1,36 @@
+"""Benchmarks of analysis tools."""
+
+from __future__ import annotations
+
+import pytest
+
+import dpdata
+from dpdata.md.msd import msd
+from dpdata.md.rdf import rdf
+from dpdata.stat import MultiErrors
+
+
+@pytest.mark.benchmark
+def test_rdf(benchmark, system):
+    benchmark(rdf, system, sel_type=[0, 1], max_r=2.0, nbins=50)
+
+
+@pytest.mark.benchmark
+def test_msd(benchmark, system):
+    benchmark(msd, system)
+
+
+@pytest.mark.benchmark
+def test_multi_errors(benchmark, system):
+    ms_1 = dpdata.MultiSystems(system)
+    predicted = system.copy()
+    predicted.data["energies"] += 0.1
+    predicted.data["forces"] *= 0.9
+    ms_2 = dpdata.MultiSystems(predicted)
+
+    def errors():
+        # the errors are cached by the object
+        ee = MultiErrors(ms_1, ms_2)
+        return ee.e_rmse, ee.f_rmse
+
+    benchmark(errors)
@@ -0,0 +1,21 @@
+"""Benchmarks of dumping and loading the DeePMD-kit formats."""
+
+from __future__ import annotations
+
+import pytest
+
+import dpdata
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("fmt", ["deepmd/npy", "deepmd/hdf5"])
+def test_dump(benchmark, system, tmp_path, fmt):
+    benchmark(system.to, fmt, str(tmp_path / "data"))
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("fmt", ["deepmd/npy", "deepmd/hdf5"])
+def test_load(benchmark, system, tmp_path, fmt):
+    fname = str(tmp_path / "data")
+    system.to(fmt, fname)
+    benchmark(dpdata.LabeledSystem, fname, fmt=fmt)
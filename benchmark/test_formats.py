@@ -0,0 +1,54 @@
+"""Benchmarks of reading files of common formats."""
+
+from __future__ import annotations
+
+import pytest
+
+import dpdata
+from benchmark.synthetic import (
+    ATOM_NAMES,
+    write_abacus_md,
+    write_cp2k_aimd,
+    write_outcar,
+    write_vasprun,
+)
+
+
+@pytest.mark.benchmark
+def test_vasp_outcar(benchmark, system, tmp_path):
+    fname = tmp_path / "OUTCAR"
+    write_outcar(fname, system)
+    benchmark(dpdata.LabeledSystem, str(fname), fmt="vasp/outcar")
+
+
+@pytest.mark.benchmark
+def test_vasp_xml(benchmark, system, tmp_path):
+    fname = tmp_path / "vasprun.xml"
+    write_vasprun(fname, system)
+    benchmark(dpdata.LabeledSystem, str(fname), fmt="vasp/xml")
+
+
+@pytest.mark.benchmark
+def test_lammps_dump(benchmark, system, tmp_path):
+    fname = tmp_path / "traj.dump"
+    system.to("lammps/dump", fname)
+    benchmark(dpdata.System, str(fname), fmt="lammps/dump", type_map=ATOM_NAMES)
+
+
+@pytest.mark.benchmark
+def test_quip_gap_xyz(benchmark, system, tmp_path):
+    fname = tmp_path / "train.xyz"
+    system.to("quip/gap/xyz", fname)
+    benchmark(dpdata.MultiSystems.from_file, str(fname), fmt="quip/gap/xyz")
+
+
+@pytest.mark.benchmark
+def test_cp2k_aimd_output(benchmark, system, tmp_path):
+    write_cp2k_aimd(tmp_path, system)
+    benchmark(dpdata.LabeledSystem, str(tmp_path), fmt="cp2k/aimd_output")
+
+
+@pytest.mark.benchmark
+def test_abacus_md(benchmark, system, tmp_path):
+    write_abacus_md(tmp_path, system)
+    benchmark(dpdata.LabeledSystem, str(tmp_path), fmt="abacus/md")
@@ -0,0 +1,53 @@
+"""Benchmarks of transformations of System and MultiSystems."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import dpdata
+
+
+@pytest.mark.benchmark
+def test_append(benchmark, system):
+    frames = [system[ii] for ii in range(system.get_nframes())]
+
+    def append():
+        new_system = dpdata.LabeledSystem()
+        for frame in frames:
+            new_system.append(frame)
+        return new_system
+
+    benchmark(append)
+
+
+@pytest.mark.benchmark
+def test_sub_system(benchmark, system):
+    # every other frame, in the reversed order
+    idx = np.arange(system.get_nframes())[::-2]
+    benchmark(system.sub_system, idx)
+
+
+@pytest.mark.benchmark
+def test_perturb(benchmark, system):
+    # perturb is only available for unlabeled systems
+    unlabeled = dpdata.System(data=system.data)
+    benchmark(unlabeled.perturb, 2, 0.03, 0.1)
+
+
+@pytest.mark.benchmark
+def test_replicate(benchmark, system):
+    benchmark(system.replicate, (2, 2, 2))
+
+
+@pytest.mark.benchmark
+def test_multi_systems_append(benchmark, system):
+    # systems of the same formula are merged
+    frames = [system[ii] for ii in range(system.get_nframes())]
+    benchmark(dpdata.MultiSystems, *frames)
+
+
+@pytest.mark.benchmark
+def test_train_test_split(benchmark, system):
+    ms = dpdata.MultiSystems(system, system.replicate((1, 1, 2)))
+    benchmark(ms.train_test_split, 0.2, seed=0)
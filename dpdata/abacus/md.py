@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import itertools
 import os
 import warnings
 
@@ -44,91 +45,215 @@ def get_coord_dump_freq(inlines):
     return 1
 
 
-def get_coords_from_dump(dumplines, natoms):
-    nlines = len(dumplines)
-    total_natoms = sum(natoms)
+def _read_dump_frame(it, first, total_natoms, selected):
+    """Read one frame of MD_dump after its MDSTEP line.
+
+    Parameters
+    ----------
+    it : iterator of str
+        the remaining lines of MD_dump
+    first : str
+        the LATTICE_CONSTANT line
+    total_natoms : int
+        number of atoms
+    selected : bool
+        whether the frame is decoded. Otherwise, the lines of the frame are
+        consumed and None is returned.
+
+    Returns
+    -------
+    dict or None
+        the frame, containing cells, coords, forces, stresses, and velocities
+    """
+    header = [first]
     # The output of VIRIAL, FORCE, and VELOCITY are controlled by INPUT parameters dump_virial, dump_force, and dump_vel, respectively.
     # So the search of keywords can determine whether these datas are printed into MD_dump.
-    calc_stress = False
-    calc_force = False
-    check_line = 6
-    if "VIRIAL" in dumplines[6]:
-        calc_stress = True
-        check_line = 10
-    assert "POSITION" in dumplines[check_line], (
-        "keywords 'POSITION' cannot be found in the 6th line. Please check."
+    for line in it:
+        header.append(line)
+        if "INDEX" in line:
+            break
+    assert "POSITION" in header[-1], (
+        "keywords 'POSITION' cannot be found in the header of the atoms. Please check."
     )
-    if "FORCE" in dumplines[check_line]:
-        calc_force = True
-
-    nframes_dump = -1
-    if calc_stress:
-        nframes_dump = int(nlines / (total_natoms + 13))
-    else:
-        nframes_dump = int(nlines / (total_natoms + 9))
-    assert nframes_dump > 0, (
-        "Number of lines in MD_dump file = %d. Number of atoms = %d. The MD_dump file is incomplete."  # noqa: UP031
-        % (nlines, total_natoms)
+    atom_lines = list(itertools.islice(it, total_natoms))
+    assert len(atom_lines) == total_natoms, (
+        "Number of atoms in the last frame of MD_dump = %d. Number of atoms = %d. The MD_dump file is incomplete."  # noqa: UP031
+        % (len(atom_lines), total_natoms)
     )
-    cells = np.zeros([nframes_dump, 3, 3])
-    stresses = np.zeros([nframes_dump, 3, 3])
-    forces = np.zeros([nframes_dump, total_natoms, 3])
-    coords = np.zeros([nframes_dump, total_natoms, 3])
+    if not selected:
+        return None
+
+    # read in LATTICE_CONSTANT
+    # for abacus version >= v3.1.4, the unit is angstrom, and "ANGSTROM" is added at the end
+    # for abacus version <  v3.1.4, the unit is bohr
+    celldm = float(header[0].split()[1])
+    newversion = True
+    if "Angstrom" not in header[0]:
+        celldm *= bohr2ang  # transfer unit to ANGSTROM
+        newversion = False
+    # read in LATTICE_VECTORS
+    cell = np.array(" ".join(header[2:5]).split(), dtype=float).reshape(3, 3) * celldm
+    stress = np.zeros((3, 3))
+    if "VIRIAL" in header[5]:
+        stress = np.array(" ".join(header[6:9]).split(), dtype=float).reshape(3, 3)
+        stress *= kbar2evperang3
+
+    # INDEX    LABEL    POSITION (Angstrom)    FORCE (eV/Angstrom)    VELOCITY (Angstrom/fs)
+    # 0  Sn  0.000000000000  0.000000000000  0.000000000000  -0.000000000000  -0.000000000001  -0.000000000001  0.001244557166  -0.000346684288  0.000768457739
+    # 1  Sn  0.000000000000  3.102800034079  3.102800034079  -0.000186795145  -0.000453823768  -0.000453823768  0.000550996187  -0.000886442775  0.001579501983
+    # for abacus version >= v3.1.4, the value of POSITION is the real cartessian position, and unit is angstrom, and if cal_force the VELOCITY is added at the end.
+    # for abacus version < v3.1.4, the real position = POSITION * celldm
+    # all columns but the label are decoded at once
+    table = np.array(" ".join(atom_lines).split()).reshape(total_natoms, -1)
+    table = table[:, 2:].astype(float)
+    coord = table[:, 0:3]
+    if not newversion:
+        coord = coord * celldm
+    force = np.zeros((total_natoms, 3))
+    velocity = np.zeros((total_natoms, 3))
+    col = 3
+    if "FORCE" in header[-1]:
+        force = table[:, col : col + 3]
+        col += 3
+    if "VELOCITY" in header[-1]:
+        velocity = table[:, col : col + 3]
+    return {
+        "cells": cell,
+        "coords": coord,
+        "forces": force,
+        "stresses": stress,
+        "velocities": velocity,
+    }
+
+
+def iter_dump_frames(dumplines, natoms, begin=0, step=1):
+    """Iterate over the frames of MD_dump.
+
+    The frame boundaries are located by the MDSTEP lines, and only the
+    selected frames are decoded. The lines are consumed lazily, so an
+    opened file can be passed to avoid reading the whole file into memory.
+
+    Parameters
+    ----------
+    dumplines : iterable of str
+        the lines of MD_dump
+    natoms : list of int
+        number of atoms of each type
+    begin : int, default=0
+        the index of the first selected frame
+    step : int, default=1
+        the interval between selected frames
+
+    Yields
+    ------
+    iframe : int
+        the index of the frame in MD_dump
+    frame : dict or None
+        the frame containing cells, coords, forces, stresses (in eV/Angstrom^3),
+        and velocities, or None if the frame is not selected. The forces,
+        stresses, and velocities are zeros if they are not dumped.
+    """
+    total_natoms = sum(natoms)
+    it = iter(dumplines)
     iframe = 0
-    for iline in range(nlines):
-        if "MDSTEP" in dumplines[iline]:
-            # read in LATTICE_CONSTANT
-            # for abacus version >= v3.1.4, the unit is angstrom, and "ANGSTROM" is added at the end
-            # for abacus version <  v3.1.4, the unit is bohr
-            celldm = float(dumplines[iline + 1].split()[1])
-            newversion = True
-            if "Angstrom" not in dumplines[iline + 1]:
-                celldm *= bohr2ang  # transfer unit to ANGSTROM
-                newversion = False
-
-            # read in LATTICE_VECTORS
-            for ix in range(3):
-                cells[iframe, ix] = (
-                    np.array([float(i) for i in dumplines[iline + 3 + ix].split()[0:3]])
-                    * celldm
-                )
-                if calc_stress:
-                    stresses[iframe, ix] = np.array(
-                        [float(i) for i in dumplines[iline + 7 + ix].split()[0:3]]
-                    )
-
-            if calc_stress:
-                skipline = 11
-            else:
-                skipline = 7
-
-            for iat in range(total_natoms):
-                # INDEX    LABEL    POSITION (Angstrom)    FORCE (eV/Angstrom)    VELOCITY (Angstrom/fs)
-                # 0  Sn  0.000000000000  0.000000000000  0.000000000000  -0.000000000000  -0.000000000001  -0.000000000001  0.001244557166  -0.000346684288  0.000768457739
-                # 1  Sn  0.000000000000  3.102800034079  3.102800034079  -0.000186795145  -0.000453823768  -0.000453823768  0.000550996187  -0.000886442775  0.001579501983
-                # for abacus version >= v3.1.4, the value of POSITION is the real cartessian position, and unit is angstrom, and if cal_force the VELOCITY is added at the end.
-                # for abacus version < v3.1.4, the real position = POSITION * celldm
-                coords[iframe, iat] = np.array(
-                    [float(i) for i in dumplines[iline + skipline + iat].split()[2:5]]
-                )
-
-                if not newversion:
-                    coords[iframe, iat] *= celldm
-
-                if calc_force:
-                    forces[iframe, iat] = np.array(
-                        [
-                            float(i)
-                            for i in dumplines[iline + skipline + iat].split()[5:8]
-                        ]
-                    )
+    for line in it:
+        if "MDSTEP" in line:
+            selected = iframe >= begin and (iframe - begin) % step == 0
+            frame = _read_dump_frame(it, next(it), total_natoms, selected)
+            yield iframe, frame
             iframe += 1
-    assert iframe == nframes_dump, (
-        "iframe=%d, nframe_dump=%d. Number of frames does not match number of lines in MD_dump."  # noqa: UP031
-        % (iframe, nframes_dump)
-    )
-    stresses *= kbar2evperang3
-    return coords, cells, forces, stresses
+
+
+def _stack_frames(frames, total_natoms):
+    keys = ["cells", "coords", "forces", "stresses", "velocities"]
+    shapes = [(3, 3), (total_natoms, 3), (total_natoms, 3), (3, 3), (total_natoms, 3)]
+    return {
+        kk: np.array([ff[kk] for ff in frames]).reshape(len(frames), *ss)
+        for kk, ss in zip(keys, shapes)
+    }
+
+
+def iter_dump_chunks(dumplines, natoms, chunk_size=1000, begin=0, step=1):
+    """Iterate over the selected frames of MD_dump in chunks.
+
+    Parameters
+    ----------
+    dumplines : iterable of str
+        the lines of MD_dump
+    natoms : list of int
+        number of atoms of each type
+    chunk_size : int, default=1000
+        the maximal number of frames in each chunk
+    begin : int, default=0
+        the index of the first selected frame
+    step : int, default=1
+        the interval between selected frames
+
+    Yields
+    ------
+    dict
+        the stacked cells, coords, forces, stresses, and velocities of the
+        frames in the chunk, and their indexes in MD_dump as frame_index
+    """
+    total_natoms = sum(natoms)
+    frames = []
+    index = []
+    for iframe, frame in iter_dump_frames(dumplines, natoms, begin=begin, step=step):
+        if frame is None:
+            continue
+        frames.append(frame)
+        index.append(iframe)
+        if len(frames) == chunk_size:
+            chunk = _stack_frames(frames, total_natoms)
+            chunk["frame_index"] = np.array(index, dtype=int)
+            yield chunk
+            frames = []
+            index = []
+    if len(frames) > 0:
+        chunk = _stack_frames(frames, total_natoms)
+        chunk["frame_index"] = np.array(index, dtype=int)
+        yield chunk
+
+
+def load_dump(dumplines, natoms, begin=0, step=1):
+    """Load the selected frames of MD_dump.
+
+    Parameters
+    ----------
+    dumplines : iterable of str
+        the lines of MD_dump
+    natoms : list of int
+        number of atoms of each type
+    begin : int, default=0
+        the index of the first selected frame
+    step : int, default=1
+        the interval between selected frames
+
+    Returns
+    -------
+    dict
+        the stacked cells, coords, forces, stresses, and velocities of the
+        selected frames, their indexes in MD_dump as frame_index, and the
+        total number of frames in MD_dump as nframes
+    """
+    frames = []
+    index = []
+    nframes = 0
+    for iframe, frame in iter_dump_frames(dumplines, natoms, begin=begin, step=step):
+        nframes += 1
+        if frame is not None:
+            frames.append(frame)
+            index.append(iframe)
+    assert nframes > 0, "No frame is found in MD_dump. The MD_dump file is incomplete."
+    data = _stack_frames(frames, sum(natoms))
+    data["frame_index"] = np.array(index, dtype=int)
+    data["nframes"] = nframes
+    return data
+
+
+def get_coords_from_dump(dumplines, natoms, begin=0, step=1):
+    data = load_dump(dumplines, natoms, begin=begin, step=step)
+    return data["coords"], data["cells"], data["forces"], data["stresses"]
 
 
 def get_energy(outlines, ndump, dump_freq):
@@ -151,7 +276,7 @@ def get_energy(outlines, ndump, dump_freq):
     return energy
 
 
-def get_frame(fname):
+def get_frame(fname, begin=0, step=1):
     if isinstance(fname, str):
         # if the input parameter is only one string, it is assumed that it is the
         # base directory containing INPUT file;
@@ -175,33 +300,42 @@ def get_frame(fname):
     # number of dumped geometry files
     # coords = get_coords_from_cif(ndump, dump_freq, atom_names, natoms, types, path_out, cell)
     with open_file(os.path.join(path_out, "MD_dump")) as fp:
-        dumplines = fp.read().split("\n")
-    coords, cells, force, stress = get_coords_from_dump(dumplines, natoms)
-    ndump = np.shape(coords)[0]
+        dump = load_dump(fp, natoms, begin=begin, step=step)
+    coords = dump["coords"]
+    cells = dump["cells"]
+    force = dump["forces"]
+    stress = dump["stresses"]
     with open_file(os.path.join(path_out, "running_md.log")) as fp:
         outlines = fp.read().split("\n")
-    energy = get_energy(outlines, ndump, dump_freq)
-
-    unconv_stru = ""
-    for i, iene in enumerate(energy):
-        if np.isnan(iene):
-            coords = np.delete(coords, i - ndump, axis=0)
-            cells = np.delete(cells, i - ndump, axis=0)
-            force = np.delete(force, i - ndump, axis=0)
-            stress = np.delete(stress, i - ndump, axis=0)
-            energy = np.delete(energy, i - ndump, axis=0)
-            unconv_stru += "%d " % i  # noqa: UP031
-    ndump = len(energy)
-    if unconv_stru != "":
+    energy = get_energy(outlines, dump["nframes"], dump_freq)[dump["frame_index"]]
+    magmom, magforce = get_mag_force(outlines)
+    if len(magmom) == dump["nframes"]:
+        magmom = magmom[dump["frame_index"]]
+    if len(magforce) == dump["nframes"]:
+        magforce = magforce[dump["frame_index"]]
+
+    conv = ~np.isnan(energy)
+    if not np.all(conv):
+        unconv_stru = "".join(
+            "%d " % ii  # noqa: UP031
+            for ii in dump["frame_index"][~conv]
+        )
         warnings.warn(f"Structure {unconv_stru} are unconverged and not collected!")
+        coords = coords[conv]
+        cells = cells[conv]
+        force = force[conv]
+        stress = stress[conv]
+        energy = energy[conv]
+        if len(magmom) == len(conv):
+            magmom = magmom[conv]
+        if len(magforce) == len(conv):
+            magforce = magforce[conv]
+    ndump = len(energy)
 
-    for iframe in range(ndump):
-        stress[iframe] *= np.linalg.det(cells[iframe, :, :].reshape([3, 3]))
-    if np.sum(np.abs(stress[0])) < 1e-10:
+    stress *= np.linalg.det(cells).reshape(-1, 1, 1)
+    if ndump == 0 or np.sum(np.abs(stress[0])) < 1e-10:
         stress = None
 
-    magmom, magforce = get_mag_force(outlines)
-
     data["cells"] = cells
     # for idx in range(ndump):
     #    data['cells'][:, :, :] = cell
@@ -7,6 +7,7 @@ import warnings
 import numpy as np
 
 from ..unit import LengthConversion
+from ..utils import open_file
 
 bohr2ang = LengthConversion("bohr", "angstrom").value()
 
@@ -477,7 +478,7 @@ def get_frame_from_stru(stru):
         raise FileNotFoundError(f"ABACUS STRU file {stru} not found!!!")
 
     # 1. read the file and split the lines to blocks
-    with open(stru) as f:
+    with open_file(stru) as f:
         lines = f.readlines()
     blocks = split_stru_block(lines)
 
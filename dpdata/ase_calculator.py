@@ -2,15 +2,21 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import numpy as np
 from ase.calculators.calculator import (  # noqa: TID253
     Calculator,
     PropertyNotImplementedError,
     all_changes,
 )
 
-import dpdata
+try:
+    from ase.mep import NEB  # noqa: TID253
+except ImportError:
+    # ase < 3.23
+    from ase.neb import NEB  # noqa: TID253
 
 from .driver import Driver
+from .utils import encode_species
 
 if TYPE_CHECKING:
     from ase import Atoms
@@ -34,6 +40,88 @@ class DPDataCalculator(Calculator):
     def __init__(self, driver: Driver, **kwargs) -> None:
         Calculator.__init__(self, label=Driver.__name__, **kwargs)
         self.driver = driver
+        # the species and types of the last structure, reused while the
+        # atomic numbers and the periodicity are unchanged
+        self._species_key = None
+        self._species_data = None
+        self._batch_results = {}
+
+    def reset(self):
+        """Clear the results, including those of the last batch."""
+        Calculator.reset(self)
+        self._batch_results = {}
+
+    def _get_species_data(self, atoms: Atoms) -> dict:
+        """Get the atom names, numbers, and types of atoms, which are cached."""
+        key = (atoms.numbers.tobytes(), tuple(atoms.get_pbc()))
+        if key != self._species_key:
+            from ase.data import chemical_symbols
+
+            numbers, atom_numbs, atom_types = encode_species(atoms.numbers)
+            self._species_key = key
+            self._species_data = {
+                "atom_names": [chemical_symbols[nn] for nn in numbers],
+                "atom_numbs": atom_numbs,
+                "atom_types": atom_types,
+                "orig": np.zeros(3),
+                "nopbc": not np.any(atoms.get_pbc()),
+            }
+        return self._species_data
+
+    def _label(self, images: list[Atoms]) -> list[dict]:
+        """Label images with the same species in a single call of the driver.
+
+        Parameters
+        ----------
+        images : list[Atoms]
+            images with the same atomic numbers and periodicity
+
+        Returns
+        -------
+        list[dict]
+            the results of each image
+        """
+        species_data = self._get_species_data(images[0])
+        data = {
+            **species_data,
+            "atom_names": list(species_data["atom_names"]),
+            "atom_numbs": list(species_data["atom_numbs"]),
+            "atom_types": species_data["atom_types"].copy(),
+            "cells": np.array([atoms.cell.array for atoms in images]),
+            "coords": np.array([atoms.positions for atoms in images]),
+        }
+        data = self.driver.label(data)
+
+        results = []
+        for ii, atoms in enumerate(images):
+            res = {
+                "energy": data["energies"][ii],
+                # see https://gitlab.com/ase/ase/-/merge_requests/2485
+                "free_energy": data["energies"][ii],
+            }
+            if "forces" in data:
+                res["forces"] = data["forces"][ii]
+            if "virials" in data:
+                virial = data["virials"][ii].reshape(3, 3)
+                res["virial"] = virial
+                # convert virial into stress for lattice relaxation
+                if np.any(atoms.get_pbc()):
+                    # the usual convention (tensile stress is positive)
+                    # stress = -virial / volume
+                    stress = -0.5 * (virial + virial.T) / atoms.get_volume()
+                    # Voigt notation
+                    res["stress"] = stress.flat[[0, 4, 8, 5, 2, 1]]
+            results.append(res)
+        return results
+
+    @staticmethod
+    def _structure_key(atoms: Atoms) -> tuple:
+        return (
+            atoms.numbers.tobytes(),
+            atoms.positions.tobytes(),
+            atoms.cell.array.tobytes(),
+            tuple(atoms.get_pbc()),
+        )
 
     def calculate(
         self,
@@ -43,6 +131,10 @@ class DPDataCalculator(Calculator):
     ):
         """Run calculation with a driver.
 
+        The coordinates and the cell are passed to the driver directly,
+        and the atom names and types are only computed again when the
+        atomic numbers change.
+
         Parameters
         ----------
         atoms : Optional[Atoms], optional
@@ -54,30 +146,98 @@ class DPDataCalculator(Calculator):
             unused, only for function signature compatibility, by default all_changes
         """
         assert atoms is not None
-        atoms = atoms.copy()
-
-        system = dpdata.System(atoms, fmt="ase/structure")
-        data = system.predict(driver=self.driver).data
-
-        self.results["energy"] = data["energies"][0]
-        # see https://gitlab.com/ase/ase/-/merge_requests/2485
-        self.results["free_energy"] = data["energies"][0]
-        if "forces" in data:
-            self.results["forces"] = data["forces"][0]
-        if "virials" in data:
-            self.results["virial"] = data["virials"][0].reshape(3, 3)
-
-        # convert virial into stress for lattice relaxation
-        if "stress" in properties:
-            if sum(atoms.get_pbc()) > 0:
-                # the usual convention (tensile stress is positive)
-                # stress = -virial / volume
-                stress = (
-                    -0.5
-                    * (data["virials"][0].copy() + data["virials"][0].copy().T)
-                    / atoms.get_volume()
-                )
-                # Voigt notation
-                self.results["stress"] = stress.flat[[0, 4, 8, 5, 2, 1]]
-            else:
-                raise PropertyNotImplementedError
+        # keep a copy of atoms, so that the results are reused for other
+        # properties until atoms change
+        Calculator.calculate(self, atoms, properties, system_changes)
+        # each result of the batch is used once; ASE keeps it afterwards
+        results = self._batch_results.pop(self._structure_key(atoms), None)
+        if results is None:
+            results = self._label([atoms])[0]
+        self.results = dict(results)
+        if "stress" in properties and "stress" not in self.results:
+            raise PropertyNotImplementedError
+
+    def calculate_batch(self, images: list[Atoms]) -> list[dict]:
+        """Evaluate multiple images with as few driver calls as possible.
+
+        Images with the same atomic numbers and periodicity, such as the
+        images of a nudged elastic band, are stacked as frames of one system
+        and labeled in a single call of the driver. Standard ASE optimizers
+        and NEB do not call this method; use :class:`DPDataNEB` for NEB.
+
+        The results are kept by the calculator of each image if it is a
+        DPDataCalculator, or by this calculator otherwise, until they are
+        used by `calculate` for the same structure, the next batch, or
+        `reset`.
+
+        Parameters
+        ----------
+        images : list[Atoms]
+            the images
+
+        Returns
+        -------
+        list[dict]
+            the results of each image, with keys like energy and forces
+        """
+        groups = {}
+        for ii, atoms in enumerate(images):
+            key = (atoms.numbers.tobytes(), tuple(atoms.get_pbc()))
+            groups.setdefault(key, []).append(ii)
+        results = [None] * len(images)
+        for idx in groups.values():
+            for ii, res in zip(idx, self._label([images[ii] for ii in idx])):
+                results[ii] = res
+        calculators = [
+            atoms.calc if isinstance(atoms.calc, DPDataCalculator) else self
+            for atoms in images
+        ]
+        # drop the results of the previous batch
+        for calc in calculators:
+            calc._batch_results = {}
+        for atoms, calc, res in zip(images, calculators, results):
+            calc._batch_results[self._structure_key(atoms)] = res
+        return results
+
+
+class DPDataNEB(NEB):
+    """Nudged elastic band that labels the images in batches.
+
+    Before the forces are computed, the images that need a new calculation
+    are labeled by :meth:`DPDataCalculator.calculate_batch`,
+    with one driver call per driver and species, instead of one call per
+    image. The images may share a DPDataCalculator, in which case
+    ``allow_shared_calculator=True`` is required, or have their own ones.
+    Images with other calculators are computed as usual.
+
+    Parameters
+    ----------
+    images : list[Atoms]
+        the images
+    **kwargs : dict
+        other parameters of :class:`ase.mep.NEB`
+
+    Examples
+    --------
+    >>> calc = driver.ase_calculator
+    >>> for image in images:
+    ...     image.calc = calc
+    >>> neb = DPDataNEB(images, allow_shared_calculator=True)
+    >>> BFGS(neb).run(fmax=0.05)
+    """
+
+    def get_forces(self):
+        # the energies of the end points are also needed except for aseneb
+        images = self.images if self.method != "aseneb" else self.images[1:-1]
+        groups = {}
+        for atoms in images:
+            calc = atoms.calc
+            if not isinstance(calc, DPDataCalculator):
+                continue
+            # skip the images whose results are still valid
+            if calc.atoms is not None and not calc.check_state(atoms):
+                continue
+            groups.setdefault(id(calc.driver), (calc, []))[1].append(atoms)
+        for calc, images in groups.values():
+            calc.calculate_batch(images)
+        return super().get_forces()
@@ -0,0 +1,222 @@
+"""A single-file columnar container of systems.
+
+The file starts with a fixed-size header::
+
+    magic (8 bytes) | index offset (uint64) | index length (uint64)
+
+followed by the raw arrays of all systems, each aligned to
+:data:`ALIGNMENT` bytes, and a JSON index at the end of the file. The
+index records the name, the offset, the dtype, and the shape of each
+array, together with the non-array data (e.g. ``atom_names``). Opening a
+file only reads the index, and the arrays are memory-mapped without
+copies. New systems are appended after the existing index: the new
+arrays are written first, then the updated index, and the header is
+updated last, so an interrupted append leaves the original systems
+readable. The old index is left in the file as unused bytes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+
+import numpy as np
+
+__all__ = ["BinFile", "BinEntry"]
+
+MAGIC = b"\x93DPDATA\x01"
+HEADER = struct.Struct("<8sQQ")
+ALIGNMENT = 64
+
+
+def _to_json(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+class BinEntry:
+    """A system in a :class:`BinFile`.
+
+    Parameters
+    ----------
+    file : BinFile
+        the file
+    name : str
+        the name of the system
+    index : int, optional
+        the index of the system in the file. None if the system is not
+        written yet.
+    """
+
+    def __init__(self, file: BinFile, name: str, index: int | None = None):
+        self.file = file
+        self.name = name
+        self.index = index
+
+    def load(self) -> dict:
+        """Load the data of the system."""
+        return self.file.load(self.index)
+
+    def dump(self, data: dict) -> None:
+        """Append the data to the file as this system."""
+        self.index = self.file.dump(data, self.name)
+
+
+class BinFile:
+    """A dpdata/bin file.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        the file path
+    mode : {"r", "w", "a"}, default="r"
+        read, write (truncating the existing file), or append
+    mmap_mode : {"c", "r", None}, default="c"
+        how the arrays are loaded. ``"c"`` (copy-on-write) and ``"r"``
+        (read-only) memory-map the arrays; None reads them into memory.
+
+    Examples
+    --------
+    >>> with BinFile("data.bin", "w") as f:
+    ...     f.dump(system.data, system.short_name)
+    >>> with BinFile("data.bin") as f:
+    ...     data = [entry.load() for entry in f]
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        mode: str = "r",
+        mmap_mode: str | None = "c",
+    ):
+        if mode not in ("r", "w", "a"):
+            raise RuntimeError(f"Unsupported mode {mode}")
+        if mode == "a" and not os.path.isfile(path):
+            mode = "w"
+        self.path = path
+        self.mode = mode
+        self.mmap_mode = mmap_mode
+        self._buffer = None
+        if mode == "w":
+            self._fp = open(path, "w+b")
+            self.systems = []
+            self._end = ALIGNMENT
+            self._write_index()
+        else:
+            self._fp = open(path, "rb" if mode == "r" else "r+b")
+            magic, offset, length = HEADER.unpack(self._fp.read(HEADER.size))
+            if magic != MAGIC:
+                self._fp.close()
+                raise RuntimeError(f"{path} is not a dpdata/bin file")
+            self._fp.seek(offset)
+            self.systems = json.loads(self._fp.read(length).decode("utf-8"))
+            # new arrays are written after the index, which is kept valid
+            # until the header points to the new one
+            self._end = offset + length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self.systems)
+
+    def __iter__(self):
+        for ii, ss in enumerate(self.systems):
+            yield BinEntry(self, ss["name"], ii)
+
+    def close(self):
+        """Write the index if needed and close the file.
+
+        The memory-mapped arrays are still valid after the file is closed.
+        """
+        if self._fp.closed:
+            return
+        if self.mode != "r":
+            self._write_index()
+        self._fp.close()
+
+    def _write_index(self):
+        index = json.dumps(self.systems, default=_to_json).encode("utf-8")
+        self._fp.seek(self._end)
+        self._fp.write(index)
+        self._fp.truncate()
+        # the header points to the new index only after it is on disk
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+        self._fp.seek(0)
+        self._fp.write(HEADER.pack(MAGIC, self._end, len(index)))
+        self._fp.flush()
+
+    def dump(self, data: dict, name: str) -> int:
+        """Append a system to the file.
+
+        Arrays are stored as raw bytes, and other data (e.g. lists,
+        strings, and booleans) are stored in the index.
+
+        Parameters
+        ----------
+        data : dict
+            the system data, including custom data types
+        name : str
+            the name of the system
+
+        Returns
+        -------
+        int
+            the index of the system
+        """
+        if self.mode == "r":
+            raise RuntimeError("The file is opened in read mode")
+        arrays = {}
+        meta = {}
+        for kk, vv in data.items():
+            if isinstance(vv, np.ndarray):
+                if vv.dtype.hasobject:
+                    raise RuntimeError(f"Object array {kk} is not supported")
+                vv = np.ascontiguousarray(vv)
+                offset = -(-self._end // ALIGNMENT) * ALIGNMENT
+                self._fp.seek(offset)
+                vv.tofile(self._fp)
+                self._end = offset + vv.nbytes
+                arrays[kk] = [offset, vv.dtype.str, list(vv.shape)]
+            else:
+                meta[kk] = vv
+        # the memory map does not cover the new arrays
+        self._buffer = None
+        self.systems.append({"name": name, "arrays": arrays, "meta": meta})
+        return len(self.systems) - 1
+
+    def load(self, index: int) -> dict:
+        """Load a system from the file.
+
+        Parameters
+        ----------
+        index : int
+            the index of the system
+
+        Returns
+        -------
+        dict
+            the system data
+        """
+        entry = self.systems[index]
+        data = dict(entry["meta"])
+        if self.mmap_mode is not None and self._buffer is None:
+            self._fp.flush()
+            self._buffer = np.memmap(self.path, dtype=np.uint8, mode=self.mmap_mode)
+        for kk, (offset, dtype, shape) in entry["arrays"].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape))
+            if self._buffer is not None:
+                nbytes = count * dtype.itemsize
+                array = self._buffer[offset : offset + nbytes].view(dtype)
+            else:
+                self._fp.seek(offset)
+                array = np.fromfile(self._fp, dtype=dtype, count=count)
+            data[kk] = array.reshape(shape)
+        return data
@@ -0,0 +1,96 @@
+"""Binary containers used by :meth:`dpdata.System.dump` and :meth:`dpdata.System.load`."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import numpy as np
+
+from .columnar import BinFile, _to_json
+
+__all__ = ["BINARY_SUFFIXES", "dump", "load"]
+
+BINARY_SUFFIXES = (".npz", ".bin")
+META_KEY = "__meta__"
+
+
+def dump(filename: str, d: dict) -> None:
+    """Dump a dict returned by `System.as_dict` to a binary file.
+
+    Parameters
+    ----------
+    filename : str
+        the file name. ``.npz`` for a NumPy archive, ``.bin`` for a
+        dpdata/bin file.
+    d : dict
+        the dict with ``@module``, ``@class`` and ``data``
+    """
+    meta = {kk: vv for kk, vv in d.items() if kk.startswith("@")}
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == ".npz":
+        arrays = {}
+        meta["data"] = {}
+        for kk, vv in d["data"].items():
+            if isinstance(vv, np.ndarray):
+                arrays[kk] = vv
+            else:
+                meta["data"][kk] = vv
+        np.savez(
+            filename,
+            **{META_KEY: np.array(json.dumps(meta, default=_to_json))},
+            **arrays,
+        )
+    elif ext == ".bin":
+        with BinFile(filename, "w") as f:
+            f.dump({**meta, **d["data"]}, d["@class"])
+    else:
+        raise RuntimeError(f"Unsupported binary file {filename}")
+
+
+def load(filename: str, mmap_mode: str | None = "c") -> dict:
+    """Load a dict in the form of `System.as_dict` from a binary file.
+
+    Parameters
+    ----------
+    filename : str
+        the file name, ``.npz`` or ``.bin``
+    mmap_mode : {"c", "r", None}, default="c"
+        how the arrays in a ``.bin`` file are loaded; see :class:`BinFile`
+
+    Returns
+    -------
+    dict
+        the dict with ``@module``, ``@class`` and ``data``
+
+    Raises
+    ------
+    RuntimeError
+        if a ``.bin`` file contains more than one system, or is not written
+        by :meth:`dpdata.System.dump`
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == ".npz":
+        with np.load(filename, allow_pickle=False) as f:
+            d = json.loads(f[META_KEY].item())
+            for kk in f.files:
+                if kk != META_KEY:
+                    d["data"][kk] = f[kk]
+        return d
+    elif ext == ".bin":
+        with BinFile(filename, mmap_mode=mmap_mode) as f:
+            if len(f) != 1:
+                raise RuntimeError(
+                    f"{filename} contains {len(f)} systems; load it with "
+                    'dpdata.MultiSystems.from_file(filename, fmt="dpdata/bin")'
+                )
+            data = f.load(0)
+        if "@module" not in data or "@class" not in data:
+            raise RuntimeError(
+                f"{filename} is not written by System.dump; load it with "
+                'dpdata.LabeledSystem(filename, fmt="dpdata/bin")'
+            )
+        d = {kk: data.pop(kk) for kk in list(data) if kk.startswith("@")}
+        d["data"] = data
+        return d
+    raise RuntimeError(f"Unsupported binary file {filename}")
@@ -3,6 +3,12 @@
 from __future__ import annotations
 
 import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
 
 from . import __version__
 from .system import LabeledSystem, MultiSystems, System
@@ -21,7 +27,12 @@ def dpdata_parser() -> argparse.ArgumentParser:
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
 
-    parser.add_argument("from_file", type=str, help="read data from a file")
+    parser.add_argument(
+        "from_file",
+        type=str,
+        nargs="*",
+        help="read data from a file. In the batch mode, multiple files and glob patterns are accepted",
+    )
     parser.add_argument("--to_file", "-O", type=str, help="dump data to a file")
     parser.add_argument(
         "--from_format", "-i", type=str, default="auto", help="the format of from_file"
@@ -37,6 +48,26 @@ def dpdata_parser() -> argparse.ArgumentParser:
         help="the system contains multiple directories",
     )
     parser.add_argument("--type-map", "-t", type=str, nargs="+", help="type map")
+    parser.add_argument(
+        "--batch",
+        "-b",
+        action="store_true",
+        help="batch mode: read all files in parallel and merge them into one MultiSystems. "
+        "It is enabled when more than one from_file, a glob pattern, or --file-list is given",
+    )
+    parser.add_argument(
+        "--file-list",
+        "-f",
+        type=str,
+        help="in the batch mode, a text file listing one file to read per line",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="in the batch mode, the number of worker processes. Defaults to the number of CPUs",
+    )
 
     parser.add_argument("--version", action="version", version=f"dpdata v{__version__}")
     return parser
@@ -50,10 +81,30 @@ def dpdata_cli():
     .. code-block:: bash
 
         $ dpdata -iposcar POSCAR -odeepmd/npy -O data -n
+
+    Convert OUTCAR files of many tasks in parallel:
+
+    .. code-block:: bash
+
+        $ dpdata "task.*/OUTCAR" -ivasp/outcar -odeepmd/npy -O data -j 8
     """
     parser = dpdata_parser()
-    parsed_args = parser.parse_args()
-    convert(**vars(parsed_args))
+    args = vars(parser.parse_args())
+    from_files = args.pop("from_file")
+    batch = args.pop("batch")
+    file_list = args.pop("file_list")
+    jobs = args.pop("jobs")
+    if (
+        batch
+        or file_list is not None
+        or len(from_files) > 1
+        or (len(from_files) == 1 and _is_pattern(from_files[0]))
+    ):
+        convert_batch(from_files=from_files, file_list=file_list, jobs=jobs, **args)
+    elif len(from_files) == 1:
+        convert(from_file=from_files[0], **args)
+    else:
+        parser.error("from_file is required")
 
 
 def convert(
@@ -102,3 +153,195 @@ def convert(
             print(out)
     else:
         print(s)
+
+
+def _is_pattern(from_file: str) -> bool:
+    """Whether the argument is a glob pattern rather than an existing file."""
+    return not os.path.exists(from_file) and any(cc in from_file for cc in "*?[")
+
+
+def expand_files(patterns: list[str], file_list: str | None = None) -> list[str]:
+    """Expand glob patterns and a file list into a list of files.
+
+    The files matched by each pattern are sorted, so that the order does not
+    depend on the file system.
+
+    Parameters
+    ----------
+    patterns : list of str
+        files or glob patterns. A pattern matching nothing is kept as it is,
+        so that the failure is reported when it is read.
+    file_list : str, optional
+        a text file listing one file per line. Blank lines and lines
+        starting with ``#`` are ignored.
+
+    Returns
+    -------
+    list of str
+        the files, in the order of the patterns and then the file list
+    """
+    files = []
+    for pattern in patterns:
+        matched = sorted(glob.glob(pattern, recursive=True))
+        files.extend(matched if matched else [pattern])
+    if file_list is not None:
+        with open(file_list) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    files.append(line)
+    return files
+
+
+def _load_file(
+    from_file: str,
+    from_format: str,
+    labeled: bool,
+    multi: bool,
+    type_map: list | None,
+) -> tuple[list[dict], tuple, str | None]:
+    """Load a file in a worker process.
+
+    Returns
+    -------
+    list of dict
+        the data of the loaded systems
+    tuple of DataType
+        the data types registered in the worker, which may be registered by
+        plugins when reading the file
+    str or None
+        the error message if the file fails to be read
+    """
+    cls = LabeledSystem if labeled else System
+    try:
+        if multi:
+            systems = list(
+                MultiSystems.from_file(
+                    from_file, fmt=from_format, type_map=type_map, labeled=labeled
+                )
+            )
+        else:
+            systems = [cls(from_file, fmt=from_format, type_map=type_map)]
+    except Exception as e:
+        return [], (), f"{type(e).__name__}: {e}"
+    return [ss.data for ss in systems], cls.DTYPES, None
+
+
+def convert_batch(
+    *,
+    from_files: list[str],
+    file_list: str | None = None,
+    from_format: str = "auto",
+    to_file: str | None = None,
+    to_format: str | None = None,
+    no_labeled: bool = False,
+    multi: bool = False,
+    type_map: list | None = None,
+    jobs: int | None = None,
+    **kwargs: Any,
+) -> MultiSystems:
+    """Read many files in parallel and merge them into one MultiSystems.
+
+    The files are read by a pool of processes, and merged in the order of
+    the input, so the output does not depend on the number of processes.
+    The progress and the failed files are printed to stderr.
+
+    Parameters
+    ----------
+    from_files : list of str
+        files or glob patterns to read
+    file_list : str, optional
+        a text file listing one file to read per line
+    from_format : str
+        the format of from_files
+    to_file : str
+        dump data to a file
+    to_format : str
+        the format of to_file, such as deepmd/npy, deepmd/hdf5, or
+        deepmd/npy/mixed
+    no_labeled : bool
+        labels aren't provided
+    multi : bool
+        each file contains multiple systems
+    type_map : list
+        type map
+    jobs : int, optional
+        the number of worker processes. Defaults to the number of CPUs.
+        If 1, the files are read in the current process.
+    **kwargs : dict
+        Additional arguments for the format.
+
+    Returns
+    -------
+    MultiSystems
+        the merged systems
+    """
+    files = expand_files(from_files, file_list)
+    if not files:
+        raise RuntimeError("No file to read")
+    labeled = not no_labeled
+    cls = LabeledSystem if labeled else System
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(files)))
+    nfiles = len(files)
+    args = (
+        files,
+        [from_format] * nfiles,
+        [labeled] * nfiles,
+        [multi] * nfiles,
+        [type_map] * nfiles,
+    )
+
+    ms = MultiSystems(type_map=type_map)
+    failures = []
+    nframes = 0
+    start = last_print = time.perf_counter()
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        if executor is not None:
+            # several files are sent to a worker at once to reduce the overhead
+            chunksize = max(1, min(64, nfiles // (jobs * 4)))
+            results = executor.map(_load_file, *args, chunksize=chunksize)
+        else:
+            results = map(_load_file, *args)
+        for ii, (fn, (datas, dtypes, error)) in enumerate(zip(files, results)):
+            if error is not None:
+                failures.append((fn, error))
+            else:
+                # the data types registered by plugins in the worker
+                known = {dt.name for dt in cls.DTYPES}
+                new_dtypes = [dt for dt in dtypes if dt.name not in known]
+                if new_dtypes:
+                    cls.register_data_type(*new_dtypes)
+                # unconverged files may contain no frames
+                systems = [cls(data=data) for data in datas]
+                systems = [ss for ss in systems if len(ss)]
+                nframes += sum(len(ss) for ss in systems)
+                ms.append(*systems)
+            now = time.perf_counter()
+            if now - last_print >= 1.0 or ii + 1 == nfiles:
+                last_print = now
+                print(
+                    f"[{ii + 1}/{nfiles}] {nframes} frames read, "
+                    f"{(ii + 1) / max(now - start, 1e-9):.1f} files/s",
+                    file=sys.stderr,
+                )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if failures:
+        print(f"{len(failures)} of {nfiles} files failed:", file=sys.stderr)
+        for fn, error in failures:
+            print(f"  {fn}: {error}", file=sys.stderr)
+    if len(failures) == nfiles:
+        raise RuntimeError("All files failed to be read")
+
+    if to_format is not None:
+        out = ms.to(to_format, to_file)
+        if isinstance(out, str):
+            print(out)
+    else:
+        print(ms)
+    return ms
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import math
 import re
-from collections import OrderedDict
+from itertools import islice
 
 import numpy as np
 
@@ -13,30 +13,65 @@ from ..unit import (
     LengthConversion,
     PressureConversion,
 )
+from ..utils import encode_species, open_path
 from .cell import cell_to_low_triangle
 
 AU_TO_ANG = LengthConversion("bohr", "angstrom").value()
 AU_TO_EV = EnergyConversion("hartree", "eV").value()
 AU_TO_EV_EVERY_ANG = ForceConversion("hartree/bohr", "eV/angstrom").value()
-delimiter_patterns = []
-delimiter_p1 = re.compile(r"^ \* GO CP2K GO! \*+")
-delimiter_p2 = re.compile(r"^ \*+")
-delimiter_patterns.append(delimiter_p1)
-delimiter_patterns.append(delimiter_p2)
-avail_patterns = []
-avail_patterns.append(re.compile(r"^ INITIAL POTENTIAL ENERGY"))
-avail_patterns.append(re.compile(r"^ ENSEMBLE TYPE"))
+# frames are delimited by lines of asterisks and recognized by plain
+# prefixes, which are much cheaper to check than regular expressions
+delimiter_prefix = " *"
+avail_prefixes = (" INITIAL POTENTIAL ENERGY", " ENSEMBLE TYPE")
+
+# patterns of a log frame, compiled only once
+#  CONSERVED QUANTITY [hartree] =                              -0.279168013085E+04
+energy_pattern = re.compile(
+    r" (?:INITIAL )?POTENTIAL ENERGY\[hartree\]\s+=\s+(?P<number>\S+)"
+)
+cell_length_pattern = re.compile(
+    r" (INITIAL ){0,1}CELL LNTHS\[bohr\]\s+=\s+(?P<A>\S+)\s+(?P<B>\S+)\s+(?P<C>\S+)"
+)
+cell_angle_pattern = re.compile(
+    r" (INITIAL ){0,1}CELL ANGLS\[deg\]\s+=\s+(?P<alpha>\S+)\s+(?P<beta>\S+)\s+(?P<gamma>\S+)"
+)
+cell_vector_pattern = re.compile(
+    r" CELL\| Vector (?P<v>[abc]) \[angstrom\]:\s+(?P<x>\S+)\s+(?P<y>\S+)\s+(?P<z>\S+)"
+)
+print_level_pattern = re.compile(r" GLOBAL\| Global print level\s+(?P<print_level>\S+)")
+atomic_kinds_pattern = re.compile(r"\s+\d+\. Atomic kind:\s+(?P<akind>\S+)")
+xyz_natoms_pattern = re.compile(r"^\s*(\d+)\s*")
+xyz_prop_pattern = re.compile(r"(?P<prop>\w+)\s*=\s*(?P<number>.*?)[, ]")
 
 
 class Cp2kSystems:
-    """deal with cp2k outputfile."""
-
-    def __init__(self, log_file_name, xyz_file_name, restart=False):
-        self.log_file_object = open(log_file_name)
-        self.xyz_file_object = open(xyz_file_name)
+    """deal with cp2k outputfile.
+
+    Parameters
+    ----------
+    log_file_name : str
+        the CP2K log file
+    xyz_file_name : str
+        the xyz file of positions
+    restart : bool, default=False
+        whether the log file is from a restarted task, whose first
+        block does not belong to any frame
+    begin : int, default=0
+        the index of the first frame to read
+    step : int, default=1
+        the interval between two read frames. The skipped frames are
+        not parsed, except the cell that may be used by later frames.
+    """
+
+    def __init__(self, log_file_name, xyz_file_name, restart=False, begin=0, step=1):
+        self.log_file_object = open_path(log_file_name)
+        self.xyz_file_object = open_path(xyz_file_name)
         self.log_block_generator = self.get_log_block_generator()
         self.xyz_block_generator = self.get_xyz_block_generator()
         self.restart_flag = restart
+        self.begin = begin
+        self.step = step
+        self.iframe = 0
 
         self.cell = None
         self.print_level = None
@@ -53,11 +88,22 @@ class Cp2kSystems:
     def __iter__(self):
         return self
 
+    def _is_selected(self, iframe):
+        return iframe >= self.begin and (iframe - self.begin) % self.step == 0
+
     def __next__(self):
+        while not self._is_selected(self.iframe):
+            self.handle_single_log_frame(
+                next(self.log_block_generator), parse_frame=False
+            )
+            if not self.skip_xyz_block():
+                raise StopIteration
+            self.iframe += 1
         info_dict = {}
         log_info_dict = self.handle_single_log_frame(next(self.log_block_generator))
         # print(log_info_dict)
         xyz_info_dict = self.handle_single_xyz_frame(next(self.xyz_block_generator))
+        self.iframe += 1
         # eq1 = [v1==v2 for v1,v2 in zip(log_info_dict['atom_numbs'], xyz_info_dict['atom_numbs'])]
         # eq2 = [v1==v2 for v1,v2 in zip(log_info_dict['atom_names'], xyz_info_dict['atom_names'])]
         # eq3 = [v1==v2 for v1,v2 in zip(log_info_dict['atom_types'], xyz_info_dict['atom_types'])]
@@ -65,7 +111,9 @@ class Cp2kSystems:
         # assert all(eq2), (log_info_dict,xyz_info_dict,'There may be errors in the file. If it is a restart task; use restart=True')
         # assert all(eq3), (log_info_dict,xyz_info_dict,'There may be errors in the file. If it is a restart task; use restart=True')
         assert math.isclose(
-            log_info_dict["energies"], xyz_info_dict["energies"], abs_tol=1.0e-6
+            log_info_dict["energies"][0],
+            xyz_info_dict["energies"][0],
+            abs_tol=1.0e-6,
         ), (
             log_info_dict["energies"],
             xyz_info_dict["energies"],
@@ -79,66 +127,87 @@ class Cp2kSystems:
         lines = []
         delimiter_flag = False
         yield_flag = False
+        readline = self.log_file_object.readline
         while True:
-            line = self.log_file_object.readline()
+            line = readline()
             if line:
                 lines.append(line)
-                if any(p.match(line) for p in delimiter_patterns):
+                if line.startswith(delimiter_prefix):
                     if delimiter_flag is True:
                         yield_flag = True
                         yield lines
                         lines = []
                         delimiter_flag = False
                     else:
-                        line = self.log_file_object.readline()
+                        line = readline()
                         lines.append(line)
-                        if any(p.match(line) for p in avail_patterns):
+                        if line.startswith(avail_prefixes):
                             delimiter_flag = True
             else:
                 if not yield_flag:
-                    raise StopIteration("None of the delimiter patterns are matched")
+                    raise RuntimeError("None of the delimiter patterns are matched")
                 break
         if delimiter_flag is True:
             raise RuntimeError("This file lacks some content, please check")
 
     def get_xyz_block_generator(self):
-        p3 = re.compile(r"^\s*(\d+)\s*")
         yield_flag = False
         while True:
             line = self.xyz_file_object.readline()
             if not line:
                 if not yield_flag:
-                    raise StopIteration("None of the xyz patterns are matched")
+                    raise RuntimeError("None of the xyz patterns are matched")
                 break
-            if p3.match(line):
+            match = xyz_natoms_pattern.match(line)
+            if match:
                 yield_flag = True
-                atom_num = int(p3.match(line).group(1))
-                lines = []
-                lines.append(line)
-                for ii in range(atom_num + 1):
-                    lines.append(self.xyz_file_object.readline())
-                if not lines[-1]:
+                atom_num = int(match.group(1))
+                lines = [line]
+                lines.extend(islice(self.xyz_file_object, atom_num + 1))
+                if len(lines) != atom_num + 2:
                     raise RuntimeError(
                         f"this xyz file may lack of lines, should be {atom_num + 2};lines:{lines}"
                     )
                 yield lines
 
-    def handle_single_log_frame(self, lines):
+    def skip_xyz_block(self):
+        """Skip the next xyz frame without parsing it.
+
+        Returns
+        -------
+        bool
+            whether a frame is found
+        """
+        for line in self.xyz_file_object:
+            match = xyz_natoms_pattern.match(line)
+            if match:
+                atom_num = int(match.group(1))
+                nskip = sum(1 for _ in islice(self.xyz_file_object, atom_num + 1))
+                if nskip != atom_num + 1:
+                    raise RuntimeError(
+                        f"this xyz file may lack of lines, should be {atom_num + 2}"
+                    )
+                return True
+        return False
+
+    def handle_single_log_frame(self, lines, parse_frame=True):
+        """Parse a block of the log file.
+
+        Parameters
+        ----------
+        lines : list of str
+            the lines of the block
+        parse_frame : bool, default=True
+            whether to parse the frame. If False, only the cell, the print
+            level, and the atomic kinds are updated, and None is returned.
+
+        Returns
+        -------
+        dict or None
+            the frame
+        """
         info_dict = {}
-        energy_pattern_1 = re.compile(
-            r" INITIAL POTENTIAL ENERGY\[hartree\]\s+=\s+(?P<number>\S+)"
-        )
-        #  CONSERVED QUANTITY [hartree] =                              -0.279168013085E+04
-        energy_pattern_2 = re.compile(
-            r" POTENTIAL ENERGY\[hartree\]\s+=\s+(?P<number>\S+)"
-        )
         energy = None
-        cell_length_pattern = re.compile(
-            r" (INITIAL ){0,1}CELL LNTHS\[bohr\]\s+=\s+(?P<A>\S+)\s+(?P<B>\S+)\s+(?P<C>\S+)"
-        )
-        cell_angle_pattern = re.compile(
-            r" (INITIAL ){0,1}CELL ANGLS\[deg\]\s+=\s+(?P<alpha>\S+)\s+(?P<beta>\S+)\s+(?P<gamma>\S+)"
-        )
         cell_A, cell_B, cell_C = (
             0,
             0,
@@ -149,105 +218,86 @@ class Cp2kSystems:
             0,
             0,
         )
-        cell_a_pattern = re.compile(
-            r" CELL\| Vector a \[angstrom\]:\s+(?P<ax>\S+)\s+(?P<ay>\S+)\s+(?P<az>\S+)"
-        )
-        cell_b_pattern = re.compile(
-            r" CELL\| Vector b \[angstrom\]:\s+(?P<bx>\S+)\s+(?P<by>\S+)\s+(?P<bz>\S+)"
-        )
-        cell_c_pattern = re.compile(
-            r" CELL\| Vector c \[angstrom\]:\s+(?P<cx>\S+)\s+(?P<cy>\S+)\s+(?P<cz>\S+)"
-        )
-        force_start_pattern = re.compile(r" ATOMIC FORCES in")
+        cell_vectors = {}
         force_flag = False
-        force_end_pattern = re.compile(r" SUM OF ATOMIC FORCES")
         force_lines = []
         cell_flag = 0
-        print_level_pattern = re.compile(
-            r" GLOBAL\| Global print level\s+(?P<print_level>\S+)"
-        )
         print_level_flag = 0
-        atomic_kinds_pattern = re.compile(r"\s+\d+\. Atomic kind:\s+(?P<akind>\S+)")
         atomic_kinds = []
         stress_sign = "STRESS"
         stress_flag = 0
         stress = []
 
         for line in lines:
-            if stress_flag == 3:
-                if line == "\n":
-                    stress_flag = 0
-                else:
-                    stress.append(line.split()[1:4])
-            if stress_flag == 2:
-                stress_flag = 3
-            if stress_flag == 1:
-                stress_flag = 2
-            if stress_sign in line:
-                stress_flag = 1
-            if force_start_pattern.match(line):
+            if force_flag:
+                if line.startswith(" SUM OF ATOMIC FORCES"):
+                    force_flag = False
+                elif parse_frame:
+                    force_lines.append(line)
+                continue
+            if parse_frame:
+                if stress_flag == 3:
+                    if line == "\n":
+                        stress_flag = 0
+                    else:
+                        stress.append(line.split()[1:4])
+                elif stress_flag:
+                    stress_flag += 1
+                if stress_sign in line:
+                    stress_flag = 1
+            if line.startswith(" CELL"):
+                match = cell_vector_pattern.match(line)
+                if match:
+                    cell_vectors[match.group("v")] = [
+                        float(match.group(xx)) for xx in "xyz"
+                    ]
+                    cell_flag += 1
+                    continue
+            elif line.startswith(" INITIAL "):
+                pass
+            elif line.startswith(" POTENTIAL ENERGY"):
+                if parse_frame:
+                    match = energy_pattern.match(line)
+                    if match:
+                        energy = float(match.group("number")) * AU_TO_EV
+                continue
+            elif line.startswith(" ATOMIC FORCES in"):
                 force_flag = True
-            if force_end_pattern.match(line):
-                assert force_flag is True, (
-                    force_flag,
-                    "there may be errors in this file ",
-                )
-                force_flag = False
-            if force_flag is True:
-                force_lines.append(line)
-            if energy_pattern_1.match(line):
-                energy = (
-                    float(energy_pattern_1.match(line).groupdict()["number"]) * AU_TO_EV
-                )
-                # print('1to', energy)
-            if energy_pattern_2.match(line):
-                energy = (
-                    float(energy_pattern_2.match(line).groupdict()["number"]) * AU_TO_EV
-                )
-            if cell_length_pattern.match(line):
-                cell_A = (
-                    float(cell_length_pattern.match(line).groupdict()["A"]) * AU_TO_ANG
-                )
-                cell_B = (
-                    float(cell_length_pattern.match(line).groupdict()["B"]) * AU_TO_ANG
-                )
-                cell_C = (
-                    float(cell_length_pattern.match(line).groupdict()["C"]) * AU_TO_ANG
-                )
-                cell_flag += 1
-            if cell_angle_pattern.match(line):
-                cell_alpha = np.deg2rad(
-                    float(cell_angle_pattern.match(line).groupdict()["alpha"])
-                )
-                cell_beta = np.deg2rad(
-                    float(cell_angle_pattern.match(line).groupdict()["beta"])
-                )
-                cell_gamma = np.deg2rad(
-                    float(cell_angle_pattern.match(line).groupdict()["gamma"])
-                )
-                cell_flag += 1
-            if print_level_pattern.match(line):
-                print_level = print_level_pattern.match(line).groupdict()["print_level"]
-                print_level_flag += 1
-            if cell_a_pattern.match(line):
-                cell_ax = float(cell_a_pattern.match(line).groupdict()["ax"])
-                cell_ay = float(cell_a_pattern.match(line).groupdict()["ay"])
-                cell_az = float(cell_a_pattern.match(line).groupdict()["az"])
-                cell_flag += 1
-            if cell_b_pattern.match(line):
-                cell_bx = float(cell_b_pattern.match(line).groupdict()["bx"])
-                cell_by = float(cell_b_pattern.match(line).groupdict()["by"])
-                cell_bz = float(cell_b_pattern.match(line).groupdict()["bz"])
+                force_lines = []
+                continue
+            elif line.startswith(" SUM OF ATOMIC FORCES"):
+                raise RuntimeError("there may be errors in this file")
+            elif line.startswith(" GLOBAL| Global print level"):
+                match = print_level_pattern.match(line)
+                if match:
+                    print_level = match.group("print_level")
+                    print_level_flag += 1
+                continue
+            else:
+                if "Atomic kind:" in line:
+                    match = atomic_kinds_pattern.match(line)
+                    if match:
+                        atomic_kinds.append(match.group("akind"))
+                continue
+            # lines starting with " CELL" or " INITIAL "
+            match = cell_length_pattern.match(line)
+            if match:
+                cell_A = float(match.group("A")) * AU_TO_ANG
+                cell_B = float(match.group("B")) * AU_TO_ANG
+                cell_C = float(match.group("C")) * AU_TO_ANG
                 cell_flag += 1
-            if cell_c_pattern.match(line):
-                cell_cx = float(cell_c_pattern.match(line).groupdict()["cx"])
-                cell_cy = float(cell_c_pattern.match(line).groupdict()["cy"])
-                cell_cz = float(cell_c_pattern.match(line).groupdict()["cz"])
+                continue
+            match = cell_angle_pattern.match(line)
+            if match:
+                cell_alpha = np.deg2rad(float(match.group("alpha")))
+                cell_beta = np.deg2rad(float(match.group("beta")))
+                cell_gamma = np.deg2rad(float(match.group("gamma")))
                 cell_flag += 1
-
-            if atomic_kinds_pattern.match(line):
-                akind = atomic_kinds_pattern.match(line).groupdict()["akind"]
-                atomic_kinds.append(akind)
+                continue
+            if parse_frame:
+                match = energy_pattern.match(line)
+                if match:
+                    energy = float(match.group("number")) * AU_TO_EV
         if print_level_flag == 1:
             self.print_level = print_level
             if print_level == "LOW":
@@ -261,73 +311,44 @@ class Cp2kSystems:
             )
         elif cell_flag == 5:
             self.cell = np.asarray(
-                [
-                    [cell_ax, cell_ay, cell_az],
-                    [cell_bx, cell_by, cell_bz],
-                    [cell_cx, cell_cy, cell_cz],
-                ]
+                [cell_vectors["a"], cell_vectors["b"], cell_vectors["c"]]
             ).astype("float64")
         if atomic_kinds:
             self.atomic_kinds = atomic_kinds
-        # print(self.atomic_kinds)
-        # lx = cell_A
-        # xy = cell_B * np.cos(cell_gamma)
-        # xz = cell_C * np.cos(cell_beta)
-        # ly = cell_B* np.sin(cell_gamma)
-        # yz = (cell_B*cell_C*np.cos(cell_alpha)-xy*xz)/ly
-        # lz = np.sqrt(cell_C**2-xz**2-yz**2)
-        # self.cell = [[lx, 0 , 0],
-        #         [xy, ly, 0 ],
-        #         [xz, yz, lz]]
-
-        element_index = -1
-        element_dict = OrderedDict()
-        atom_types_idx_list = []
-        forces_list = []
-        for line in force_lines[3:]:
-            line_list = line.split()
-            # print(line_list)
-            if element_dict.get(line_list[1]):
-                element_dict[line_list[1]][1] += 1
-            else:
-                element_index += 1
-                element_dict[line_list[1]] = [element_index, 1]
-            atom_types_idx_list.append(element_dict[line_list[1]][0])
-            forces_list.append(
-                [
-                    float(line_list[3]) * AU_TO_EV_EVERY_ANG,
-                    float(line_list[4]) * AU_TO_EV_EVERY_ANG,
-                    float(line_list[5]) * AU_TO_EV_EVERY_ANG,
-                ]
+        if not parse_frame:
+            return None
+
+        # the first two lines are the blank line and the header
+        force_lines = force_lines[2:]
+        if force_lines:
+            table = np.array(" ".join(force_lines).split()).reshape(
+                len(force_lines), -1
             )
-        # print(atom_types_idx_list)
-        # atom_names=list(element_dict.keys())
+            _, atom_numbs, atom_types = encode_species(table[:, 1])
+            forces = table[:, 3:6].astype("float64") * AU_TO_EV_EVERY_ANG
+        else:
+            atom_numbs = []
+            atom_types = np.zeros(0, dtype=int)
+            forces = np.zeros((0, 3))
         atom_names = self.atomic_kinds
-        atom_numbs = []
 
         GPa = PressureConversion("eV/angstrom^3", "GPa").value()
         if stress:
-            stress = np.array(stress)
-            stress = stress.astype("float64")
-            stress = stress[np.newaxis, :, :]
+            stress = np.array(stress).astype("float64")
             # stress to virial conversion, default unit in cp2k is GPa
             # note the stress is virial = stress * volume
             virial = stress * np.linalg.det(self.cell) / GPa
-            virial = virial.squeeze()
         else:
             virial = None
-        for ii in element_dict.keys():
-            atom_numbs.append(element_dict[ii][1])
-        # print(atom_numbs)
         info_dict["atom_names"] = atom_names
         info_dict["atom_numbs"] = atom_numbs
-        info_dict["atom_types"] = np.asarray(atom_types_idx_list)
+        info_dict["atom_types"] = atom_types
         info_dict["print_level"] = self.print_level
         info_dict["cells"] = np.asarray([self.cell]).astype("float64")
-        info_dict["energies"] = np.asarray([energy]).astype("float64")
-        info_dict["forces"] = np.asarray([forces_list]).astype("float64")
+        info_dict["energies"] = np.array([energy], dtype="float64")
+        info_dict["forces"] = forces[np.newaxis]
         if virial is not None:
-            info_dict["virials"] = np.asarray([virial]).astype("float64")
+            info_dict["virials"] = virial[np.newaxis]
         return info_dict
 
     def handle_single_xyz_frame(self, lines):
@@ -338,40 +359,16 @@ class Cp2kSystems:
                 f"format error, atom_num=={atom_num}, {len(lines)}!=atom_num+2"
             )
         data_format_line = lines[1].strip("\n").strip() + " "
-        prop_pattern = re.compile(r"(?P<prop>\w+)\s*=\s*(?P<number>.*?)[, ]")
-        prop_dict = dict(prop_pattern.findall(data_format_line))
+        prop_dict = dict(xyz_prop_pattern.findall(data_format_line))
 
         energy = 0
         if prop_dict.get("E"):
             energy = float(prop_dict.get("E")) * AU_TO_EV
             # info_dict['energies'] = np.array([prop_dict['E']]).astype('float64')
 
-        element_index = -1
-        element_dict = OrderedDict()
-        atom_types_list = []
-        coords_list = []
-        for line in lines[2:]:
-            line_list = line.split()
-            if element_dict.get(line_list[0]):
-                element_dict[line_list[0]][1] += 1
-            else:
-                element_index += 1
-                element_dict[line_list[0]] = [element_index, 1]
-            atom_types_list.append(element_dict[line_list[0]][0])
-            # coords_list.append([float(line_list[1])*AU_TO_ANG,
-            #     float(line_list[2])*AU_TO_ANG,
-            #     float(line_list[3])*AU_TO_ANG])
-            coords_list.append(
-                [float(line_list[1]), float(line_list[2]), float(line_list[3])]
-            )
-        atom_names = list(element_dict.keys())
-        atom_numbs = []
-        for ii in atom_names:
-            atom_numbs.append(element_dict[ii][1])
-        # info_dict['atom_names'] = atom_names
-        # info_dict['atom_numbs'] = atom_numbs
-        # info_dict['atom_types'] = np.asarray(atom_types_list)
-        info_dict["coords"] = np.asarray([coords_list]).astype("float64")
+        table = np.array(" ".join(lines[2:]).split()).reshape(atom_num, -1)
+        # coordinates are in angstrom
+        info_dict["coords"] = table[np.newaxis, :, 1:4].astype("float64")
         info_dict["energies"] = np.array([energy]).astype("float64")
         info_dict["orig"] = np.zeros(3)
         return info_dict
@@ -394,7 +391,7 @@ def get_frames(fname):
     force = []
     stress = []
 
-    fp = open(fname)
+    fp = open_path(fname)
     # check if output is converged, if not, return sys = 0
     content = fp.read()
     count = content.count("SCF run converged")
@@ -0,0 +1,96 @@
+"""Structural fingerprints used to detect duplicated frames."""
+
+from __future__ import annotations
+
+import hashlib
+
+import numpy as np
+
+from dpdata.md.pbc import dir_coord
+
+
+def frame_fingerprints(
+    coords: np.ndarray,
+    cells: np.ndarray,
+    atom_types: np.ndarray,
+    tol: float = 1e-4,
+    nopbc: bool = False,
+) -> list[bytes]:
+    """Compute a structural fingerprint for each frame.
+
+    The coordinates are wrapped into the cell (unless `nopbc`), quantized on a
+    grid with spacing `tol`, and the atoms of the same type are sorted by the
+    quantized coordinates, so that the fingerprint is invariant to periodic
+    images and to permutations of atoms of the same type. The quantized cell
+    is included when the system is periodic.
+
+    Two frames sharing the same fingerprint are identical within `tol`. Since
+    the comparison is based on quantization, two frames differing by less
+    than `tol` may still be separated by a grid boundary.
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        coordinates, in the shape of (nframes, natoms, 3)
+    cells : np.ndarray
+        cells, in the shape of (nframes, 3, 3)
+    atom_types : np.ndarray
+        atom types, in the shape of (natoms,)
+    tol : float, default=1e-4
+        the tolerance (grid spacing) of coordinates and cells, in Angstrom
+    nopbc : bool, default=False
+        whether the system is non-periodic
+
+    Returns
+    -------
+    list[bytes]
+        the fingerprint of each frame
+    """
+    if tol <= 0:
+        raise RuntimeError("tol should be positive")
+    coords = np.asarray(coords, dtype=np.float64)
+    nframes, natoms = coords.shape[:2]
+    if nopbc:
+        qcoords = np.rint(coords / tol).astype(np.int64)
+        qcells = np.zeros((nframes, 0), dtype=np.int64)
+    else:
+        cells = np.asarray(cells, dtype=np.float64)
+        # number of grid points along each cell vector
+        nbins = np.maximum(np.ceil(np.linalg.norm(cells, axis=2) / tol), 1)
+        nbins = nbins.reshape(nframes, 1, 3)
+        frac = dir_coord(coords, cells) % 1.0
+        # atoms on the opposite faces of the cell fall into the same bin
+        qcoords = (np.rint(frac * nbins) % nbins).astype(np.int64)
+        qcells = np.rint(cells / tol).astype(np.int64).reshape(nframes, 9)
+    atom_types = np.broadcast_to(np.asarray(atom_types), (nframes, natoms))
+    # sort atoms by type, then by the quantized coordinates
+    idx = np.lexsort(
+        (qcoords[:, :, 2], qcoords[:, :, 1], qcoords[:, :, 0], atom_types), axis=-1
+    )
+    qcoords = np.take_along_axis(qcoords, idx[:, :, None], axis=1)
+    keys = np.concatenate((qcells, qcoords.reshape(nframes, -1)), axis=1)
+    keys = np.ascontiguousarray(keys)
+    return [hashlib.sha256(kk.tobytes()).digest() for kk in keys]
+
+
+def unique_frame_index(fingerprints: list[bytes]) -> tuple[np.ndarray, np.ndarray]:
+    """Find the first occurrence of each distinct fingerprint.
+
+    Parameters
+    ----------
+    fingerprints : list[bytes]
+        the fingerprint of each frame
+
+    Returns
+    -------
+    np.ndarray
+        indices of the kept frames, in the original order
+    np.ndarray
+        indices of the removed (duplicated) frames
+    """
+    seen = {}
+    for ii, fp in enumerate(fingerprints):
+        seen.setdefault(fp, ii)
+    keep = np.zeros(len(fingerprints), dtype=bool)
+    keep[list(seen.values())] = True
+    return np.flatnonzero(keep), np.flatnonzero(~keep)
@@ -153,10 +153,12 @@ def dump(folder, data, set_size=5000, comp_prec=np.float32, remove_sets=True):
             )
             continue
         ddata = np.reshape(data[dtype.name], [nframes, -1])
-        if np.issubdtype(ddata.dtype, np.floating):
-            ddata = ddata.astype(comp_prec)
         for ii in range(nsets):
             set_stt = ii * set_size
             set_end = (ii + 1) * set_size
             set_folder = os.path.join(folder, "set.%03d" % ii)  # noqa: UP031
-            np.save(os.path.join(set_folder, dtype.deepmd_name), ddata[set_stt:set_end])
+            # convert the precision set by set to avoid a full copy
+            set_data = ddata[set_stt:set_end]
+            if np.issubdtype(set_data.dtype, np.floating):
+                set_data = set_data.astype(comp_prec)
+            np.save(os.path.join(set_folder, dtype.deepmd_name), set_data)
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import copy
-
 import numpy as np
 
 import dpdata
@@ -57,35 +55,37 @@ def to_system_data(folder, type_map=None, labels=True):
             extra_data[name] = data.pop(name)
 
     data_list = []
-    while True:
-        if all_real_atom_types_concat.size == 0:
-            break
-        temp_atom_numbs = [
-            np.count_nonzero(all_real_atom_types_concat[0] == i)
-            for i in range(len(data["atom_names"]))
-        ]
-        # temp_formula = formula(data['atom_names'], temp_atom_numbs)
-        temp_idx = np.arange(all_real_atom_types_concat.shape[0])[
-            (all_real_atom_types_concat == all_real_atom_types_concat[0]).all(-1)
-        ]
-        rest_idx = np.arange(all_real_atom_types_concat.shape[0])[
-            (all_real_atom_types_concat != all_real_atom_types_concat[0]).any(-1)
-        ]
+    if all_real_atom_types_concat.size == 0:
+        return data_list
+    # group frames by their type vectors in a single pass
+    uniq_types, first_idx, inverse = np.unique(
+        all_real_atom_types_concat, axis=0, return_index=True, return_inverse=True
+    )
+    # keep the order of the first occurrence of each type vector
+    order = np.argsort(first_idx, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    group = rank[inverse.reshape(-1)]
+    # stable sort keeps the order of frames in each group
+    sort_idx = np.argsort(group, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(group))))
+    all_cells_concat = all_cells_concat[sort_idx]
+    all_coords_concat = all_coords_concat[sort_idx]
+    for name in extra_data:
+        extra_data[name] = extra_data[name][sort_idx]
+
+    for ii, uu in enumerate(order):
+        temp_slice = slice(bounds[ii], bounds[ii + 1])
         temp_data = data.copy()
         temp_data["atom_names"] = data["atom_names"].copy()
-        temp_data["atom_numbs"] = temp_atom_numbs
-        temp_data["atom_types"] = all_real_atom_types_concat[0]
-        all_real_atom_types_concat = all_real_atom_types_concat[rest_idx]
-        temp_data["cells"] = all_cells_concat[temp_idx]
-        all_cells_concat = all_cells_concat[rest_idx]
-        temp_data["coords"] = all_coords_concat[temp_idx]
-        all_coords_concat = all_coords_concat[rest_idx]
-
+        temp_data["atom_numbs"] = np.bincount(
+            uniq_types[uu], minlength=len(data["atom_names"])
+        ).tolist()
+        temp_data["atom_types"] = uniq_types[uu]
+        temp_data["cells"] = all_cells_concat[temp_slice]
+        temp_data["coords"] = all_coords_concat[temp_slice]
         for name in extra_data:
-            all_dtype_concat = extra_data[name]
-            temp_data[name] = all_dtype_concat[temp_idx]
-            extra_data[name] = all_dtype_concat[rest_idx]
-
+            temp_data[name] = extra_data[name][temp_slice]
         data_list.append(temp_data)
     return data_list
 
@@ -95,8 +95,9 @@ def dump(folder, data, set_size=2000, comp_prec=np.float32, remove_sets=True):
     if "real_atom_types" not in data:
         from dpdata import LabeledSystem, System
 
-        # not change the original content
-        data = copy.deepcopy(data)
+        # not change the original content; the conversion only replaces
+        # items of the dict, so a shallow copy is enough
+        data = data.copy()
 
         if "energies" in data:
             temp_sys = LabeledSystem(data=data)
@@ -112,6 +113,10 @@ def dump(folder, data, set_size=2000, comp_prec=np.float32, remove_sets=True):
 def mix_system(*system, type_map, **kwargs):
     """Mix the systems into mixed_type ones according to the unified given type_map.
 
+    Systems are grouped by the number of atoms. The size of each mixed system
+    is planned before the arrays are allocated, and then the arrays are filled
+    system by system, so each frame is copied only once.
+
     Parameters
     ----------
     *system : System
@@ -126,27 +131,97 @@ def mix_system(*system, type_map, **kwargs):
     mixed_systems: dict
         dict of mixed system with key 'atom_numbs'
     """
-    mixed_systems = {}
-    temp_systems = {}
-    atom_numbs_frame_index = {}  # index of frames in cur sys
+    # plan: group systems by the number of atoms
+    grouped_systems = {}
     for sys in system:
-        tmp_sys = sys.copy()
-        natom = tmp_sys.get_natoms()
-        tmp_sys.convert_to_mixed_type(type_map=type_map)
-        if str(natom) not in atom_numbs_frame_index:
-            atom_numbs_frame_index[str(natom)] = 0
-        atom_numbs_frame_index[str(natom)] += tmp_sys.get_nframes()
-        if str(natom) not in temp_systems or not temp_systems[str(natom)]:
-            temp_systems[str(natom)] = tmp_sys
-        else:
-            temp_systems[str(natom)].append(tmp_sys)
-    for natom in temp_systems:
-        if atom_numbs_frame_index[natom] > 0:
-            sys_name = f"{natom}"
-            mixed_systems[sys_name] = temp_systems[natom]
+        if sys.get_nframes() > 0:
+            grouped_systems.setdefault(str(sys.get_natoms()), []).append(sys)
+    type_index = {name: ii for ii, name in enumerate(type_map)}
+    mixed_systems = {}
+    for natom, systems in grouped_systems.items():
+        mixed_systems[natom] = _mix_system_same_natoms(systems, type_map, type_index)
     return mixed_systems
 
 
+def _mix_system_same_natoms(systems, type_map, type_index):
+    """Mix the systems with the same number of atoms into one mixed_type system.
+
+    Parameters
+    ----------
+    systems : list of System
+        The systems to mix
+    type_map : list of str
+        Maps atom type to name
+    type_index : dict of str to int
+        The index of each name in type_map
+
+    Returns
+    -------
+    System
+        The mixed system
+    """
+    first = systems[0]
+    natoms = first.get_natoms()
+    nframes = sum(ss.get_nframes() for ss in systems)
+    frame_dtypes = []
+    for tt in first.DTYPES:
+        if tt.name == "real_atom_types":
+            continue
+        if tt.shape is None or dpdata.system.Axis.NFRAMES not in tt.shape:
+            continue
+        for ss in systems:
+            if tt.name not in first.data and tt.name in ss.data:
+                raise RuntimeError(f"system has {tt.name}, but this does not")
+            elif tt.name in first.data and tt.name not in ss.data:
+                raise RuntimeError(f"this has {tt.name}, but system does not")
+        if tt.name in first.data:
+            frame_dtypes.append(tt)
+
+    # allocate
+    data = {
+        "atom_names": ["MIXED_TOKEN"],
+        "atom_numbs": [natoms],
+        "atom_types": np.zeros((natoms,), dtype=int),
+        "orig": np.copy(first.data["orig"]),
+        "real_atom_names": list(type_map),
+        "real_atom_types": np.empty((nframes, natoms), dtype=int),
+    }
+    for tt in frame_dtypes:
+        axis_nframes = tt.shape.index(dpdata.system.Axis.NFRAMES)
+        shape = list(first.data[tt.name].shape)
+        shape[axis_nframes] = nframes
+        dtype = np.result_type(*[ss.data[tt.name] for ss in systems])
+        data[tt.name] = np.empty(shape, dtype=dtype)
+    if all(ss.nopbc for ss in systems):
+        data["nopbc"] = True
+
+    # fill
+    frame_stt = 0
+    for ss in systems:
+        frame_end = frame_stt + ss.get_nframes()
+        if "real_atom_types" in ss.data:
+            index_map = np.array([type_index[nn] for nn in ss.data["real_atom_names"]])
+            data["real_atom_types"][frame_stt:frame_end] = index_map[
+                ss.data["real_atom_types"]
+            ]
+        else:
+            index_map = np.array([type_index[nn] for nn in ss.data["atom_names"]])
+            data["real_atom_types"][frame_stt:frame_end] = index_map[
+                ss.data["atom_types"]
+            ]
+        for tt in frame_dtypes:
+            axis_nframes = tt.shape.index(dpdata.system.Axis.NFRAMES)
+            idx = [slice(None)] * data[tt.name].ndim
+            idx[axis_nframes] = slice(frame_stt, frame_end)
+            data[tt.name][tuple(idx)] = ss.data[tt.name]
+        frame_stt = frame_end
+    # real_atom_names does not match the placeholder atom_names, so the
+    # data is not checked, same as System.convert_to_mixed_type
+    mixed_system = first.__class__()
+    mixed_system.data = data
+    return mixed_system
+
+
 def split_system(sys, split_num=10000):
     rest = sys.get_nframes() - split_num
     if rest <= 0:
@@ -0,0 +1,268 @@
+"""Per-frame descriptors and farthest point sampling for diverse subsets."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+from dpdata.md.pbc import dir_coord
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterator
+
+    from dpdata.system import System
+
+    DescriptorType = str | Callable[[System], np.ndarray]
+
+
+def radial_descriptor(
+    coords: np.ndarray,
+    cells: np.ndarray,
+    atom_types: np.ndarray,
+    ntypes: int,
+    rcut: float = 6.0,
+    nbins: int = 20,
+    nopbc: bool = False,
+    chunk_size: int | None = None,
+) -> np.ndarray:
+    """Compute the radial fingerprint of each frame.
+
+    The fingerprint is the histogram of pair distances within `rcut`,
+    resolved by pairs of atom types and normalized by the number of atoms.
+    Periodic images are handled by the minimum image convention, which is
+    exact when `rcut` is less than half of the cell heights.
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        coordinates, in the shape of (nframes, natoms, 3)
+    cells : np.ndarray
+        cells, in the shape of (nframes, 3, 3)
+    atom_types : np.ndarray
+        atom types, in the shape of (natoms,) or (nframes, natoms)
+    ntypes : int
+        number of atom types
+    rcut : float, default=6.0
+        cutoff radius, in Angstrom
+    nbins : int, default=20
+        number of bins of the histogram
+    nopbc : bool, default=False
+        whether the system is non-periodic
+    chunk_size : int, optional
+        number of frames computed at once. By default, it is chosen so that
+        about one million atom pairs are computed at once.
+
+    Returns
+    -------
+    np.ndarray
+        descriptors, in the shape of (nframes, ntypes * (ntypes + 1) // 2 * nbins)
+    """
+    nframes, natoms = coords.shape[:2]
+    # index of each pair of types
+    ti, tj = np.triu_indices(ntypes)
+    npairs = len(ti)
+    pair_index = np.zeros((ntypes, ntypes), dtype=int)
+    pair_index[ti, tj] = np.arange(npairs)
+    pair_index[tj, ti] = np.arange(npairs)
+    ii, jj = np.triu_indices(natoms, k=1)
+    if chunk_size is None:
+        chunk_size = max(1, 2**20 // max(len(ii), 1))
+    atom_types = np.broadcast_to(np.asarray(atom_types), (nframes, natoms))
+    descriptors = np.zeros((nframes, npairs * nbins), dtype=np.float32)
+    for start in range(0, nframes, chunk_size):
+        ss = slice(start, start + chunk_size)
+        cc = np.asarray(coords[ss], dtype=np.float64)
+        nc = cc.shape[0]
+        diff = cc[:, jj] - cc[:, ii]
+        if not nopbc:
+            box = np.asarray(cells[ss], dtype=np.float64)
+            frac = dir_coord(diff, box)
+            frac -= np.rint(frac)
+            diff = np.matmul(frac, box)
+        dist = np.linalg.norm(diff, axis=-1)
+        tt = atom_types[ss]
+        pidx = pair_index[tt[:, ii], tt[:, jj]]
+        bidx = np.floor(dist / rcut * nbins).astype(int)
+        mask = bidx < nbins
+        fidx = np.broadcast_to(np.arange(nc)[:, None], bidx.shape)
+        flat = (fidx[mask] * npairs + pidx[mask]) * nbins + bidx[mask]
+        counts = np.bincount(flat, minlength=nc * npairs * nbins)
+        descriptors[ss] = counts.reshape(nc, -1) / max(natoms, 1)
+    return descriptors
+
+
+def farthest_point_sampling(
+    descriptors: np.ndarray,
+    n: int,
+    start: int = 0,
+    chunk_size: int = 65536,
+) -> np.ndarray:
+    """Select `n` frames by farthest point sampling.
+
+    Each newly selected frame is the one with the largest Euclidean distance
+    in the descriptor space to the frames already selected. The descriptors
+    are visited in chunks, so `descriptors` can be a memory-mapped array and
+    only the minimal distance of each frame is kept in memory.
+
+    Parameters
+    ----------
+    descriptors : np.ndarray
+        descriptors, in the shape of (nframes, ndescriptor)
+    n : int
+        number of frames to select
+    start : int, default=0
+        index of the first selected frame
+    chunk_size : int, default=65536
+        number of frames visited at once
+
+    Returns
+    -------
+    np.ndarray
+        indices of the selected frames, in the order of selection
+    """
+    nframes = len(descriptors)
+    if not 0 <= n <= nframes:
+        raise RuntimeError(f"n should be between 0 and {nframes}")
+    selected = np.empty(n, dtype=int)
+    min_dist = np.full(nframes, np.inf)
+    idx = start
+    for kk in range(n):
+        selected[kk] = idx
+        center = np.asarray(descriptors[idx], dtype=np.float64)
+        for ss in range(0, nframes, chunk_size):
+            chunk = np.asarray(descriptors[ss : ss + chunk_size], dtype=np.float64)
+            dist = np.sum(np.square(chunk - center), axis=1)
+            np.minimum(
+                min_dist[ss : ss + chunk_size], dist, out=min_dist[ss : ss + chunk_size]
+            )
+        # never select a frame twice
+        min_dist[idx] = -np.inf
+        idx = int(np.argmax(min_dist))
+    return selected
+
+
+def iter_descriptors(
+    system: System,
+    descriptor: DescriptorType = "radial",
+    ntypes: int | None = None,
+    chunk_size: int = 65536,
+    **kwargs,
+) -> Iterator[np.ndarray]:
+    """Compute the descriptors of a system chunk by chunk.
+
+    Only the frames of one chunk are read and described at a time, so that
+    memory-mapped systems with many frames are not loaded at once.
+
+    Parameters
+    ----------
+    system : System
+        the system
+    descriptor : str or callable, default="radial"
+        ``"radial"`` for :func:`radial_descriptor`, or a function that takes
+        a system and returns descriptors in the shape of (nframes, ndescriptor)
+    ntypes : int, optional
+        number of atom types of the radial descriptor. By default, the
+        number of types of the system
+    chunk_size : int, default=65536
+        number of frames described at once
+    **kwargs : dict
+        other parameters passed to :func:`radial_descriptor` or to the
+        callable `descriptor`
+
+    Yields
+    ------
+    np.ndarray
+        descriptors of each chunk, in the shape of (nframes, ndescriptor)
+    """
+    nframes = system.get_nframes()
+    if callable(descriptor):
+        for ss in range(0, nframes, chunk_size):
+            yield np.asarray(
+                descriptor(system.sub_system(slice(ss, ss + chunk_size)), **kwargs)
+            )
+        return
+    if descriptor != "radial":
+        raise RuntimeError(f"Unsupported descriptor {descriptor}")
+    if "real_atom_types" in system.data:
+        atom_types = system.data["real_atom_types"]
+        if ntypes is None:
+            ntypes = len(system.data["real_atom_names"])
+    else:
+        atom_types = system.data["atom_types"]
+        if ntypes is None:
+            ntypes = system.get_ntypes()
+    for ss in range(0, nframes, chunk_size):
+        frames = slice(ss, ss + chunk_size)
+        yield radial_descriptor(
+            system.data["coords"][frames],
+            system.data["cells"][frames],
+            atom_types if atom_types.ndim == 1 else atom_types[frames],
+            ntypes,
+            nopbc=system.nopbc,
+            **kwargs,
+        )
+
+
+def get_descriptors(
+    system: System | list[System],
+    descriptor: DescriptorType = "radial",
+    ntypes: int | None = None,
+    descriptor_file: str | os.PathLike | None = None,
+    chunk_size: int = 65536,
+    **kwargs,
+) -> np.ndarray:
+    """Compute the descriptors of all frames in one or more systems.
+
+    The descriptors are computed chunk by chunk and written into a single
+    array. If `descriptor_file` is given, the array is a memory-mapped
+    ``.npy`` file, so that the memory is bounded by the size of a chunk
+    for any number of frames.
+
+    Parameters
+    ----------
+    system : System or list[System]
+        the system, or the systems whose descriptors are concatenated
+    descriptor : str or callable, default="radial"
+        ``"radial"`` for :func:`radial_descriptor`, or a function that takes
+        a system and returns descriptors in the shape of (nframes, ndescriptor)
+    ntypes : int, optional
+        number of atom types of the radial descriptor. By default, the
+        number of types of each system
+    descriptor_file : str or os.PathLike, optional
+        the ``.npy`` file in which the descriptors are stored. By default,
+        they are kept in memory
+    chunk_size : int, default=65536
+        number of frames described at once
+    **kwargs : dict
+        other parameters passed to :func:`radial_descriptor` or to the
+        callable `descriptor`
+
+    Returns
+    -------
+    np.ndarray
+        descriptors, in the shape of (nframes, ndescriptor)
+    """
+    systems = system if isinstance(system, (list, tuple)) else [system]
+    nframes = sum(ss.get_nframes() for ss in systems)
+    descriptors = None
+    start = 0
+    for ss in systems:
+        for chunk in iter_descriptors(
+            ss, descriptor, ntypes=ntypes, chunk_size=chunk_size, **kwargs
+        ):
+            if descriptors is None:
+                # the shape is known after the first chunk
+                shape = (nframes, *chunk.shape[1:])
+                if descriptor_file is None:
+                    descriptors = np.empty(shape, dtype=chunk.dtype)
+                else:
+                    descriptors = np.lib.format.open_memmap(
+                        descriptor_file, mode="w+", dtype=chunk.dtype, shape=shape
+                    )
+            descriptors[start : start + len(chunk)] = chunk
+            start += len(chunk)
+    if descriptors is None:
+        return np.zeros((0, 0))
+    return descriptors
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import time
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
 
 from .plugin import Plugin
 
@@ -116,6 +118,15 @@ class HybridDriver(Driver):
         list of drivers or drivers dict. For a dict, it should
         contain `type` as the name of the driver, and others
         are arguments of the driver.
+    max_workers : int, optional, default=1
+        the maximum number of drivers evaluated concurrently in threads.
+        1 evaluates the drivers one after another, and None uses the
+        default of :class:`concurrent.futures.ThreadPoolExecutor`.
+
+    Attributes
+    ----------
+    timings : list[float]
+        the wall time in seconds of each driver in the last call of `label`
 
     Raises
     ------
@@ -132,7 +143,9 @@ class HybridDriver(Driver):
     This driver is the hybrid of SQM and DP.
     """
 
-    def __init__(self, drivers: list[dict | Driver]) -> None:
+    def __init__(
+        self, drivers: list[dict | Driver], max_workers: int | None = 1
+    ) -> None:
         self.drivers = []
         for driver in drivers:
             if isinstance(driver, Driver):
@@ -143,11 +156,27 @@ class HybridDriver(Driver):
                 self.drivers.append(Driver.get_driver(type)(**driver))
             else:
                 raise TypeError("driver should be Driver or dict")
+        self.max_workers = max_workers
+        self.timings = []
+
+    def _label_one(self, driver: Driver, data: dict) -> tuple[dict, float]:
+        """Label data with one driver and measure the wall time."""
+        start = time.perf_counter()
+        # each driver writes its labels to its own (shallow) copy of data
+        lb_data = driver.label(data.copy())
+        return lb_data, time.perf_counter() - start
 
     def label(self, data: dict) -> dict:
         """Label a system data.
 
-        Energies and forces are the sum of those of each driver.
+        Energies and forces are the sum of those of each driver. The sum is
+        always taken in the order of `drivers`, so the result does not depend
+        on which driver finishes first.
+
+        The drivers are independent, so they can be evaluated concurrently
+        in threads when `max_workers` is not 1. This is useful when drivers
+        call external programs, which do not hold the GIL. The wall time of
+        each driver in the last call is stored in `timings`.
 
         Parameters
         ----------
@@ -159,17 +188,31 @@ class HybridDriver(Driver):
         dict
             labeled data with energies and forces
         """
-        labeled_data = {}
-        for ii, driver in enumerate(self.drivers):
-            lb_data = driver.label(data.copy())
-            if ii == 0:
-                labeled_data = lb_data.copy()
-            else:
-                labeled_data["energies"] += lb_data["energies"]
-                if "forces" in labeled_data and "forces" in lb_data:
-                    labeled_data["forces"] += lb_data["forces"]
-                if "virials" in labeled_data and "virials" in lb_data:
-                    labeled_data["virials"] += lb_data["virials"]
+        if self.max_workers == 1 or len(self.drivers) <= 1:
+            results = [self._label_one(driver, data) for driver in self.drivers]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(self._label_one, driver, data)
+                    for driver in self.drivers
+                ]
+                results = [future.result() for future in futures]
+        self.timings = [tt for _, tt in results]
+
+        if len(results) == 0:
+            return {}
+        labeled_data = results[0][0]
+        # the summed arrays are allocated once, so the arrays returned by
+        # the first driver are not modified
+        allocated = set()
+        for lb_data, _ in results[1:]:
+            for key in ("energies", "forces", "virials"):
+                if key == "energies" or (key in labeled_data and key in lb_data):
+                    if key in allocated:
+                        labeled_data[key] += lb_data[key]
+                    else:
+                        labeled_data[key] = labeled_data[key] + lb_data[key]
+                        allocated.add(key)
         return labeled_data
 
 
@@ -254,3 +297,24 @@ class Minimizer(ABC):
         dict
             labeled data with minimized coordinates, energies, and forces
         """
+
+    def minimize_many(self, datas: Iterable[dict]) -> Iterator[dict]:
+        """Minimize the geometries of multiple systems.
+
+        By default, the systems are minimized one after another.
+        Minimizers may override it to distribute the frames of all
+        systems at once.
+
+        Parameters
+        ----------
+        datas : iterable of dict
+            data of each system with coordinates and atom types
+
+        Yields
+        ------
+        dict
+            labeled data with minimized coordinates, energies, and forces,
+            in the order of `datas`
+        """
+        for data in datas:
+            yield self.minimize(data)
@@ -5,6 +5,8 @@ import warnings
 
 import numpy as np
 
+from dpdata.utils import open_path
+
 latt_patt = r"\|\s+([0-9]{1,}[.][0-9]*)\s+([0-9]{1,}[.][0-9]*)\s+([0-9]{1,}[.][0-9]*)"
 pos_patt_first = r"\|\s+[0-9]{1,}[:]\s\w+\s(\w+)(\s.*[-]?[0-9]{1,}[.][0-9]*)(\s+[-]?[0-9]{1,}[.][0-9]*)(\s+[-]?[0-9]{1,}[.][0-9]*)"
 pos_patt_other = r"\s+[a][t][o][m]\s+([-]?[0-9]{1,}[.][0-9]*)\s+([-]?[0-9]{1,}[.][0-9]*)\s+([-]?[0-9]{1,}[.][0-9]*)\s+(\w{1,2})"
@@ -69,7 +71,7 @@ def get_fhi_aims_block(fp):
 
 
 def get_frames(fname, md=True, begin=0, step=1, convergence_check=True):
-    fp = open(fname)
+    fp = open_path(fname)
     blk = get_fhi_aims_block(fp)
     ret = get_info(blk, type_idx_zero=True)
 
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
 
 from dpdata.utils import open_file
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from dpdata.utils import FileType
 
 from ..periodic_table import ELEMENTS
@@ -19,7 +21,217 @@ force_convert = ForceConversion("hartree/bohr", "eV/angstrom").value()
 symbols = ["X"] + ELEMENTS
 
 
-def to_system_data(file_name: FileType, md=False):
+# markers of the blocks, each at the beginning of a line
+SCF_MARKER = "\n SCF Done"
+ORIENTATION_MARKERS = (
+    "\n                          Input orientation:",
+    "\n                         Z-Matrix orientation:",
+)
+FORCES_MARKER = "\n Center     Atomic                   Forces (Hartrees/Bohr)"
+# number of lines between the marker and the table
+_HEADER_LINES = {"orientation": 4, "forces": 2}
+_TABLE_END = "\n -------"
+
+
+def _find_line_end(text: str, pos: int, nlines: int) -> int:
+    """Find the end of the `nlines`-th line after `pos`, or -1 if not found."""
+    for _ in range(nlines):
+        pos = text.find("\n", pos + 1)
+        if pos < 0:
+            return -1
+    return pos
+
+
+def _iter_blocks(fp, chunk_size: int = 2**24) -> Iterator[tuple[str, Any]]:
+    """Iterate over the SCF, orientation, and forces blocks of a log file.
+
+    The file is read in chunks, and the blocks are located by searching the
+    markers in the text, so that the lines between the blocks are never
+    visited in Python.
+
+    Parameters
+    ----------
+    fp : TextIO
+        the log file
+    chunk_size : int, default=2**24
+        number of characters read at once
+
+    Yields
+    ------
+    str
+        the kind of the block, ``"energy"``, ``"orientation"``, or ``"forces"``
+    str or list of str
+        the SCF line, or the rows of the table
+    """
+    markers = [(SCF_MARKER, "energy")]
+    markers.extend((mm, "orientation") for mm in ORIENTATION_MARKERS)
+    markers.append((FORCES_MARKER, "forces"))
+    max_marker = max(len(mm) for mm, _ in markers)
+    # a leading newline so that the first line can be matched
+    text = "\n"
+    eof = False
+    while not eof:
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+            # terminate the last line
+            chunk = "\n"
+        text += chunk
+        pos = 0
+        next_pos = [text.find(mm) for mm, _ in markers]
+        while True:
+            found = [pp for pp in next_pos if pp >= 0]
+            if not found:
+                # keep the tail, which may contain a part of a marker
+                pos = max(pos, len(text) - max_marker)
+                break
+            start = min(found)
+            ii = next_pos.index(start)
+            kind = markers[ii][1]
+            if kind == "energy":
+                end = text.find("\n", start + 1)
+                if end < 0:
+                    pos = start
+                    break
+                yield kind, text[start + 1 : end]
+            else:
+                header_end = _find_line_end(text, start, _HEADER_LINES[kind] + 1)
+                end = text.find(_TABLE_END, header_end) if header_end >= 0 else -1
+                if end < 0:
+                    # the block is incomplete in this chunk
+                    pos = start
+                    break
+                yield (
+                    kind,
+                    text[header_end + 1 : end].split("\n") if end > header_end else [],
+                )
+            pos = end
+            for jj, (mm, _) in enumerate(markers):
+                if 0 <= next_pos[jj] < pos:
+                    next_pos[jj] = text.find(mm, pos)
+        text = text[pos:]
+
+
+def _iter_raw_frames(fp) -> Iterator[tuple[list[str], str, list[str]]]:
+    """Iterate over the frames, without parsing the tables.
+
+    A frame is completed by a forces block, and contains the last
+    orientation block and the last SCF line before it.
+
+    Parameters
+    ----------
+    fp : TextIO
+        the log file
+
+    Yields
+    ------
+    list of str
+        the rows of the orientation table
+    str
+        the SCF line
+    list of str
+        the rows of the forces table
+
+    Raises
+    ------
+    RuntimeError
+        if the input orientation of a frame is not found
+    """
+    orientation = None
+    energy = None
+    for kind, value in _iter_blocks(fp):
+        if kind == "energy":
+            energy = value
+        elif kind == "orientation":
+            orientation = value
+        else:
+            if orientation is None:
+                raise RuntimeError(
+                    "Input orientation is not found. Using Gaussian keyword "
+                    "`Geom=PrintInputOrient` to always print the input orientation. "
+                    "See https://gaussian.com/geom/ for more details."
+                )
+            assert energy is not None, "cannot find energies"
+            yield orientation, energy, value
+            orientation = None
+
+
+def _parse_frame(orientation: list[str], energy: str, forces: list[str]) -> dict:
+    """Parse the tables of a frame.
+
+    Parameters
+    ----------
+    orientation : list of str
+        the rows of the orientation table
+    energy : str
+        the SCF line
+    forces : list of str
+        the rows of the forces table
+
+    Returns
+    -------
+    dict
+        the frame, containing atom_symbols, coords, cells (None if not
+        periodic), energies, and forces, in the units of dpdata
+    """
+    table = np.array(" ".join(orientation).split(), dtype=float).reshape(
+        len(orientation), -1
+    )
+    numbers = table[:, 1].astype(int)
+    positions = table[:, 3:6]
+    # PBC cells, see https://gaussian.com/pbc/
+    pbc = numbers == -2
+    if pbc.any():
+        cells = positions[pbc]
+        positions = positions[~pbc]
+        numbers = numbers[~pbc]
+        forces = [ll for ll in forces if ll[14:16] != "-2"]
+    else:
+        cells = None
+    tokens = " ".join(forces).split()
+    if len(tokens) == 5 * len(forces):
+        force = np.array(tokens, dtype=float).reshape(len(forces), 5)[:, 2:]
+    else:
+        # the columns are not separated when the forces are too large
+        force = np.array([[ll[23:38], ll[38:53], ll[53:68]] for ll in forces]).astype(
+            float
+        )
+    return {
+        "atom_symbols": [symbols[nn] for nn in numbers],
+        "coords": positions,
+        "cells": cells,
+        "energies": float(energy.split()[4]) * energy_convert,
+        "forces": force * force_convert,
+    }
+
+
+def iter_frames(fp, begin: int = 0, step: int = 1) -> Iterator[dict]:
+    """Iterate over the frames of a Gaussian log file.
+
+    Each frame has a forces block. The tables of the frames that are not
+    selected are not parsed.
+
+    Parameters
+    ----------
+    fp : TextIO
+        the log file
+    begin : int, default=0
+        the index of the first frame to read
+    step : int, default=1
+        the interval between two read frames
+
+    Yields
+    ------
+    dict
+        the frame, containing atom_symbols, coords, cells (None if not
+        periodic), energies, and forces, in the units of dpdata
+    """
+    for ii, raw in enumerate(_iter_raw_frames(fp)):
+        if ii >= begin and (ii - begin) % step == 0:
+            yield _parse_frame(*raw)
+
+
+def to_system_data(file_name: FileType, md=False, begin=0, step=1):
     """Read Gaussian log file.
 
     Parameters
@@ -28,6 +240,10 @@ def to_system_data(file_name: FileType, md=False):
         file name
     md : bool, default False
         whether to read multiple frames
+    begin : int, default=0
+        the index of the first frame to read when `md` is True
+    step : int, default=1
+        the interval between two read frames when `md` is True
 
     Returns
     -------
@@ -39,98 +255,31 @@ def to_system_data(file_name: FileType, md=False):
     RuntimeError
         if the input orientation is not found
     """
-    data = {}
-    # read from log lines
-    flag = 0
-    energy_t = []
-    coords_t = []
-    atom_symbols = []
-    forces_t = []
-    cells_t = []
-    nopbc = True
-    coords = None
-
     with open_file(file_name) as fp:
-        for line in fp:
-            if line.startswith(" SCF Done"):
-                # energies
-                energy = float(line.split()[4])
-            elif line.startswith(
-                " Center     Atomic                   Forces (Hartrees/Bohr)"
-            ):
-                flag = 1
-                forces = []
-            elif line.startswith(
-                "                          Input orientation:"
-            ) or line.startswith("                         Z-Matrix orientation:"):
-                flag = 5
-                coords = []
-                atom_symbols = []
-                cells = []
-
-            if 1 <= flag <= 3 or 5 <= flag <= 9:
-                flag += 1
-            elif flag == 4:
-                # forces
-                if line.startswith(" -------"):
-                    if coords is None:
-                        raise RuntimeError(
-                            "Input orientation is not found. Using Gaussian keyword "
-                            "`Geom=PrintInputOrient` to always print the input orientation. "
-                            "See https://gaussian.com/geom/ for more details."
-                        )
-                    forces_t.append(forces)
-                    energy_t.append(energy)
-                    coords_t.append(coords)
-                    if cells:
-                        nopbc = False
-                        cells_t.append(cells)
-                    else:
-                        cells_t.append(
-                            [[100.0, 0.0, 0.0], [0.0, 100.0, 0.0], [0.0, 0.0, 100.0]]
-                        )
-                    flag = 0
-                    coords = None
-                else:
-                    s = line.split()
-                    if line[14:16] == "-2":
-                        # PBC
-                        pass
-                    else:
-                        forces.append(
-                            [float(line[23:38]), float(line[38:53]), float(line[53:68])]
-                        )
-            elif flag == 10:
-                # atom_symbols and coords
-                if line.startswith(" -------"):
-                    flag = 0
-                else:
-                    s = line.split()
-                    if int(s[1]) == -2:
-                        # PBC cells, see https://gaussian.com/pbc/
-                        cells.append([float(x) for x in s[3:6]])
-                    else:
-                        coords.append([float(x) for x in s[3:6]])
-                        atom_symbols.append(symbols[int(s[1])])
-
-    assert coords_t, "cannot find coords"
-    assert energy_t, "cannot find energies"
-    assert forces_t, "cannot find forces"
+        if md:
+            frames = list(iter_frames(fp, begin=begin, step=step))
+        else:
+            # only the last frame is parsed
+            raw = None
+            for raw in _iter_raw_frames(fp):
+                pass
+            frames = [] if raw is None else [_parse_frame(*raw)]
 
+    assert frames, "cannot find forces"
+
+    data = {}
     atom_names, data["atom_types"], atom_numbs = np.unique(
-        atom_symbols, return_inverse=True, return_counts=True
+        frames[-1]["atom_symbols"], return_inverse=True, return_counts=True
     )
     data["atom_names"] = list(atom_names)
     data["atom_numbs"] = list(atom_numbs)
-    if not md:
-        forces_t = forces_t[-1:]
-        energy_t = energy_t[-1:]
-        coords_t = coords_t[-1:]
-        cells_t = cells_t[-1:]
-    data["forces"] = np.array(forces_t) * force_convert
-    data["energies"] = np.array(energy_t) * energy_convert
-    data["coords"] = np.array(coords_t)
+    nopbc = all(ff["cells"] is None for ff in frames)
+    data["forces"] = np.array([ff["forces"] for ff in frames])
+    data["energies"] = np.array([ff["energies"] for ff in frames])
+    data["coords"] = np.array([ff["coords"] for ff in frames])
     data["orig"] = np.array([0, 0, 0])
-    data["cells"] = np.array(cells_t)
+    data["cells"] = np.array(
+        [np.eye(3) * 100.0 if ff["cells"] is None else ff["cells"] for ff in frames]
+    )
     data["nopbc"] = nopbc
     return data
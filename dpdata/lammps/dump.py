@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import io
 import os
 import sys
 from typing import TYPE_CHECKING
@@ -218,7 +219,7 @@ def get_spin_keys(inputfile):
         warnings.warn(f"Input file {inputfile} not found.")
         return None
 
-    with open(inputfile) as f:
+    with open_file(inputfile) as f:
         for line in f.readlines():
             ls = line.split()
             if (
@@ -355,6 +356,81 @@ def split_traj(dump_lines):
     return None
 
 
+def dump_frames(
+    fp,
+    system,
+    frame_idx=None,
+    timestep=0,
+    write_forces=False,
+    write_velocities=False,
+):
+    """Write frames of system data to a file object in LAMMPS dump format.
+
+    The frames are written one by one, and the atom table of each frame is
+    formatted at once.
+
+    Parameters
+    ----------
+    fp : file object
+        the opened file to write
+    system : dict
+        System data dictionary containing atoms, coordinates, cell, etc.
+    frame_idx : int or list of int, optional
+        indexes of the frames to dump. By default, all frames are dumped.
+    timestep : int or list of int, optional
+        timestep number of each frame. If an integer is given, the frames are
+        numbered consecutively from it (default: 0).
+    write_forces : bool, optional
+        whether to write the forces as fx, fy, and fz (default: False)
+    write_velocities : bool, optional
+        whether to write the velocities as vx, vy, and vz (default: False)
+    """
+    nframes = len(system["coords"])
+    if frame_idx is None:
+        frame_idx = range(nframes)
+    frame_idx = np.atleast_1d(np.asarray(frame_idx, dtype=int))
+    if np.isscalar(timestep) or np.ndim(timestep) == 0:
+        timestep = int(timestep) + np.arange(len(frame_idx))
+    assert len(timestep) == len(frame_idx), "one timestep should be given per frame"
+
+    natoms = sum(system["atom_numbs"])
+    orig = system.get("orig", np.zeros(3))
+    keys = "id type x y z"
+    atom_fmt = "%d %d %.10f %.10f %.10f"
+    if write_forces:
+        keys += " fx fy fz"
+        atom_fmt += " %.10f %.10f %.10f"
+    if write_velocities:
+        keys += " vx vy vz"
+        atom_fmt += " %.10f %.10f %.10f"
+    atom_fmt += "\n"
+    # LAMMPS uses 1-based indexing for both atoms and types
+    ids_types = np.column_stack(
+        (np.arange(1, natoms + 1), np.asarray(system["atom_types"]) + 1)
+    )
+
+    for ii, ts in zip(frame_idx, timestep):
+        # Convert cell to dump format (bounds and tilt)
+        bounds, tilt = box2dumpbox(orig, system["cells"][ii])
+        fp.write(
+            "ITEM: TIMESTEP\n"
+            f"{ts}\n"
+            "ITEM: NUMBER OF ATOMS\n"
+            f"{natoms}\n"
+            "ITEM: BOX BOUNDS xy xz yz pp pp pp\n"
+            f"{bounds[0][0]:.10f} {bounds[0][1]:.10f} {tilt[0]:.10f}\n"
+            f"{bounds[1][0]:.10f} {bounds[1][1]:.10f} {tilt[1]:.10f}\n"
+            f"{bounds[2][0]:.10f} {bounds[2][1]:.10f} {tilt[2]:.10f}\n"
+            f"ITEM: ATOMS {keys}\n"
+        )
+        columns = [ids_types, system["coords"][ii]]
+        if write_forces:
+            columns.append(system["forces"][ii])
+        if write_velocities:
+            columns.append(system["velocities"][ii])
+        fp.write(lmp.format_rows(atom_fmt, np.column_stack(columns)))
+
+
 def from_system_data(system, f_idx=0, timestep=0):
     """Convert system data to LAMMPS dump format string.
 
@@ -372,43 +448,9 @@ def from_system_data(system, f_idx=0, timestep=0):
     str
         LAMMPS dump format string
     """
-    ret = ""
-
-    # Get basic system info
-    natoms = sum(system["atom_numbs"])
-    coords = system["coords"][f_idx]
-    cell = system["cells"][f_idx]
-    atom_types = system["atom_types"]
-    orig = system.get("orig", np.zeros(3))
-
-    # Convert cell to dump format (bounds and tilt)
-    bounds, tilt = box2dumpbox(orig, cell)
-
-    # Write timestep
-    ret += "ITEM: TIMESTEP\n"
-    ret += f"{timestep}\n"
-
-    # Write number of atoms
-    ret += "ITEM: NUMBER OF ATOMS\n"
-    ret += f"{natoms}\n"
-
-    # Write box bounds
-    ret += "ITEM: BOX BOUNDS xy xz yz pp pp pp\n"
-    ret += f"{bounds[0][0]:.10f} {bounds[0][1]:.10f} {tilt[0]:.10f}\n"
-    ret += f"{bounds[1][0]:.10f} {bounds[1][1]:.10f} {tilt[1]:.10f}\n"
-    ret += f"{bounds[2][0]:.10f} {bounds[2][1]:.10f} {tilt[2]:.10f}\n"
-
-    # Write atoms header
-    ret += "ITEM: ATOMS id type x y z\n"
-
-    # Write atom data
-    for ii in range(natoms):
-        atom_id = ii + 1  # LAMMPS uses 1-based indexing
-        atom_type = atom_types[ii] + 1  # LAMMPS uses 1-based type indexing
-        x, y, z = coords[ii]
-        ret += f"{atom_id} {atom_type} {x:.10f} {y:.10f} {z:.10f}\n"
-
-    return ret
+    buffer = io.StringIO()
+    dump_frames(buffer, system, frame_idx=f_idx, timestep=timestep)
+    return buffer.getvalue()
 
 
 if __name__ == "__main__":
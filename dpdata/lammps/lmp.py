@@ -528,6 +528,11 @@ def from_system_data(system, f_idx=0):
         + ptr_float_fmt
         + "\n"
     )  # noqa: UP031
+    columns = [
+        np.arange(1, natoms + 1),
+        np.asarray(system["atom_types"]) + 1,
+        coord - system["orig"],
+    ]
 
     if "spins" in system:
         coord_fmt = (
@@ -542,44 +547,37 @@ def from_system_data(system, f_idx=0):
             + ptr_float_fmt
             + "\n"
         )  # noqa: UP031
-        spins_norm = np.linalg.norm(system["spins"][f_idx], axis=1)
-    for ii in range(natoms):
-        if "spins" in system:
-            if spins_norm[ii] != 0:
-                ret += coord_fmt % (
-                    ii + 1,
-                    system["atom_types"][ii] + 1,
-                    coord[ii][0] - system["orig"][0],
-                    coord[ii][1] - system["orig"][1],
-                    coord[ii][2] - system["orig"][2],
-                    system["spins"][f_idx][ii][0] / spins_norm[ii],
-                    system["spins"][f_idx][ii][1] / spins_norm[ii],
-                    system["spins"][f_idx][ii][2] / spins_norm[ii],
-                    spins_norm[ii],
-                )  # noqa: UP031
-            else:
-                ret += coord_fmt % (
-                    ii + 1,
-                    system["atom_types"][ii] + 1,
-                    coord[ii][0] - system["orig"][0],
-                    coord[ii][1] - system["orig"][1],
-                    coord[ii][2] - system["orig"][2],
-                    system["spins"][f_idx][ii][0],
-                    system["spins"][f_idx][ii][1],
-                    system["spins"][f_idx][ii][2] + 1,
-                    spins_norm[ii],
-                )  # noqa: UP031
-        else:
-            ret += coord_fmt % (
-                ii + 1,
-                system["atom_types"][ii] + 1,
-                coord[ii][0] - system["orig"][0],
-                coord[ii][1] - system["orig"][1],
-                coord[ii][2] - system["orig"][2],
-            )  # noqa: UP031
+        spins = np.array(system["spins"][f_idx], dtype=float)
+        spins_norm = np.linalg.norm(spins, axis=1)
+        nonzero = spins_norm != 0
+        # the direction of a zero spin is written as (0, 0, 1)
+        spins[nonzero] /= spins_norm[nonzero, None]
+        spins[~nonzero, 2] += 1
+        columns += [spins, spins_norm]
+    ret += format_rows(coord_fmt, np.column_stack(columns))
     return ret
 
 
+def format_rows(fmt: str, table: np.ndarray) -> str:
+    """Format all rows of a table with a single formatting operation.
+
+    Parameters
+    ----------
+    fmt : str
+        the printf-style format of one row, including the line break
+    table : np.ndarray
+        the table, in the shape of (nrows, ncolumns). Integer columns
+        can be stored as floats, as ``%d`` truncates them.
+
+    Returns
+    -------
+    str
+        the formatted rows
+    """
+    table = np.asarray(table)
+    return (fmt * len(table)) % tuple(table.ravel().tolist())
+
+
 if __name__ == "__main__":
     fname = "water-SPCE.data"
     lines = open(fname).read().split("\n")
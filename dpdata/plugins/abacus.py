@@ -101,8 +101,8 @@ class AbacusSCFFormat(Format):
 @Format.register("abacus/lcao/md")
 class AbacusMDFormat(Format):
     # @Format.post("rot_lower_triangular")
-    def from_labeled_system(self, file_name, **kwargs):
-        data = dpdata.abacus.md.get_frame(file_name)
+    def from_labeled_system(self, file_name, begin=0, step=1, **kwargs):
+        data = dpdata.abacus.md.get_frame(file_name, begin=begin, step=step)
         register_mag_data(data)
         register_move_data(data)
         return data
@@ -1,19 +1,65 @@
 from __future__ import annotations
 
+import itertools
+import multiprocessing
 import os
-from typing import TYPE_CHECKING, Generator
+import time
+import warnings
+from collections import deque
+from typing import TYPE_CHECKING, Generator, Iterable, Iterator
 
 import numpy as np
 
 import dpdata
 from dpdata.driver import Driver, Minimizer
 from dpdata.format import Format
+from dpdata.utils import encode_species
 
 if TYPE_CHECKING:
     import ase
     from ase.optimize.optimize import Optimizer
 
 
+def _get_labels(atoms: ase.Atoms) -> tuple[float, np.ndarray, np.ndarray | None]:
+    """Get the energy, forces, and virial of ase.Atoms from its calculator.
+
+    The virial is loaded from either the virial field or converted from
+    the stress tensor.
+
+    Parameters
+    ----------
+    atoms : ase.Atoms
+        an ASE Atoms with a calculator
+
+    Returns
+    -------
+    float
+        the energy
+    np.ndarray
+        the forces
+    np.ndarray or None
+        the virial, or None if neither the virial nor the stress is available
+    """
+    from ase.calculators.calculator import PropertyNotImplementedError
+
+    try:
+        energy = atoms.get_potential_energy(force_consistent=True)
+    except PropertyNotImplementedError:
+        energy = atoms.get_potential_energy()
+    forces = atoms.get_forces()
+
+    # try to get virials from different sources
+    virial = atoms.info.get("virial")
+    if virial is None:
+        try:
+            stress = atoms.get_stress(voigt=False)
+        except PropertyNotImplementedError:
+            pass
+        else:
+            virial = -atoms.get_volume() * stress
+    return energy, forces, virial
+
+
 @Format.register("ase/structure")
 class ASEStructureFormat(Format):
     """Format for the `Atomic Simulation Environment <https://wiki.fysik.dtu.dk/ase/>`_ (ase).
@@ -40,12 +86,10 @@ class ASEStructureFormat(Format):
         dict
             data dict
         """
-        symbols = atoms.get_chemical_symbols()
-        atom_names = list(dict.fromkeys(symbols))
-        atom_numbs = [symbols.count(symbol) for symbol in atom_names]
-        atom_types = np.array([atom_names.index(symbol) for symbol in symbols]).astype(
-            int
-        )
+        from ase.data import chemical_symbols
+
+        numbers, atom_numbs, atom_types = encode_species(atoms.numbers)
+        atom_names = [chemical_symbols[nn] for nn in numbers]
         cells = atoms.cell[:]
         coords = atoms.get_positions()
         info_dict = {
@@ -83,29 +127,13 @@ class ASEStructureFormat(Format):
             ASE will raise RuntimeError if the atoms does not
             have a calculator
         """
-        from ase.calculators.calculator import PropertyNotImplementedError
-
         info_dict = self.from_system(atoms)
-        try:
-            energies = atoms.get_potential_energy(force_consistent=True)
-        except PropertyNotImplementedError:
-            energies = atoms.get_potential_energy()
-        forces = atoms.get_forces()
+        energies, forces, virials = _get_labels(atoms)
         info_dict = {
             **info_dict,
             "energies": np.array([energies]),
             "forces": np.array([forces]),
         }
-
-        # try to get virials from different sources
-        virials = atoms.info.get("virial")
-        if virials is None:
-            try:
-                stress = atoms.get_stress(voigt=False)
-            except PropertyNotImplementedError:
-                pass
-            else:
-                virials = -atoms.get_volume() * stress
         if virials is not None:
             info_dict["virials"] = np.array([virials])
 
@@ -208,6 +236,79 @@ class ASEStructureFormat(Format):
         return structures
 
 
+def _load_traj_frames(traj, indices: range, labeled: bool) -> dict:
+    """Load frames of an ASE trajectory into preallocated arrays.
+
+    The atom names and types are taken from the first frame, and all the
+    frames should have the same chemical symbols.
+
+    Parameters
+    ----------
+    traj : ase.io.trajectory.TrajectoryReader
+        the opened trajectory
+    indices : range
+        indexes of the frames to load
+    labeled : bool
+        whether to load energies, forces, and virials
+
+    Returns
+    -------
+    dict
+        data dict
+
+    Raises
+    ------
+    ValueError
+        if the first frame does not contain energies and forces, but
+        `labeled` is True
+    RuntimeError
+        if the chemical symbols change between frames
+    """
+    nframes = len(indices)
+    first = traj[indices[0]]
+    if not labeled:
+        data = ASEStructureFormat().from_system(first)
+    elif first.calc is None:
+        raise ValueError(
+            "The input trajectory does not contain energies and forces, may not be a labeled system."
+        )
+    else:
+        data = ASEStructureFormat().from_labeled_system(first)
+    numbers = first.numbers
+    natoms = len(numbers)
+
+    frame_keys = ["cells", "coords"]
+    if labeled:
+        frame_keys += ["energies", "forces"]
+        if "virials" in data:
+            frame_keys.append("virials")
+    for kk in frame_keys:
+        arr = np.empty((nframes, *data[kk].shape[1:]), dtype=data[kk].dtype)
+        arr[0] = data[kk][0]
+        data[kk] = arr
+
+    for ii, idx in enumerate(indices[1:], start=1):
+        atoms = traj[idx]
+        if len(atoms) != natoms or not np.array_equal(atoms.numbers, numbers):
+            raise RuntimeError(
+                f"The chemical symbols of frame {idx} are different from "
+                f"frame {indices[0]} in the trajectory."
+            )
+        data["cells"][ii] = atoms.cell[:]
+        data["coords"][ii] = atoms.get_positions()
+        if labeled:
+            energy, forces, virial = _get_labels(atoms)
+            data["energies"][ii] = energy
+            data["forces"][ii] = forces
+            if "virials" in data:
+                if virial is None:
+                    raise RuntimeError(
+                        f"Frame {idx} in the trajectory does not contain the virial."
+                    )
+                data["virials"][ii] = virial
+    return data
+
+
 @Format.register("ase/traj")
 class ASETrajFormat(Format):
     """Format for the ASE's trajectory format <https://wiki.fysik.dtu.dk/ase/ase/io/trajectory.html#module-ase.io.trajectory>`_ (ase).'
@@ -244,19 +345,9 @@ class ASETrajFormat(Format):
         """
         from ase.io import Trajectory
 
-        traj = Trajectory(file_name)
-        sub_traj = traj[begin:end:step]
-        dict_frames = ASEStructureFormat().from_system(sub_traj[0])
-        for atoms in sub_traj[1:]:
-            tmp = ASEStructureFormat().from_system(atoms)
-            dict_frames["cells"] = np.append(dict_frames["cells"], tmp["cells"][0])
-            dict_frames["coords"] = np.append(dict_frames["coords"], tmp["coords"][0])
-
-        ## Correct the shape of numpy arrays
-        dict_frames["cells"] = dict_frames["cells"].reshape(-1, 3, 3)
-        dict_frames["coords"] = dict_frames["coords"].reshape(len(sub_traj), -1, 3)
-
-        return dict_frames
+        with Trajectory(file_name) as traj:
+            indices = range(len(traj))[begin:end:step]
+            return _load_traj_frames(traj, indices, labeled=False)
 
     def from_labeled_system(
         self,
@@ -288,41 +379,52 @@ class ASETrajFormat(Format):
         """
         from ase.io import Trajectory
 
-        traj = Trajectory(file_name)
-        sub_traj = traj[begin:end:step]
+        with Trajectory(file_name) as traj:
+            indices = range(len(traj))[begin:end:step]
+            return _load_traj_frames(traj, indices, labeled=True)
 
-        ## check if the first frame has a calculator
-        if sub_traj[0].calc is None:
-            raise ValueError(
-                "The input trajectory does not contain energies and forces, may not be a labeled system."
-            )
+    def iter_chunks(
+        self,
+        file_name: str,
+        chunk_size: int = 1000,
+        begin: int | None = 0,
+        end: int | None = None,
+        step: int | None = 1,
+        labeled: bool = False,
+    ) -> Generator[dict, None, None]:
+        """Read ASE's trajectory file in chunks of frames.
 
-        dict_frames = ASEStructureFormat().from_labeled_system(sub_traj[0])
-        for atoms in sub_traj[1:]:
-            tmp = ASEStructureFormat().from_labeled_system(atoms)
-            dict_frames["cells"] = np.append(dict_frames["cells"], tmp["cells"][0])
-            dict_frames["coords"] = np.append(dict_frames["coords"], tmp["coords"][0])
-            dict_frames["energies"] = np.append(
-                dict_frames["energies"], tmp["energies"][0]
-            )
-            if "forces" in tmp.keys() and "forces" in dict_frames.keys():
-                dict_frames["forces"] = np.append(
-                    dict_frames["forces"], tmp["forces"][0]
-                )
-            if "virials" in tmp.keys() and "virials" in dict_frames.keys():
-                dict_frames["virials"] = np.append(
-                    dict_frames["virials"], tmp["virials"][0]
-                )
+        Only one chunk is kept in memory at a time, so that large trajectory
+        files can be processed frame by frame.
+
+        Parameters
+        ----------
+        file_name : str
+            ASE's trajectory file
+        chunk_size : int, default=1000
+            the maximal number of frames in each chunk
+        begin : int, optional
+            begin frame index
+        end : int, optional
+            end frame index
+        step : int, optional
+            frame index step
+        labeled : bool, default=False
+            whether to read energies, forces, and virials
 
-        ## Correct the shape of numpy arrays
-        dict_frames["cells"] = dict_frames["cells"].reshape(-1, 3, 3)
-        dict_frames["coords"] = dict_frames["coords"].reshape(len(sub_traj), -1, 3)
-        if "forces" in dict_frames.keys():
-            dict_frames["forces"] = dict_frames["forces"].reshape(len(sub_traj), -1, 3)
-        if "virials" in dict_frames.keys():
-            dict_frames["virials"] = dict_frames["virials"].reshape(-1, 3, 3)
+        Yields
+        ------
+        dict
+            a dictionary containing data of the frames in the chunk
+        """
+        from ase.io import Trajectory
 
-        return dict_frames
+        with Trajectory(file_name) as traj:
+            indices = range(len(traj))[begin:end:step]
+            for ii in range(0, len(indices), chunk_size):
+                yield _load_traj_frames(
+                    traj, indices[ii : ii + chunk_size], labeled=labeled
+                )
 
     def to_system(self, data, file_name: str = "confs.traj", **kwargs) -> None:
         """Convert System to ASE Atoms object.
@@ -406,33 +508,87 @@ class ASEDriver(Driver):
         return labeled_system.data
 
 
+_WORKER_MINIMIZER = None
+
+
+def _empty_labeled_data(data: dict) -> dict:
+    """Labeled data with the atoms of `data` but no frames."""
+    empty = dpdata.System(data=data).sub_system([]).data
+    natoms = len(empty["atom_types"])
+    empty["energies"] = np.zeros((0,))
+    empty["forces"] = np.zeros((0, natoms, 3))
+    return empty
+
+
+def _init_minimizer_worker(kwargs: dict) -> None:
+    """Initialize the minimizer, including its calculator, once per worker."""
+    global _WORKER_MINIMIZER
+    _WORKER_MINIMIZER = ASEMinimizer(**kwargs)
+
+
+def _minimize_in_worker(atoms: ase.Atoms, atom_names: list[str]) -> dict:
+    """Minimize one frame with the minimizer of the worker."""
+    return _WORKER_MINIMIZER._minimize_atoms(atoms, atom_names)
+
+
 @Minimizer.register("ase")
 class ASEMinimizer(Minimizer):
     """ASE minimizer.
 
     Parameters
     ----------
-    driver : Driver
-        dpdata driver
+    driver : Driver or dict
+        dpdata driver. A dict containing `type` as the name of the driver
+        and other arguments of the driver is also accepted, so that each
+        worker process can initialize its own driver.
     optimizer : type, optional
         ase optimizer class
     fmax : float, optional, default=5e-3
         force convergence criterion
     max_steps : int, optional
-        max steps to optimize
+        max steps to optimize each frame
     optimizer_kwargs : dict, optional
         other parameters for optimizer
+    nproc : int, optional, default=1
+        number of worker processes. If it is larger than 1, the frames are
+        distributed across a process pool, where each worker initializes the
+        driver and the calculator once. At most ``2 * nproc`` frames are
+        submitted at a time, and the results are yielded in order.
+    timeout : float, optional
+        soft limit of the wall time in seconds to optimize each frame. It is
+        checked after each optimization step, and the optimization of a
+        frame stops once it is exceeded, returning the last structure. A
+        single step that hangs is not interrupted by it.
+    hard_timeout : float, optional
+        hard limit of the wall time in seconds to wait for each frame when
+        `nproc` is larger than 1. If it is exceeded, e.g. when the
+        calculator hangs, the frame is skipped with a warning, the worker
+        processes are replaced, and the other frames are still minimized.
+        The indices of the skipped frames are kept in `timed_out_frames`.
+        It is not enforced when `nproc` is 1.
     """
 
     def __init__(
         self,
-        driver: Driver,
+        driver: Driver | dict,
         optimizer: type[Optimizer] | None = None,
         fmax: float = 5e-3,
         max_steps: int | None = None,
         optimizer_kwargs: dict = {},
+        nproc: int = 1,
+        timeout: float | None = None,
+        hard_timeout: float | None = None,
     ) -> None:
-        self.calculator = driver.ase_calculator
+        self.driver = driver
+        self.calculator = None
+        if isinstance(driver, Driver):
+            self.calculator = driver.ase_calculator
+        elif nproc == 1:
+            driver_kwargs = driver.copy()
+            driver_type = driver_kwargs.pop("type")
+            self.calculator = Driver.get_driver(driver_type)(
+                **driver_kwargs
+            ).ase_calculator
         if optimizer is None:
             from ase.optimize import LBFGS
 
@@ -445,6 +601,124 @@ class ASEMinimizer(Minimizer):
         }
         self.fmax = fmax
         self.max_steps = max_steps
+        self.nproc = nproc
+        self.timeout = timeout
+        self.hard_timeout = hard_timeout
+        self.timed_out_frames: list[int] = []
+
+    def _minimize_atoms(self, atoms: ase.Atoms, atom_names: list[str]) -> dict:
+        """Minimize one frame.
+
+        Parameters
+        ----------
+        atoms : ase.Atoms
+            the frame
+        atom_names : list[str]
+            atom names of the system
+
+        Returns
+        -------
+        dict
+            labeled data of the minimized frame
+        """
+        atoms.calc = self.calculator
+        dyn = self.optimizer(atoms, **self.optimizer_kwargs)
+        run_kwargs = {"fmax": self.fmax}
+        if self.max_steps is not None:
+            run_kwargs["steps"] = self.max_steps
+        if self.timeout is None:
+            dyn.run(**run_kwargs)
+        else:
+            start = time.perf_counter()
+            for _ in dyn.irun(**run_kwargs):
+                if time.perf_counter() - start > self.timeout:
+                    break
+        ls = dpdata.LabeledSystem(atoms, fmt="ase/structure", type_map=atom_names)
+        return ls.data
+
+    def iter_minimize(self, datas: Iterable[dict]) -> Iterator[dict | None]:
+        """Minimize all frames of systems, and yield the frames in order.
+
+        Parameters
+        ----------
+        datas : iterable of dict
+            data of each system with coordinates and atom types
+
+        Yields
+        ------
+        dict or None
+            labeled data of each minimized frame, in the order of systems
+            and frames, or None if the frame exceeds `hard_timeout`
+        """
+        self.timed_out_frames = []
+        frames = (
+            (atoms, data["atom_names"])
+            for data in datas
+            for atoms in dpdata.System(data=data).to_ase_structure()
+        )
+        if self.nproc == 1:
+            for atoms, atom_names in frames:
+                yield self._minimize_atoms(atoms, atom_names)
+            return
+        kwargs = {
+            "driver": self.driver,
+            "optimizer": self.optimizer,
+            "fmax": self.fmax,
+            "max_steps": self.max_steps,
+            "optimizer_kwargs": self.optimizer_kwargs,
+            "timeout": self.timeout,
+        }
+
+        def new_pool():
+            return multiprocessing.Pool(
+                processes=self.nproc,
+                initializer=_init_minimizer_worker,
+                initargs=(kwargs,),
+            )
+
+        frames = enumerate(frames)
+        pool = new_pool()
+        try:
+            # submit a bounded window of frames, so that frames are read
+            # lazily and the results do not pile up
+            window = 2 * self.nproc
+            pending = deque(
+                (ii, frame, pool.apply_async(_minimize_in_worker, frame))
+                for ii, frame in itertools.islice(frames, window)
+            )
+            while pending:
+                ii, frame, result = pending.popleft()
+                # all previous frames are finished, so this frame is running
+                # on a worker from now on at the latest
+                try:
+                    data = result.get(timeout=self.hard_timeout)
+                except multiprocessing.TimeoutError:
+                    warnings.warn(
+                        f"Frame {ii} is not minimized in {self.hard_timeout} "
+                        "seconds and is skipped"
+                    )
+                    self.timed_out_frames.append(ii)
+                    data = None
+                    # the stuck worker cannot be stopped alone, so the pool
+                    # is replaced and the unfinished frames are submitted again
+                    pool.terminate()
+                    pool = new_pool()
+                    pending = deque(
+                        (
+                            jj,
+                            ff,
+                            rr
+                            if rr.ready()
+                            else pool.apply_async(_minimize_in_worker, ff),
+                        )
+                        for jj, ff, rr in pending
+                    )
+                for jj, ff in itertools.islice(frames, 1):
+                    pending.append((jj, ff, pool.apply_async(_minimize_in_worker, ff)))
+                yield data
+        finally:
+            # also stops the workers when the generator is closed
+            pool.terminate()
 
     def minimize(self, data: dict) -> dict:
         """Minimize the geometry.
@@ -459,16 +733,37 @@ class ASEMinimizer(Minimizer):
         dict
             labeled data with minimized coordinates, energies, and forces
         """
-        system = dpdata.System(data=data)
-        # list[Atoms]
-        structures = system.to_ase_structure()
-        labeled_system = dpdata.LabeledSystem()
-        for atoms in structures:
-            atoms.calc = self.calculator
-            dyn = self.optimizer(atoms, **self.optimizer_kwargs)
-            dyn.run(fmax=self.fmax, steps=self.max_steps)
-            ls = dpdata.LabeledSystem(
-                atoms, fmt="ase/structure", type_map=data["atom_names"]
-            )
-            labeled_system.append(ls)
-        return labeled_system.data
+        return next(self.minimize_many([data]))
+
+    def minimize_many(self, datas: Iterable[dict]) -> Iterator[dict]:
+        """Minimize the geometries of multiple systems.
+
+        The frames of all systems are distributed across the workers at once.
+        Frames that exceed `hard_timeout` are dropped from the results.
+
+        Parameters
+        ----------
+        datas : iterable of dict
+            data of each system with coordinates and atom types
+
+        Yields
+        ------
+        dict
+            labeled data with minimized coordinates, energies, and forces,
+            in the order of `datas`
+        """
+        datas = list(datas)
+        frames = self.iter_minimize(datas)
+        for data in datas:
+            minimized = [next(frames) for _ in range(len(data["coords"]))]
+            minimized = [ff for ff in minimized if ff is not None]
+            if not minimized:
+                # all frames are skipped
+                yield _empty_labeled_data(data)
+                continue
+            labeled_system = dpdata.LabeledSystem()
+            for ff in minimized:
+                labeled_system.append(dpdata.LabeledSystem(data=ff))
+            yield labeled_system.data
+        # shut down the workers
+        frames.close()
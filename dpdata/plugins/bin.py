@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from dpdata.bin.columnar import BinEntry, BinFile
+from dpdata.format import Format
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+@Format.register("dpdata/bin")
+class DpdataBinFormat(Format):
+    """Native single-file columnar format of dpdata.
+
+    A file stores one or more systems. Each array is stored as raw bytes
+    aligned in the file, and is memory-mapped when loaded, so opening a
+    file only costs reading its index. All data types, including custom
+    registered ones, are stored. See :mod:`dpdata.bin.columnar` for the
+    layout.
+
+    Examples
+    --------
+    Dump a MultiSystems to a file and load it back:
+
+    >>> import dpdata
+    >>> ms = dpdata.MultiSystems().from_deepmd_npy("data")
+    >>> ms.to("dpdata/bin", "data.bin")
+    >>> ms = dpdata.MultiSystems().from_file("data.bin", fmt="dpdata/bin")
+
+    Append more systems to an existing file:
+
+    >>> ms.to("dpdata/bin", "data.bin", append=True)
+    """
+
+    def _load(self, file_name: str | BinEntry, mmap_mode: str | None) -> dict:
+        if isinstance(file_name, BinEntry):
+            return file_name.load()
+        elif isinstance(file_name, str):
+            s = file_name.split("#")
+            with BinFile(s[0], "r", mmap_mode=mmap_mode) as f:
+                if len(s) > 1:
+                    for entry in f:
+                        if entry.name == s[1]:
+                            return entry.load()
+                    raise RuntimeError(f"System {s[1]} is not found in {s[0]}")
+                if len(f) != 1:
+                    raise RuntimeError(
+                        f"{s[0]} contains {len(f)} systems; use MultiSystems "
+                        "or specify the system name after a hashtag"
+                    )
+                return f.load(0)
+        raise TypeError("Unsupported file_name")
+
+    def from_system(
+        self, file_name: str | BinEntry, mmap_mode: str | None = "c", **kwargs
+    ) -> dict:
+        """Load System data from a dpdata/bin file.
+
+        Parameters
+        ----------
+        file_name : str or BinEntry
+            the file name, or a system in the file. If it is a string,
+            hashtag is used to split the file name and the system name
+        mmap_mode : {"c", "r", None}, default="c"
+            ``"c"`` (copy-on-write) and ``"r"`` (read-only) memory-map
+            the arrays; None reads them into memory
+        **kwargs : dict
+            other parameters
+
+        Returns
+        -------
+        dict
+            System data
+        """
+        return self._load(file_name, mmap_mode)
+
+    def from_labeled_system(
+        self, file_name: str | BinEntry, mmap_mode: str | None = "c", **kwargs
+    ) -> dict:
+        """Load LabeledSystem data from a dpdata/bin file.
+
+        Parameters
+        ----------
+        file_name : str or BinEntry
+            the file name, or a system in the file. If it is a string,
+            hashtag is used to split the file name and the system name
+        mmap_mode : {"c", "r", None}, default="c"
+            ``"c"`` (copy-on-write) and ``"r"`` (read-only) memory-map
+            the arrays; None reads them into memory
+        **kwargs : dict
+            other parameters
+
+        Returns
+        -------
+        dict
+            LabeledSystem data
+        """
+        return self._load(file_name, mmap_mode)
+
+    def to_system(
+        self, data: dict, file_name: str | BinEntry, append: bool = False, **kwargs
+    ):
+        """Dump System or LabeledSystem data to a dpdata/bin file.
+
+        Parameters
+        ----------
+        data : dict
+            System or LabeledSystem data
+        file_name : str or BinEntry
+            the file name, or a system to be written in the file
+        append : bool, default=False
+            append the system to an existing file instead of overwriting it
+        **kwargs : dict
+            other parameters
+        """
+        if isinstance(file_name, BinEntry):
+            file_name.dump(data)
+        elif isinstance(file_name, str):
+            name = "".join(
+                f"{symbol}{numb}"
+                for symbol, numb in zip(data["atom_names"], data["atom_numbs"])
+            )
+            with BinFile(file_name, "a" if append else "w") as f:
+                f.dump(data, name)
+        else:
+            raise TypeError("Unsupported file_name")
+
+    def from_multi_systems(
+        self, directory: str, mmap_mode: str | None = "c", **kwargs
+    ) -> Generator[BinEntry, None, None]:
+        """Generate systems in a dpdata/bin file, which will be passed to
+        `from_system`.
+
+        Parameters
+        ----------
+        directory : str
+            the file name
+        mmap_mode : {"c", "r", None}, default="c"
+            how the arrays are loaded
+        **kwargs : dict
+            other parameters
+
+        Yields
+        ------
+        BinEntry
+            a system in the file
+        """
+        with BinFile(directory, "r", mmap_mode=mmap_mode) as f:
+            yield from f
+
+    def to_multi_systems(
+        self, formulas: list[str], directory: str, append: bool = False, **kwargs
+    ) -> Generator[BinEntry, None, None]:
+        """Generate systems to be written, which will be passed to `to_system`.
+
+        Parameters
+        ----------
+        formulas : list[str]
+            formulas of MultiSystems
+        directory : str
+            the file name
+        append : bool, default=False
+            append the systems to an existing file instead of overwriting it
+        **kwargs : dict
+            other parameters
+
+        Yields
+        ------
+        BinEntry
+            a system to be written, with the name of formula
+        """
+        with BinFile(directory, "a" if append else "w") as f:
+            for ff in formulas:
+                yield BinEntry(f, ff)
@@ -18,11 +18,13 @@ https://robinzyb.github.io/cp2kdata/
 
 @Format.register("cp2k/aimd_output")
 class CP2KAIMDOutputFormat(Format):
-    def from_labeled_system(self, file_name, restart=False, **kwargs):
+    def from_labeled_system(self, file_name, restart=False, begin=0, step=1, **kwargs):
         xyz_file = sorted(glob.glob(f"{file_name}/*pos*.xyz"))[0]
         log_file = sorted(glob.glob(f"{file_name}/*.log"))[0]
         try:
-            return tuple(Cp2kSystems(log_file, xyz_file, restart))
+            return tuple(
+                Cp2kSystems(log_file, xyz_file, restart, begin=begin, step=step)
+            )
         except (StopIteration, RuntimeError) as e:
             # StopIteration is raised when pattern match is failed
             raise PendingDeprecationWarning(string_warning) from e
@@ -33,9 +33,13 @@ def register_hessian_data(data):
 
 @Format.register("gaussian/log")
 class GaussianLogFormat(Format):
-    def from_labeled_system(self, file_name: FileType, md=False, **kwargs):
+    def from_labeled_system(
+        self, file_name: FileType, md=False, begin=0, step=1, **kwargs
+    ):
         try:
-            return dpdata.gaussian.log.to_system_data(file_name, md=md)
+            return dpdata.gaussian.log.to_system_data(
+                file_name, md=md, begin=begin, step=step
+            )
         except AssertionError:
             return {"energies": [], "forces": [], "nopbc": True}
 
@@ -57,8 +61,10 @@ class GaussianFChkFormat(Format):
 
 @Format.register("gaussian/md")
 class GaussianMDFormat(Format):
-    def from_labeled_system(self, file_name: FileType, **kwargs):
-        return GaussianLogFormat().from_labeled_system(file_name, md=True)
+    def from_labeled_system(self, file_name: FileType, begin=0, step=1, **kwargs):
+        return GaussianLogFormat().from_labeled_system(
+            file_name, md=True, begin=begin, step=step
+        )
 
 
 @Format.register("gaussian/gjf")
@@ -171,7 +171,16 @@ class LAMMPSDumpFormat(Format):
         register_spin(data)
         return data
 
-    def to_system(self, data, file_name: FileType, frame_idx=0, timestep=0, **kwargs):
+    def to_system(
+        self,
+        data,
+        file_name: FileType,
+        frame_idx=0,
+        timestep=0,
+        write_forces: bool = False,
+        write_velocities: bool = False,
+        **kwargs,
+    ):
         """Dump the system in LAMMPS dump format.
 
         Parameters
@@ -180,14 +189,27 @@ class LAMMPSDumpFormat(Format):
             System data
         file_name : str
             The output file name
-        frame_idx : int
-            The index of the frame to dump
-        timestep : int
-            The timestep number for the dump
+        frame_idx : int, list of int, or None
+            The index of the frame to dump. A list of indexes or None (all
+            frames) writes a multi-frame trajectory.
+        timestep : int or list of int
+            The timestep number for the dump. If an integer is given for
+            multiple frames, the frames are numbered consecutively from it.
+        write_forces : bool
+            Whether to write the forces as fx, fy, and fz columns
+        write_velocities : bool
+            Whether to write the velocities as vx, vy, and vz columns
         **kwargs : dict
             other parameters
         """
-        assert frame_idx < len(data["coords"])
-        w_str = dpdata.lammps.dump.from_system_data(data, frame_idx, timestep)
+        if frame_idx is not None:
+            assert np.all(np.asarray(frame_idx) < len(data["coords"]))
         with open_file(file_name, "w") as fp:
-            fp.write(w_str)
+            dpdata.lammps.dump.dump_frames(
+                fp,
+                data,
+                frame_idx=frame_idx,
+                timestep=timestep,
+                write_forces=write_forces,
+                write_velocities=write_velocities,
+            )
@@ -18,27 +18,29 @@ force_convert = ForceConversion("hartree/bohr", "eV/angstrom").value()
 
 
 def match_indices(atype1, atype2):
-    # Ensure atype2 is a numpy array for efficient operations
-    atype2 = np.array(atype2)
-    # Placeholder for matched indices
-    matched_indices = []
-    # Track used indices to handle duplicates
-    used_indices = set()
-
-    # Iterate over each element in atype1
-    for element in atype1:
-        # Find all indices of the current element in atype2
-        # np.where returns a tuple, so [0] is used to access the array of indices
-        indices = np.where(atype2 == element)[0]
-
-        # Find the first unused index
-        for index in indices:
-            if index not in used_indices:
-                # Add the index to the results and mark it as used
-                matched_indices.append(index)
-                used_indices.add(index)
-                break  # Move to the next element in atype1
-
+    """Match the atoms of two type lists that have the same number of atoms of each type.
+
+    The k-th atom of a type in `atype1` is matched with the k-th atom of the
+    same type in `atype2`.
+
+    Parameters
+    ----------
+    atype1 : np.ndarray
+        the reference atom types
+    atype2 : np.ndarray
+        the atom types to match
+
+    Returns
+    -------
+    np.ndarray
+        the index of each atom of `atype1` in `atype2`
+    """
+    atype1 = np.asarray(atype1)
+    atype2 = np.asarray(atype2)
+    order1 = np.argsort(atype1, kind="stable")
+    order2 = np.argsort(atype2, kind="stable")
+    matched_indices = np.empty(len(atype1), dtype=int)
+    matched_indices[order1] = order2
     return matched_indices
 
 
@@ -67,82 +69,66 @@ class N2P2Format(Format):
         """
         cells = []
         coords = []
-        atypes = []
         forces = []
         energies = []
-        natom0 = None
-        natoms0 = None
         atom_types0 = None
+        sorted_atom_types0 = None
         with open_file(file_name) as file:
+            in_section = False
             for line in file:
                 line = line.strip()  # Remove leading/trailing whitespace
                 if line.lower() == "begin":
-                    current_section = []  # Start a new section
+                    in_section = True  # Start a new section
                     cell = []
-                    coord = []
-                    atype = []
-                    force = []
+                    atom_lines = []
                     energy = None
                 elif line.lower() == "end":
                     # If we are at the end of a section, process the section
-                    assert len(coord) == len(atype) == len(force), (
-                        "Number of atoms, atom types, and forces must match."
-                    )
-
+                    in_section = False
+                    natom = len(atom_lines)
+                    # atom x y z element charge n fx fy fz
+                    table = np.array(" ".join(atom_lines).split()).reshape(natom, -1)
+                    atype = table[:, 4]
                     # Check if the number of atoms is consistent across all frames
-                    natom = len(coord)
-                    if natom0 is None:
-                        natom0 = natom
+                    if atom_types0 is None:
+                        atom_types0 = atype
+                        sorted_atom_types0 = np.sort(atype, kind="stable")
                     else:
-                        assert natom == natom0, (
+                        assert natom == len(atom_types0), (
                             "The number of atoms in all frames must be the same."
                         )
-
                     # Check if the number of atoms of each type is consistent across all frames
-                    atype = np.array(atype)
-                    unique_dict = {element: None for element in atype}
-                    unique_atypes = np.array(list(unique_dict.keys()))
-                    unique_atypes_list = list(unique_atypes)
-                    ntypes = len(unique_atypes)
-                    natoms = [len(atype[atype == at]) for at in unique_atypes]
-                    if natoms0 is None:
-                        natoms0 = natoms
-                    else:
-                        assert natoms == natoms0, (
-                            "The number of atoms of each type in all frames must be the same."
-                        )
-                    if atom_types0 is None:
-                        atom_types0 = atype
+                    assert np.array_equal(
+                        np.sort(atype, kind="stable"), sorted_atom_types0
+                    ), (
+                        "The number of atoms of each type in all frames must be the same."
+                    )
                     atom_order = match_indices(atom_types0, atype)
 
-                    cell = np.array(cell, dtype=float)
-                    coord = np.array(coord, dtype=float)[atom_order]
-                    force = np.array(force, dtype=float)[atom_order]
-
-                    cells.append(cell)
-                    coords.append(coord)
-                    forces.append(force)
+                    cells.append(np.array(cell, dtype=float))
+                    coords.append(table[atom_order, 1:4].astype(float))
+                    forces.append(table[atom_order, 7:10].astype(float))
                     energies.append(float(energy))
-
-                    current_section = None  # Reset for the next section
-                elif current_section is not None:
-                    # If we are inside a section, append the line to the current section
-                    # current_section.append(line)
+                elif in_section:
+                    # If we are inside a section, keep the contents
                     line_contents = line.split()
                     if line_contents[0] == "lattice":
                         cell.append(line_contents[1:])
                     elif line_contents[0] == "atom":
-                        coord.append(line_contents[1:4])
-                        atype.append(line_contents[4])
-                        force.append(line_contents[7:10])
+                        atom_lines.append(line)
                     elif line_contents[0] == "energy":
                         energy = line_contents[1]
 
-        atom_names = unique_atypes_list
-        atom_numbs = natoms
-        atom_types = np.zeros(len(atom_types0), dtype=int)
-        for i in range(ntypes):
-            atom_types[atom_types0 == unique_atypes_list[i]] = i
+        # atom names in the order of their first appearance
+        unique_atypes, first_idx, atom_types, natoms = np.unique(
+            atom_types0, return_index=True, return_inverse=True, return_counts=True
+        )
+        order = np.argsort(first_idx)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        atom_names = [str(ii) for ii in unique_atypes[order]]
+        atom_numbs = [int(ii) for ii in natoms[order]]
+        atom_types = rank[atom_types.reshape(-1)]
 
         cells = np.array(cells) * length_convert
         coords = np.array(coords) * length_convert
@@ -150,8 +136,8 @@ class N2P2Format(Format):
         energies = np.array(energies) * energy_convert
 
         return {
-            "atom_names": list(atom_names),
-            "atom_numbs": list(atom_numbs),
+            "atom_names": atom_names,
+            "atom_numbs": atom_numbs,
             "atom_types": atom_types,
             "coords": coords,
             "cells": cells,
@@ -177,27 +163,26 @@ class N2P2Format(Format):
         **kwargs : dict
             keyword arguments that will be passed from the method
         """
-        buff = []
         nframe = len(data["energies"])
-        natom = len(data["atom_types"])
-        atom_names = data["atom_names"]
-        for frame in range(nframe):
-            coord = data["coords"][frame] / length_convert
-            force = data["forces"][frame] / force_convert
-            energy = data["energies"][frame] / energy_convert
-            cell = data["cells"][frame] / length_convert
-            atype = data["atom_types"]
-            buff.append("begin")
-            for i in range(3):
-                buff.append(
-                    f"lattice {cell[i][0]:15.6f}  {cell[i][1]:15.6f}  {cell[i][2]:15.6f}"
-                )
-            for i in range(natom):
-                buff.append(
-                    f"atom {coord[i][0]:15.6f} {coord[i][1]:15.6f} {coord[i][2]:15.6f} {atom_names[atype[i]]:>7} {0:15.6f} {0:15.6f} {force[i][0]:15.6e} {force[i][1]:15.6e} {force[i][2]:15.6e}"
-                )
-            buff.append(f"energy {energy:15.6f}")
-            buff.append(f"charge {0:15.6f}")
-            buff.append("end")
+        atom_names = np.array(data["atom_names"])[data["atom_types"]]
+        atom_fmt = "atom %15.6f %15.6f %15.6f %7s %15.6f %15.6f %15.6e %15.6e %15.6e"
         with open_file(file_name, "w") as fp:
-            fp.write("\n".join(buff))
+            # write frame by frame to keep the memory bounded
+            for frame in range(nframe):
+                coord = data["coords"][frame] / length_convert
+                force = data["forces"][frame] / force_convert
+                energy = data["energies"][frame] / energy_convert
+                cell = data["cells"][frame] / length_convert
+                buff = ["begin"] if frame == 0 else ["", "begin"]
+                for i in range(3):
+                    buff.append(
+                        f"lattice {cell[i][0]:15.6f}  {cell[i][1]:15.6f}  {cell[i][2]:15.6f}"
+                    )
+                buff.extend(
+                    atom_fmt % (cc[0], cc[1], cc[2], name, 0, 0, ff[0], ff[1], ff[2])
+                    for cc, name, ff in zip(coord.tolist(), atom_names, force.tolist())
+                )
+                buff.append(f"energy {energy:15.6f}")
+                buff.append(f"charge {0:15.6f}")
+                buff.append("end")
+                fp.write("\n".join(buff))
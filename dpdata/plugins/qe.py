@@ -9,9 +9,13 @@ from dpdata.format import Format
 @Format.register("qe/cp/traj")
 class QECPTrajFormat(Format):
     @Format.post("rot_lower_triangular")
-    def from_system(self, file_name, begin=0, step=1, **kwargs):
+    def from_system(self, file_name, begin=0, step=1, memory_map=False, **kwargs):
         data, _ = dpdata.qe.traj.to_system_data(
-            file_name + ".in", file_name, begin=begin, step=step
+            file_name + ".in",
+            file_name,
+            begin=begin,
+            step=step,
+            memory_map=memory_map,
         )
         data["coords"] = dpdata.md.pbc.apply_pbc(
             data["coords"],
@@ -20,16 +24,26 @@ class QECPTrajFormat(Format):
         return data
 
     @Format.post("rot_lower_triangular")
-    def from_labeled_system(self, file_name, begin=0, step=1, **kwargs):
+    def from_labeled_system(
+        self, file_name, begin=0, step=1, memory_map=False, **kwargs
+    ):
         data, cs = dpdata.qe.traj.to_system_data(
-            file_name + ".in", file_name, begin=begin, step=step
+            file_name + ".in",
+            file_name,
+            begin=begin,
+            step=step,
+            memory_map=memory_map,
         )
         data["coords"] = dpdata.md.pbc.apply_pbc(
             data["coords"],
             data["cells"],
         )
         data["energies"], data["forces"], es = dpdata.qe.traj.to_system_label(
-            file_name + ".in", file_name, begin=begin, step=step
+            file_name + ".in",
+            file_name,
+            begin=begin,
+            step=step,
+            memory_map=memory_map,
         )
         assert cs == es, "the step key between files are not consistent"
         return data
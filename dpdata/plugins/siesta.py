@@ -39,7 +39,7 @@ class SiestaOutputFormat(Format):
 @Format.register("siesta/aimd_output")
 @Format.register_from("from_siesta_aiMD_output")
 class SiestaAIMDOutputFormat(Format):
-    def from_system(self, file_name, **kwargs):
+    def from_system(self, file_name, begin=0, step=1, **kwargs):
         data = {}
         (
             data["atom_names"],
@@ -50,10 +50,10 @@ class SiestaAIMDOutputFormat(Format):
             _e,
             _f,
             _v,
-        ) = dpdata.siesta.aiMD_output.get_aiMD_frame(file_name)
+        ) = dpdata.siesta.aiMD_output.get_aiMD_frame(file_name, begin=begin, step=step)
         return data
 
-    def from_labeled_system(self, file_name, **kwargs):
+    def from_labeled_system(self, file_name, begin=0, step=1, **kwargs):
         data = {}
         (
             data["atom_names"],
@@ -64,5 +64,5 @@ class SiestaAIMDOutputFormat(Format):
             data["energies"],
             data["forces"],
             data["virials"],
-        ) = dpdata.siesta.aiMD_output.get_aiMD_frame(file_name)
+        ) = dpdata.siesta.aiMD_output.get_aiMD_frame(file_name, begin=begin, step=step)
         return data
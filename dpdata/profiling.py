@@ -0,0 +1,353 @@
+"""Timing instrumentation of format I/O and transformations.
+
+The stages of reading, writing, checking and transforming systems are
+timed only when a profiler is active, either by the :func:`profile`
+context manager or by the ``DPDATA_PROFILE`` environment variable.
+Otherwise, each stage costs a single global lookup.
+
+Examples
+--------
+>>> with dpdata.profiling.profile() as prof:
+...     ms = dpdata.MultiSystems.from_file("OUTCAR", fmt="vasp/outcar")
+...     ms.to("deepmd/npy", "data")
+>>> print(prof.summary())
+
+Set ``DPDATA_PROFILE=1`` to print the summary to stderr at exit, or
+``DPDATA_PROFILE=trace.json`` to also save a Chrome trace, which can be
+opened in ``chrome://tracing`` or https://ui.perfetto.dev.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+ENV_NAME = "DPDATA_PROFILE"
+
+_profiler: Profiler | None = None
+
+
+class Record:
+    """A timed stage.
+
+    Parameters
+    ----------
+    category : str
+        the category of the stage, such as ``"read"`` or ``"post_func"``
+    name : str
+        the name of the stage, such as the format or the function
+    nframes : int, optional
+        the number of frames processed
+    nbytes : int, optional
+        the number of bytes read or written
+    """
+
+    __slots__ = (
+        "category",
+        "name",
+        "start",
+        "duration",
+        "nframes",
+        "nbytes",
+        "tid",
+    )
+
+    def __init__(
+        self,
+        category: str,
+        name: str,
+        nframes: int | None = None,
+        nbytes: int | None = None,
+    ):
+        self.category = category
+        self.name = name
+        self.nframes = nframes
+        self.nbytes = nbytes
+        self.start = 0.0
+        self.duration = 0.0
+        self.tid = 0
+
+
+class _NullStage:
+    """The stage used when profiling is disabled.
+
+    The attributes set inside the stage are discarded.
+    """
+
+    nframes = None
+    nbytes = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+def file_size(path: Any) -> int | None:
+    """Get the size of a file, or the total size of the files in a directory.
+
+    Parameters
+    ----------
+    path : Any
+        the path. Objects other than a path, such as file handlers, are
+        ignored.
+
+    Returns
+    -------
+    int or None
+        the size in bytes, or None if it is not an existing path
+    """
+    if not isinstance(path, (str, os.PathLike)):
+        return None
+    try:
+        if os.path.isdir(path):
+            return sum(
+                os.path.getsize(os.path.join(root, ff))
+                for root, _, files in os.walk(path)
+                for ff in files
+            )
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+class _Stage:
+    def __init__(self, profiler: Profiler, record: Record, file: Any, mode: str):
+        self.profiler = profiler
+        self.record = record
+        self.file = file
+        self.mode = mode
+
+    def __enter__(self) -> Record:
+        record = self.record
+        if self.mode == "r" and record.nbytes is None:
+            record.nbytes = file_size(self.file)
+        record.tid = threading.get_ident()
+        record.start = time.perf_counter()
+        return record
+
+    def __exit__(self, *args):
+        record = self.record
+        record.duration = time.perf_counter() - record.start
+        if self.mode == "w" and record.nbytes is None:
+            record.nbytes = file_size(self.file)
+        self.profiler.records.append(record)
+        return False
+
+
+class Profiler:
+    """Collect the records of timed stages.
+
+    Attributes
+    ----------
+    records : list[Record]
+        the finished stages, in the order of completion
+    """
+
+    def __init__(self):
+        self.records: list[Record] = []
+        self.origin = time.perf_counter()
+
+    def stage(
+        self, category: str, name: str, file: Any = None, mode: str = "r"
+    ) -> _Stage:
+        """Time a stage.
+
+        Parameters
+        ----------
+        category : str
+            the category of the stage
+        name : str
+            the name of the stage
+        file : Any, optional
+            the file read or written in the stage
+        mode : str, default="r"
+            ``"r"`` if the file is read, whose size is taken before the
+            stage, or ``"w"`` if the file is written, whose size is taken
+            after the stage
+
+        Returns
+        -------
+        context manager
+            the stage, which returns the record on entering. The number
+            of frames can be set to the record inside the stage.
+        """
+        return _Stage(self, Record(category, name), file, mode)
+
+    def report(self) -> list[dict[str, Any]]:
+        """Aggregate the records by the category and the name.
+
+        Returns
+        -------
+        list[dict]
+            for each kind of stage, the category, the name, the number of
+            calls, the total wall time in seconds, the total number of
+            frames and the total number of bytes, sorted by the time. The
+            time of a stage includes the time of the stages nested in it.
+        """
+        stats: dict[tuple[str, str], dict[str, Any]] = {}
+        for rr in self.records:
+            ss = stats.setdefault(
+                (rr.category, rr.name),
+                {
+                    "category": rr.category,
+                    "name": rr.name,
+                    "calls": 0,
+                    "time": 0.0,
+                    "nframes": 0,
+                    "nbytes": 0,
+                },
+            )
+            ss["calls"] += 1
+            ss["time"] += rr.duration
+            if rr.nframes is not None:
+                ss["nframes"] += rr.nframes
+            if rr.nbytes is not None:
+                ss["nbytes"] += rr.nbytes
+        return sorted(stats.values(), key=lambda ss: ss["time"], reverse=True)
+
+    def summary(self) -> str:
+        """Format the report as a table.
+
+        Returns
+        -------
+        str
+            the table
+        """
+        lines = [
+            f"{'category':<12s} {'name':<32s} {'calls':>7s} {'time (s)':>10s} "
+            f"{'frames':>9s} {'bytes':>12s}"
+        ]
+        for ss in self.report():
+            lines.append(
+                f"{ss['category']:<12s} {ss['name']:<32s} {ss['calls']:7d} "
+                f"{ss['time']:10.4f} {ss['nframes']:9d} {ss['nbytes']:12d}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Convert the records to the Chrome trace event format.
+
+        Returns
+        -------
+        dict
+            the trace, with one complete event per record
+        """
+        pid = os.getpid()
+        events = []
+        for rr in self.records:
+            events.append(
+                {
+                    "name": rr.name,
+                    "cat": rr.category,
+                    "ph": "X",
+                    "ts": (rr.start - self.origin) * 1e6,
+                    "dur": rr.duration * 1e6,
+                    "pid": pid,
+                    "tid": rr.tid,
+                    "args": {"nframes": rr.nframes, "nbytes": rr.nbytes},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, file_name: str | os.PathLike) -> None:
+        """Save the records as a Chrome trace JSON file.
+
+        Parameters
+        ----------
+        file_name : str or os.PathLike
+            the JSON file
+        """
+        with open(file_name, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def stage(category: str, name: str, file: Any = None, mode: str = "r"):
+    """Time a stage with the active profiler.
+
+    Parameters
+    ----------
+    category : str
+        the category of the stage
+    name : str
+        the name of the stage
+    file : Any, optional
+        the file read or written in the stage
+    mode : str, default="r"
+        ``"r"`` if the file is read, or ``"w"`` if the file is written
+
+    Returns
+    -------
+    context manager
+        the stage. If no profiler is active, it does nothing.
+
+    See Also
+    --------
+    Profiler.stage : the stage of a profiler
+    """
+    if _profiler is None:
+        return _NULL_STAGE
+    return _profiler.stage(category, name, file=file, mode=mode)
+
+
+@contextmanager
+def profile(trace: str | os.PathLike | None = None) -> Iterator[Profiler]:
+    """Profile the stages inside the context.
+
+    Parameters
+    ----------
+    trace : str or os.PathLike, optional
+        if given, the Chrome trace JSON file saved on exit
+
+    Yields
+    ------
+    Profiler
+        the profiler, whose records are kept after exiting
+    """
+    global _profiler
+    previous = _profiler
+    profiler = Profiler()
+    _profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _profiler = previous
+        if trace is not None:
+            profiler.save_chrome_trace(trace)
+
+
+def _profile_from_env() -> None:
+    """Enable the profiler if the environment variable is set."""
+    global _profiler
+    value = os.environ.get(ENV_NAME, "")
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return
+    profiler = Profiler()
+    _profiler = profiler
+    trace = value if value.lower().endswith(".json") else None
+
+    def finalize():
+        print(profiler.summary(), file=sys.stderr)
+        if trace is not None:
+            profiler.save_chrome_trace(trace)
+
+    atexit.register(finalize)
+
+
+_profile_from_env()
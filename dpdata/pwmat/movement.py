@@ -5,12 +5,30 @@ import warnings
 import numpy as np
 
 from ..periodic_table import ELEMENTS
+from ..utils import open_file
+
+
+def load_atom_table(lines):
+    """Load a table of atoms, whose first column is the atomic number.
+
+    Parameters
+    ----------
+    lines : list of str
+        lines of the table, one line per atom
+
+    Returns
+    -------
+    table : np.ndarray
+        the table, in the shape of (natoms, ncolumns)
+    order : np.ndarray
+        the index that sorts the atoms by the atomic number
+    """
+    table = np.array(" ".join(lines).split(), dtype=float).reshape(len(lines), -1)
+    order = np.argsort(table[:, 0], kind="stable")
+    return table, order
 
 
 def system_info(lines, type_idx_zero=False):
-    atom_names = []
-    atom_numbs = []
-    nelm = 0
     natoms = int(lines[0].split()[0])
     iteration = float(lines[0].split("Etot")[0].split("=")[1].split(",")[0])
     #    print(iteration)
@@ -18,30 +36,18 @@ def system_info(lines, type_idx_zero=False):
         nelm = 40
     else:
         nelm = 100
-    atomic_number = []
+    atomic_number = np.zeros(0, dtype=int)
     for idx, ii in enumerate(lines):
         if ("Position" in ii) and ("nonperiodic_Position" not in ii):
-            for kk in range(idx + 1, idx + 1 + natoms):
-                min = kk
-                for jj in range(kk + 1, idx + 1 + natoms):
-                    if int(lines[jj].split()[0]) < int(lines[min].split()[0]):
-                        min = jj
-                        lines[min], lines[kk] = lines[kk], lines[min]
-            for gg in range(idx + 1, idx + 1 + natoms):
-                tmpn = int(lines[gg].split()[0])
-                atomic_number.append(tmpn)
-    for ii in np.unique(sorted(atomic_number)):
-        atom_numbs.append(atomic_number.count(ii))
-    atom_types = []
-    for idx, ii in enumerate(atom_numbs):
-        for jj in range(ii):
-            if type_idx_zero:
-                atom_types.append(idx)
-            else:
-                atom_types.append(idx + 1)
-    for ii in np.unique(sorted(atomic_number)):
-        atom_names.append(ELEMENTS[ii - 1])
-    return atom_names, atom_numbs, np.array(atom_types, dtype=int), nelm
+            table, _ = load_atom_table(lines[idx + 1 : idx + 1 + natoms])
+            atomic_number = table[:, 0].astype(int)
+            break
+    uniq_number, atom_numbs = np.unique(atomic_number, return_counts=True)
+    atom_types = np.repeat(np.arange(len(uniq_number)), atom_numbs)
+    if not type_idx_zero:
+        atom_types += 1
+    atom_names = [ELEMENTS[ii - 1] for ii in uniq_number]
+    return atom_names, atom_numbs.tolist(), atom_types, nelm
 
 
 def get_movement_block(fp):
@@ -55,42 +61,64 @@ def get_movement_block(fp):
     return blk
 
 
+def skip_movement_block(fp):
+    """Skip a block without keeping its lines.
+
+    Returns
+    -------
+    bool
+        whether a block is found
+    """
+    found = False
+    for ii in fp:
+        found = True
+        if "------------" in ii:
+            break
+    return found
+
+
 # we assume that the force is printed ...
 def get_frames(fname, begin=0, step=1, convergence_check=True):
-    fp = open(fname)
-    blk = get_movement_block(fp)
-
-    atom_names, atom_numbs, atom_types, nelm = system_info(blk, type_idx_zero=True)
-    ntot = sum(atom_numbs)
-
-    all_coords = []
-    all_cells = []
-    all_energies = []
-    all_atomic_energy = []
-    all_forces = []
-    all_virials = []
-
-    cc = 0
-    rec_failed = []
-    while len(blk) > 0:
-        if cc >= begin and (cc - begin) % step == 0:
-            coord, cell, energy, force, virial, is_converge = analyze_block(
-                blk, ntot, nelm
-            )
-            if len(coord) == 0:
-                break
-            if is_converge or not convergence_check:
-                all_coords.append(coord)
-                all_cells.append(cell)
-                all_energies.append(energy)
-                all_forces.append(force)
-                if virial is not None:
-                    all_virials.append(virial)
-            if not is_converge:
-                rec_failed.append(cc + 1)
+    def is_selected(cc):
+        return cc >= begin and (cc - begin) % step == 0
 
+    with open_file(fname) as fp:
         blk = get_movement_block(fp)
-        cc += 1
+
+        atom_names, atom_numbs, atom_types, nelm = system_info(blk, type_idx_zero=True)
+        ntot = sum(atom_numbs)
+
+        all_coords = []
+        all_cells = []
+        all_energies = []
+        all_atomic_energy = []
+        all_forces = []
+        all_virials = []
+
+        cc = 0
+        rec_failed = []
+        while len(blk) > 0:
+            if is_selected(cc):
+                coord, cell, energy, force, virial, is_converge = analyze_block(
+                    blk, ntot, nelm
+                )
+                if len(coord) == 0:
+                    break
+                if is_converge or not convergence_check:
+                    all_coords.append(coord)
+                    all_cells.append(cell)
+                    all_energies.append(energy)
+                    all_forces.append(force)
+                    if virial is not None:
+                        all_virials.append(virial)
+                if not is_converge:
+                    rec_failed.append(cc + 1)
+
+            cc += 1
+            # the blocks that are not requested are not parsed
+            while not is_selected(cc) and skip_movement_block(fp):
+                cc += 1
+            blk = get_movement_block(fp)
 
     if len(rec_failed) > 0:
         prt = (
@@ -106,7 +134,6 @@ def get_frames(fname, begin=0, step=1, convergence_check=True):
         all_virials = None
     else:
         all_virials = np.array(all_virials)
-    fp.close()
     return (
         atom_names,
         atom_numbs,
@@ -138,68 +165,21 @@ def analyze_block(lines, ntot, nelm):
             )  # use Ep, not Etot=Ep+Ek
         elif "----------" in ii:
             assert (force is not None) and len(coord) > 0 and len(cell) > 0
-            # all_coords.append(coord)
-            # all_cells.append(cell)
-            # all_energies.append(energy)
-            # all_forces.append(force)
-            # if virial is not None :
-            #     all_virials.append(virial)
             return coord, cell, energy, force, virial, is_converge
-        #        elif 'NPT' in ii:
-        #            tmp_v = []
         elif "Lattice vector" in ii:
+            cell_lines = [ll.split() for ll in lines[idx + 1 : idx + 4]]
+            cell = np.array([ll[0:3] for ll in cell_lines], dtype=float)
             if "stress" in lines[idx + 1]:
-                tmp_v = []
-                for dd in range(3):
-                    tmp_l = lines[idx + 1 + dd]
-                    cell.append([float(ss) for ss in tmp_l.split()[0:3]])
-                    tmp_v.append([float(stress) for stress in tmp_l.split()[5:8]])
-                virial = np.zeros([3, 3])
-                virial[0][0] = tmp_v[0][0]
-                virial[0][1] = tmp_v[0][1]
-                virial[0][2] = tmp_v[0][2]
-                virial[1][0] = tmp_v[1][0]
-                virial[1][1] = tmp_v[1][1]
-                virial[1][2] = tmp_v[1][2]
-                virial[2][0] = tmp_v[2][0]
-                virial[2][1] = tmp_v[2][1]
-                virial[2][2] = tmp_v[2][2]
-                volume = np.linalg.det(np.array(cell))
+                virial = np.array([ll[5:8] for ll in cell_lines], dtype=float)
+                volume = np.linalg.det(cell)
                 virial = virial * 160.2 * 10.0 / volume
-            else:
-                for dd in range(3):
-                    tmp_l = lines[idx + 1 + dd]
-                    cell.append([float(ss) for ss in tmp_l.split()[0:3]])
-
-        #            else :
-        #                for dd in range(3) :
-        #                    tmp_l = lines[idx+1+dd]
-        #                    cell.append([float(ss)
-        #                                 for ss in tmp_l.split()[0:3]])
-        #                virial = np.zeros([3,3])
         elif ("Position" in ii) and ("nonperiodic_Position" not in ii):
-            for kk in range(idx + 1, idx + 1 + ntot):
-                min = kk
-                for jj in range(kk + 1, idx + 1 + ntot):
-                    if int(lines[jj].split()[0]) < int(lines[min].split()[0]):
-                        min = jj
-                        lines[min], lines[kk] = lines[kk], lines[min]
-            for gg in range(idx + 1, idx + 1 + ntot):
-                info = [float(jj) for jj in lines[gg].split()[1:4]]
-                info = np.matmul(np.array(info), np.array(cell))
-                coord.append(info)
+            table, order = load_atom_table(lines[idx + 1 : idx + 1 + ntot])
+            coord = np.matmul(table[order, 1:4], cell)
         elif "Force" in ii:
-            for kk in range(idx + 1, idx + 1 + ntot):
-                min = kk
-                for jj in range(kk + 1, idx + 1 + ntot):
-                    if int(lines[jj].split()[0]) < int(lines[min].split()[0]):
-                        min = jj
-                        lines[min], lines[kk] = lines[kk], lines[min]
-            for gg in range(idx + 1, idx + 1 + ntot):
-                info = [
-                    -float(ss) for ss in lines[gg].split()
-                ]  # forces in MOVEMENT file are dE/dR, lacking a minus sign
-                force.append(info[1:4])
+            table, order = load_atom_table(lines[idx + 1 : idx + 1 + ntot])
+            # forces in MOVEMENT file are dE/dR, lacking a minus sign
+            force = -table[order, 1:4]
     #        elif 'Atomic-Energy' in ii:
     #            for jj in range(idx+1, idx+1+ntot) :
     #                tmp_l = lines[jj]
@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import numpy as np
 
+from dpdata.utils import encode_species
+
 
 def from_system_data(structure) -> dict:
     """Convert one pymatgen structure to dpdata's datadict."""
     symbols = [ii.specie.symbol for ii in structure]
-    atom_names = list(structure.symbol_set)
-    atom_numbs = [symbols.count(symbol) for symbol in atom_names]
-    atom_types = np.array([atom_names.index(symbol) for symbol in symbols]).astype(int)
+    atom_names, atom_numbs, atom_types = encode_species(
+        symbols, atom_names=list(structure.symbol_set)
+    )
     coords = structure.cart_coords
     cells = structure.lattice.matrix
     if all(structure.pbc):
@@ -1,6 +1,8 @@
 #!/usr/bin/python3
 from __future__ import annotations
 
+import mmap
+import os
 import warnings
 from typing import TYPE_CHECKING
 
@@ -11,8 +13,6 @@ from dpdata.utils import open_file
 if TYPE_CHECKING:
     from dpdata.utils import FileType
 
-import os
-
 from ..unit import (
     EnergyConversion,
     ForceConversion,
@@ -120,37 +120,142 @@ def load_param_file(fname: FileType):
     return atom_names, atom_numbs, atom_types, cell
 
 
-def _load_pos_block(fp, natoms):
-    head = fp.readline()
-    if not head:
-        # print('get None')
-        return None, None
-    else:
-        ss = head.split()[0]
-        blk = []
-        for ii in range(natoms):
-            newline = fp.readline()
-            if not newline:
-                return None, None
-            blk.append([float(jj) for jj in newline.split()])
-        return blk, ss
-
-
-def load_data(fname: FileType, natoms, begin=0, step=1, convert=1.0):
-    coords = []
-    steps = []
-    cc = 0
-    with open_file(fname) as fp:
-        while True:
-            blk, ss = _load_pos_block(fp, natoms)
-            if blk is None:
-                break
-            else:
-                if cc >= begin and (cc - begin) % step == 0:
-                    coords.append(blk)
-                    steps.append(ss)
-            cc += 1
-    coords = convert * np.array(coords)
+# number of bytes scanned at once when the lines are counted
+SCAN_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+class CPTrajBlocks:
+    """Blocks of a CP trajectory file, such as .pos, .for, .cel, and .str.
+
+    Each block has a header line, whose first word is the step key, followed
+    by a fixed number of lines of numbers. The start offsets of the blocks
+    are found in one pass over fixed-size chunks of the file, so the blocks
+    can be accessed randomly, and only the requested blocks are decoded.
+    An incomplete block at the end of the file is ignored.
+
+    Parameters
+    ----------
+    fname : FileType
+        the file
+    nlines : int
+        number of lines of each block, excluding the header line
+    memory_map : bool, default=False
+        whether to memory-map the file instead of reading it into memory.
+        Only supported when `fname` is a path.
+    """
+
+    def __init__(self, fname: FileType, nlines: int, memory_map: bool = False):
+        self.nlines = nlines
+        self._file = None
+        self._mmap = None
+        if memory_map and isinstance(fname, (str, os.PathLike)):
+            self._file = open(fname, "rb")
+            try:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty files cannot be memory-mapped
+                self._mmap = None
+            self.buffer = self._mmap if self._mmap is not None else b""
+        else:
+            with open_file(fname, "rb") as fp:
+                self.buffer = fp.read()
+            if isinstance(self.buffer, str):
+                self.buffer = self.buffer.encode()
+        block_lines = nlines + 1
+        size = len(self.buffer)
+        raw = np.frombuffer(self.buffer, dtype=np.uint8)
+        # offsets of the blocks, of which the first one starts at 0
+        block_starts = [np.zeros(1, dtype=np.int64)]
+        nlines_read = 0
+        for offset in range(0, size, SCAN_CHUNK_SIZE):
+            newlines = np.flatnonzero(raw[offset : offset + SCAN_CHUNK_SIZE] == 10)
+            # a block starts after every (nlines + 1)-th newline
+            first = (block_lines - 1 - nlines_read) % block_lines
+            block_starts.append(newlines[first::block_lines] + (offset + 1))
+            nlines_read += len(newlines)
+        if size > 0 and raw[-1] != 10:
+            # the last line without a newline
+            nlines_read += 1
+        del raw
+        self.nblocks = nlines_read // block_lines
+        # the end of each block is the start of the next one
+        self._offsets = np.concatenate(block_starts)[: self.nblocks + 1]
+        if len(self._offsets) == self.nblocks:
+            self._offsets = np.append(self._offsets, size)
+
+    def _block(self, ii: int) -> bytes:
+        """Get the bytes of a block, including the header line."""
+        return bytes(self.buffer[self._offsets[ii] : self._offsets[ii + 1]])
+
+    def __len__(self) -> int:
+        return self.nblocks
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the memory-mapped file."""
+        self.buffer = b""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def get_steps(self, idx) -> list[str]:
+        """Get the step keys of blocks.
+
+        Parameters
+        ----------
+        idx : list of int
+            indexes of blocks
+
+        Returns
+        -------
+        list of str
+            the step keys
+        """
+        steps = []
+        for ii in idx:
+            start = self._offsets[ii]
+            end = self.buffer.find(b"\n", start, self._offsets[ii + 1])
+            if end < 0:
+                end = self._offsets[ii + 1]
+            steps.append(bytes(self.buffer[start:end]).split()[0].decode())
+        return steps
+
+    def get_blocks(self, idx) -> np.ndarray:
+        """Decode the numbers of blocks.
+
+        Parameters
+        ----------
+        idx : list of int
+            indexes of blocks
+
+        Returns
+        -------
+        np.ndarray
+            the numbers, in the shape of (len(idx), nlines, ncolumns)
+        """
+        idx = list(idx)
+        if len(idx) == 0:
+            return np.zeros((0, self.nlines, 3))
+        # skip the header line of each block
+        text = b" ".join(self._block(ii).split(b"\n", 1)[1] for ii in idx)
+        return np.array(text.decode().split(), dtype=float).reshape(
+            len(idx), self.nlines, -1
+        )
+
+
+def load_data(fname: FileType, natoms, begin=0, step=1, convert=1.0, memory_map=False):
+    with CPTrajBlocks(fname, natoms, memory_map=memory_map) as blocks:
+        idx = range(begin, len(blocks), step)
+        coords = convert * blocks.get_blocks(idx)
+        steps = blocks.get_steps(idx)
     return coords, steps
 
 
@@ -199,7 +304,7 @@ def load_energy(fname, begin=0, step=1):
 #     return coords
 
 
-def to_system_data(input_name, prefix, begin=0, step=1):
+def to_system_data(input_name, prefix, begin=0, step=1, memory_map=False):
     data = {}
     data["atom_names"], data["atom_numbs"], data["atom_types"], cell = load_param_file(
         input_name
@@ -210,11 +315,17 @@ def to_system_data(input_name, prefix, begin=0, step=1):
         begin=begin,
         step=step,
         convert=length_convert,
+        memory_map=memory_map,
     )
     data["orig"] = np.zeros(3)
     try:
         data["cells"], tmp_steps = load_data(
-            prefix + ".cel", 3, begin=begin, step=step, convert=length_convert
+            prefix + ".cel",
+            3,
+            begin=begin,
+            step=step,
+            convert=length_convert,
+            memory_map=memory_map,
         )
         data["cells"] = np.transpose(data["cells"], (0, 2, 1))
         if csteps != tmp_steps:
@@ -236,7 +347,9 @@ def to_system_data(input_name, prefix, begin=0, step=1):
     stress_fname = prefix + ".str"
     if os.path.exists(stress_fname):
         # 1. Read stress tensor (in GPa) for each structure
-        stress, vsteps = load_data(stress_fname, 3, begin=begin, step=step, convert=1.0)
+        stress, vsteps = load_data(
+            stress_fname, 3, begin=begin, step=step, memory_map=memory_map
+        )
         if csteps != vsteps:
             csteps.append(None)
             vsteps.append(None)
@@ -257,7 +370,7 @@ def to_system_data(input_name, prefix, begin=0, step=1):
     return data, csteps
 
 
-def to_system_label(input_name, prefix, begin=0, step=1):
+def to_system_label(input_name, prefix, begin=0, step=1, memory_map=False):
     atom_names, atom_numbs, atom_types, cell = load_param_file(input_name)
     energy, esteps = load_energy(prefix + ".evp", begin=begin, step=step)
     force, fsteps = load_data(
@@ -266,6 +379,7 @@ def to_system_label(input_name, prefix, begin=0, step=1):
         begin=begin,
         step=step,
         convert=force_convert,
+        memory_map=memory_map,
     )
     assert esteps == fsteps, "the step key between files are not consistent "
     return energy, force, esteps
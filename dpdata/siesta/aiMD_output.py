@@ -1,187 +1,119 @@
 # !/usr/bin/python3
 from __future__ import annotations
 
-import numpy as np
-
-ev2ev = 1
-ang2ang = 1
-
-
-#############################read output#####################################
-def get_single_line_tail(fin, keyword, num=1):
-    file = open(fin)
-    part_res = []
-    for value in file:
-        if keyword in value:
-            temp = len(value.split()) - num
-            part_res.append(float(value.split()[temp]))
-
-    file.close()
-    return part_res
+from itertools import islice
 
+import numpy as np
 
-## atomnum: number of atoms,  row numbers
-## begin_column: begin column num
-## read_column_num: read column num
-## column_num: the column number in nxet reading line
-def extract_keyword(
-    fout,
-    keyword,
-    down_line_num,
-    begin_column,
-    read_column_num,
-    is_repeated_read,
-    column_num,
-):
-    file = open(fout)
-    ret = []
-    part_ret = []
-    flag = 0
-    idx = 0
-    extr_frame = 0
-    length = obtain_nframe(fout)
-    # for (num,value) in enumerate(file):
-    for value in file:
-        if keyword in value:
-            flag = 1
-            continue
-        if flag == 1:
-            if idx < down_line_num:
-                idx += 1
+from ..utils import open_file
+
+
+def _read_table(fp, nlines, columns):
+    """Read the next `nlines` lines of a table and convert `columns` to float."""
+    lines = list(islice(fp, nlines))
+    table = np.array(" ".join(lines).split()).reshape(nlines, -1)
+    return table[:, columns].astype(float)
+
+
+def iter_aiMD_frames(fp, begin=0, step=1):
+    """Iterate over the MD frames of a SIESTA output in a single pass.
+
+    All sections are recognized in one sweep over the lines. The tables of
+    the frames that are not selected by `begin` and `step` are skipped
+    without being converted to numbers. A frame is completed by its static
+    stress tensor; a trailing incomplete frame is discarded.
+
+    Parameters
+    ----------
+    fp : file
+        the opened SIESTA output
+    begin : int, default=0
+        the index of the first frame to read
+    step : int, default=1
+        the interval between two read frames
+
+    Yields
+    ------
+    dict
+        the frame, containing `atom_names`, `atom_types`, `cells`, `coords`,
+        `energies`, `forces`, and `virials`. The atom names and types are
+        shared by all frames.
+    """
+    atom_names = []
+    nspecies = None
+    natoms = None
+    atom_types = None
+    iframe = 0
+    frame = {}
+
+    def is_selected(ii):
+        return ii >= begin and (ii - begin) % step == 0
+
+    for line in fp:
+        if "Species number:" in line:
+            tokens = line.split()
+            atom_names.append(tokens[tokens.index("Label:") + 1])
+        elif "redata: Number of Atomic Species" in line:
+            nspecies = int(line.split()[-1])
+        elif natoms is None and "Number of atoms" in line:
+            natoms = int(line.split()[-3])
+        elif "outcoor: Atomic coordinates (Ang):" in line:
+            if atom_types is None:
+                table = _read_table(fp, natoms, slice(0, 4))
+                atom_types = table[:, 3].astype(int) - 1
+                assert atom_types.max() + 1 == nspecies
+                if is_selected(iframe):
+                    frame["coords"] = table[:, :3]
+            elif is_selected(iframe):
+                frame["coords"] = _read_table(fp, natoms, slice(0, 3))
             else:
-                flag = 0
-                part_ret.append(np.array(ret))
-                ret = []
-                extr_frame += 1
-                if extr_frame == length:
-                    file.close()
-                    return part_ret
-                ## is_repeated_read = 0: only read 1 time for SCF
-                ## is_repeated_read = 1:  read all for aiMD --> get all frames
-                if is_repeated_read:
-                    idx = 0
-                continue
-
-            for i in range(begin_column, read_column_num):
-                if len(value.split()) == column_num:
-                    if not value.split()[i].isalpha():
-                        ret.append(float(value.strip().split()[i]))
-                    else:
-                        ret.append(value.strip().split()[i])
-            continue
-    file.close()
-    return part_ret
-
-
-def obtain_nframe(fname):
-    fp = open(fname)
-    flag = False
-    idx = 0
-    temp = 0
-    for ii in fp:
-        if "siesta: Stress tensor (static) (eV/Ang**3):" in ii:
-            flag = True
-            continue
-        if flag:
-            if "siesta: Pressure (static):" not in ii:
-                if len(ii.split()) == 3:
-                    temp += 1
-                    if temp == 3:
-                        idx += 1
-                        # print(idx)
-                        flag = False
-                        temp = 0
-    fp.close()
-    return idx
-
-
-def get_atom_types(fout, atomnums):
-    covert_type = extract_keyword(
-        fout, "outcoor: Atomic coordinates (Ang):", atomnums, 3, 4, 0, 6
-    )[0]
-    atomtype = []
-    # print(covert_type)
-    for i in range(0, len(covert_type)):
-        atomtype.append(int(covert_type[i]) - 1)
-    return atomtype
-
-
-def get_atom_name(fout):
-    file = open(fout)
-    ret = []
-    for value in file:
-        if "Species number:" in value:
-            for j in range(len(value.split())):
-                if value.split()[j] == "Label:":
-                    ret.append(value.split()[j + 1])
-                    break
-    file.close()
-    return ret
-
-
-def get_atom_numbs(atomtypes):
-    atom_numbs = []
-    for i in set(atomtypes):
-        atom_numbs.append(atomtypes.count(i))
-    return atom_numbs
-
-
-def get_virial(fout, cell):
-    viri = extract_keyword(
-        fout, "siesta: Stress tensor (static) (eV/Ang**3):", 3, 0, 3, 1, 3
-    )
-    vols = []
-    length = obtain_nframe(fout)
-    for ii in range(length):
-        vols.append(np.linalg.det(cell[ii].reshape([3, 3])))
-        for jj in range(len(viri[ii])):
+                # skip the table
+                next(islice(fp, natoms - 1, natoms), None)
+        elif not is_selected(iframe):
+            # other sections of unselected frames are not parsed
+            if "siesta: Stress tensor (static) (eV/Ang**3):" in line:
+                iframe += 1
+        elif "outcell: Unit cell vectors (Ang):" in line:
+            frame["cells"] = _read_table(fp, 3, slice(0, 3))
+        elif "siesta: E_KS(eV) =" in line:
+            frame["energies"] = float(line.split()[-1])
+        elif "siesta: Atomic forces (eV/Ang):" in line:
+            frame["forces"] = _read_table(fp, natoms, slice(1, 4))
+        elif "siesta: Stress tensor (static) (eV/Ang**3):" in line:
+            stress = _read_table(fp, 3, slice(0, 3))
             ## siesta: 1eV/A^3= 1.60217*10^11 Pa ,  ---> qe: kBar=10^8Pa
-            # ii *= vols[idx] * 1e3 / 1.602176621e6 * (1.602176621e3)
-            viri[ii][jj] *= vols[ii]
-    return viri
-
-
-def covert_dimension(arr, num):
-    arr = np.array(arr)
-    frames = len(arr)
-    ret = np.zeros((frames, num, 3))
-    for i in range(frames):
-        ret[i] = arr[i].reshape(num, 3)
-    return ret
-
-
-def get_aiMD_frame(fname):
-    NumberOfSpecies = int(
-        get_single_line_tail(fname, "redata: Number of Atomic Species")[0]
-    )
-    atom_names = get_atom_name(fname)
-    tot_natoms = int(get_single_line_tail(fname, "Number of atoms", 3)[0])
-
-    atom_types = get_atom_types(fname, tot_natoms)
-    atom_numbs = get_atom_numbs(atom_types)
-    assert max(atom_types) + 1 == NumberOfSpecies
-
-    cell = extract_keyword(fname, "outcell: Unit cell vectors (Ang):", 3, 0, 3, 1, 3)
-    coord = extract_keyword(
-        fname, "outcoor: Atomic coordinates (Ang):", tot_natoms, 0, 3, 1, 6
-    )
-    energy = get_single_line_tail(fname, "siesta: E_KS(eV) =")
-    force = extract_keyword(
-        fname, "siesta: Atomic forces (eV/Ang):", tot_natoms, 1, 4, 1, 4
+            frame["virials"] = stress * np.linalg.det(frame["cells"])
+            frame["atom_names"] = atom_names
+            frame["atom_types"] = atom_types
+            yield frame
+            frame = {}
+            iframe += 1
+
+
+def get_aiMD_frame(fname, begin=0, step=1):
+    keys = ("cells", "coords", "energies", "forces", "virials")
+    columns = {kk: [] for kk in keys}
+    atom_names = atom_types = None
+    with open_file(fname) as fp:
+        for frame in iter_aiMD_frames(fp, begin=begin, step=step):
+            atom_names = frame["atom_names"]
+            atom_types = frame["atom_types"]
+            for kk in keys:
+                columns[kk].append(frame[kk])
+    if atom_types is None:
+        raise RuntimeError(f"No MD frame is selected from {fname}")
+    atom_numbs = np.bincount(atom_types, minlength=len(atom_names)).tolist()
+    # each quantity is stacked into an array at once
+    cells, coords, energies, forces, virials = (
+        np.array(columns[kk], dtype=float) for kk in keys
     )
-    virial = get_virial(fname, cell)
-
-    cells = covert_dimension(np.array(cell), 3)
-    coords = covert_dimension(np.array(coord), tot_natoms)
-    forces = covert_dimension(np.array(force), tot_natoms)
-    virials = covert_dimension(np.array(virial), 3)
     return (
         atom_names,
         atom_numbs,
-        np.array(atom_types),
+        atom_types,
         cells,
         coords,
-        np.array(energy),
+        energies,
         forces,
         virials,
     )
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
-from functools import lru_cache
-from typing import Any
+from functools import cached_property
+from itertools import zip_longest
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
 
 from dpdata.system import LabeledSystem, MultiSystems
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
 
 def mae(errors: np.ndarray) -> np.floating[Any]:
     """Compute the mean absolute error (MAE).
@@ -115,16 +119,14 @@ class Errors(ErrorsBase):
 
     SYSTEM_TYPE = LabeledSystem
 
-    @property
-    @lru_cache
+    @cached_property
     def e_errors(self) -> np.ndarray:
         """Energy errors."""
         assert isinstance(self.system_1, self.SYSTEM_TYPE)
         assert isinstance(self.system_2, self.SYSTEM_TYPE)
         return self.system_1["energies"] - self.system_2["energies"]
 
-    @property
-    @lru_cache
+    @cached_property
     def f_errors(self) -> np.ndarray:
         """Force errors."""
         assert isinstance(self.system_1, self.SYSTEM_TYPE)
@@ -152,8 +154,7 @@ class MultiErrors(ErrorsBase):
 
     SYSTEM_TYPE = MultiSystems
 
-    @property
-    @lru_cache
+    @cached_property
     def e_errors(self) -> np.ndarray:
         """Energy errors."""
         assert isinstance(self.system_1, self.SYSTEM_TYPE)
@@ -165,8 +166,7 @@ class MultiErrors(ErrorsBase):
             errors.append(Errors(ss1, ss2).e_errors.ravel())
         return np.concatenate(errors)
 
-    @property
-    @lru_cache
+    @cached_property
     def f_errors(self) -> np.ndarray:
         """Force errors."""
         assert isinstance(self.system_1, self.SYSTEM_TYPE)
@@ -177,3 +177,252 @@ class MultiErrors(ErrorsBase):
             ss2 = self.system_2[nn]
             errors.append(Errors(ss1, ss2).f_errors.ravel())
         return np.concatenate(errors)
+
+
+class ErrorAccumulator:
+    """Accumulate the statistics of errors chunk by chunk.
+
+    Only the running sums are kept, so the errors of each chunk can be
+    freed after :meth:`update`.
+
+    Parameters
+    ----------
+    bins : np.ndarray, optional
+        the edges of the bins of the histogram of errors. The errors
+        outside of the edges are not counted in the histogram. If not
+        given, the histogram is not computed.
+
+    Examples
+    --------
+    >>> acc = ErrorAccumulator(bins=np.linspace(-1, 1, 21))
+    >>> for chunk in chunks:
+    ...     acc.update(chunk)
+    >>> print(acc.mae, acc.rmse, acc.max)
+    """
+
+    def __init__(self, bins: np.ndarray | None = None) -> None:
+        self.n = 0
+        self.sum_abs = 0.0
+        self.sum_square = 0.0
+        self.max_abs = 0.0
+        self.bins = None if bins is None else np.asarray(bins, dtype=np.float64)
+        self.counts = None if bins is None else np.zeros(len(bins) - 1, dtype=np.int64)
+
+    def update(self, errors: np.ndarray) -> None:
+        """Add a chunk of errors.
+
+        Parameters
+        ----------
+        errors : np.ndarray
+            errors between two values, in any shape
+        """
+        errors = np.asarray(errors, dtype=np.float64).ravel()
+        if errors.size == 0:
+            return
+        abs_errors = np.abs(errors)
+        self.n += errors.size
+        self.sum_abs += float(np.sum(abs_errors))
+        self.sum_square += float(np.dot(errors, errors))
+        self.max_abs = max(self.max_abs, float(np.max(abs_errors)))
+        if self.bins is not None:
+            self.counts += np.histogram(errors, bins=self.bins)[0]
+
+    def merge(self, other: ErrorAccumulator) -> None:
+        """Add the errors accumulated by another accumulator.
+
+        Parameters
+        ----------
+        other : ErrorAccumulator
+            the other accumulator, which has the same bins
+        """
+        self.n += other.n
+        self.sum_abs += other.sum_abs
+        self.sum_square += other.sum_square
+        self.max_abs = max(self.max_abs, other.max_abs)
+        if self.bins is not None:
+            assert other.bins is not None and np.array_equal(self.bins, other.bins)
+            self.counts += other.counts
+
+    @property
+    def mae(self) -> float:
+        """Mean absolute error (MAE)."""
+        return self.sum_abs / self.n if self.n else np.nan
+
+    @property
+    def rmse(self) -> float:
+        """Root mean squared error (RMSE)."""
+        return np.sqrt(self.sum_square / self.n) if self.n else np.nan
+
+    @property
+    def max(self) -> float:
+        """Maximal absolute error."""
+        return self.max_abs if self.n else np.nan
+
+    @property
+    def histogram(self) -> tuple[np.ndarray, np.ndarray]:
+        """The counts and the bin edges of the histogram of errors."""
+        if self.bins is None:
+            raise RuntimeError("bins are not given, so the histogram is not computed")
+        return self.counts, self.bins
+
+
+class StreamingErrors:
+    """Compute errors (deviations) between two datasets in chunks of frames.
+
+    Unlike :class:`Errors` and :class:`MultiErrors`, the errors of all
+    frames are never held in memory at the same time, so it can compare
+    datasets much larger than the memory, such as memory-mapped systems or
+    systems loaded lazily one by one.
+
+    Parameters
+    ----------
+    system_1 : LabeledSystem, MultiSystems, or iterable of LabeledSystem
+        system 1
+    system_2 : LabeledSystem, MultiSystems, or iterable of LabeledSystem
+        system 2. Two MultiSystems are matched by the formula of systems,
+        and two iterables are matched by their order.
+    chunk_size : int, optional
+        number of frames compared at once. By default, it is chosen so that
+        about one million atoms are compared at once.
+    e_bins : np.ndarray, optional
+        the edges of the bins of the histogram of energy errors
+    f_bins : np.ndarray, optional
+        the edges of the bins of the histogram of force errors
+
+    Attributes
+    ----------
+    energy : ErrorAccumulator
+        statistics of energy errors
+    force : ErrorAccumulator
+        statistics of errors of force components
+    virial : ErrorAccumulator
+        statistics of errors of virial components, of the frames whose
+        virials are given in both systems
+    by_formula : dict[str, dict[str, ErrorAccumulator]]
+        statistics of energy, force, and virial errors of each formula
+    by_element : dict[str, ErrorAccumulator]
+        statistics of errors of force components of each element
+
+    Examples
+    --------
+    Compare two datasets saved in the native binary format, which are
+    memory-mapped:
+
+    >>> ref = dpdata.MultiSystems.from_file("ref.bin", fmt="dpdata/bin")
+    >>> pred = dpdata.MultiSystems.from_file("pred.bin", fmt="dpdata/bin")
+    >>> e = dpdata.stat.StreamingErrors(ref, pred)
+    >>> print("%.4f %.4f %.4f %.4f" % (e.e_mae, e.e_rmse, e.f_mae, e.f_rmse))
+    """
+
+    def __init__(
+        self,
+        system_1: LabeledSystem | MultiSystems | Iterable[LabeledSystem],
+        system_2: LabeledSystem | MultiSystems | Iterable[LabeledSystem],
+        chunk_size: int | None = None,
+        e_bins: np.ndarray | None = None,
+        f_bins: np.ndarray | None = None,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.e_bins = e_bins
+        self.f_bins = f_bins
+        self.energy = ErrorAccumulator(e_bins)
+        self.force = ErrorAccumulator(f_bins)
+        self.virial = ErrorAccumulator()
+        self.by_formula: dict[str, dict[str, ErrorAccumulator]] = {}
+        self.by_element: dict[str, ErrorAccumulator] = {}
+        for ss1, ss2 in self._pairs(system_1, system_2):
+            self._update(ss1, ss2)
+
+    @staticmethod
+    def _pairs(system_1, system_2) -> Iterator[tuple[LabeledSystem, LabeledSystem]]:
+        if isinstance(system_1, LabeledSystem) and isinstance(system_2, LabeledSystem):
+            yield system_1, system_2
+        elif isinstance(system_1, MultiSystems) and isinstance(system_2, MultiSystems):
+            for nn in system_1.systems.keys():
+                yield system_1[nn], system_2[nn]
+        else:
+            # iterables, such as generators of lazily loaded systems
+            for ss1, ss2 in zip_longest(system_1, system_2):
+                if ss1 is None or ss2 is None:
+                    raise RuntimeError("system_1 and system_2 have different lengths")
+                assert isinstance(ss1, LabeledSystem), (
+                    "system_1 should be LabeledSystem"
+                )
+                assert isinstance(ss2, LabeledSystem), (
+                    "system_2 should be LabeledSystem"
+                )
+                yield ss1, ss2
+
+    def _update(self, system_1: LabeledSystem, system_2: LabeledSystem) -> None:
+        nframes = system_1.get_nframes()
+        natoms = system_1.get_natoms()
+        if system_2.get_nframes() != nframes or system_2.get_natoms() != natoms:
+            raise RuntimeError(
+                f"systems with inconsistent shapes could not be compared: {system_1.formula} v.s. {system_2.formula}"
+            )
+        formula_stats = self.by_formula.setdefault(
+            system_1.formula,
+            {
+                "energy": ErrorAccumulator(self.e_bins),
+                "force": ErrorAccumulator(self.f_bins),
+                "virial": ErrorAccumulator(),
+            },
+        )
+        has_forces = system_1.has_forces() and system_2.has_forces()
+        has_virial = system_1.has_virial() and system_2.has_virial()
+        atom_types = system_1["atom_types"]
+        elements = [
+            (name, atom_types == ii)
+            for ii, name in enumerate(system_1["atom_names"])
+            if system_1["atom_numbs"][ii] > 0
+        ]
+        chunk_size = self.chunk_size
+        if chunk_size is None:
+            chunk_size = max(1, 2**20 // max(natoms, 1))
+        for start in range(0, nframes, chunk_size):
+            ss = slice(start, start + chunk_size)
+            e_errors = system_1["energies"][ss] - system_2["energies"][ss]
+            self.energy.update(e_errors)
+            formula_stats["energy"].update(e_errors)
+            if has_forces:
+                f_errors = system_1["forces"][ss] - system_2["forces"][ss]
+                self.force.update(f_errors)
+                formula_stats["force"].update(f_errors)
+                for name, mask in elements:
+                    self.by_element.setdefault(
+                        name, ErrorAccumulator(self.f_bins)
+                    ).update(f_errors[:, mask])
+            if has_virial:
+                v_errors = system_1["virials"][ss] - system_2["virials"][ss]
+                self.virial.update(v_errors)
+                formula_stats["virial"].update(v_errors)
+
+    @property
+    def e_mae(self) -> float:
+        """Energy MAE."""
+        return self.energy.mae
+
+    @property
+    def e_rmse(self) -> float:
+        """Energy RMSE."""
+        return self.energy.rmse
+
+    @property
+    def e_max(self) -> float:
+        """Maximal absolute energy error."""
+        return self.energy.max
+
+    @property
+    def f_mae(self) -> float:
+        """Force MAE."""
+        return self.force.mae
+
+    @property
+    def f_rmse(self) -> float:
+        """Force RMSE."""
+        return self.force.rmse
+
+    @property
+    def f_max(self) -> float:
+        """Maximal absolute error of force components."""
+        return self.force.max
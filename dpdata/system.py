@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import glob
 import hashlib
+import importlib
 import numbers
 import os
 import warnings
@@ -18,13 +19,17 @@ from typing import (
 import numpy as np
 
 import dpdata
+import dpdata.bin.serialization
 import dpdata.md.pbc
 
 # ensure all plugins are loaded!
 import dpdata.plugins
 import dpdata.plugins.deepmd
+import dpdata.profiling
 from dpdata.amber.mask import load_param_file, pick_by_amber_mask
 from dpdata.data_type import Axis, DataError, DataType, get_data_types
+from dpdata.dedup import frame_fingerprints, unique_frame_index
+from dpdata.diversity import farthest_point_sampling, get_descriptors
 from dpdata.driver import Driver, Minimizer
 from dpdata.format import Format
 from dpdata.plugin import Plugin
@@ -39,6 +44,8 @@ from dpdata.utils import (
 if TYPE_CHECKING:
     import parmed
 
+    from dpdata.diversity import DescriptorType
+
 
 def load_format(fmt):
     fmt = fmt.lower()
@@ -234,17 +241,23 @@ class System:
         return self.from_fmt_obj(load_format(fmt), file_name, **kwargs)
 
     def from_fmt_obj(self, fmtobj: Format, file_name: Any, **kwargs: Any):
-        data = fmtobj.from_system(file_name, **kwargs)
+        with dpdata.profiling.stage(
+            "read", type(fmtobj).__name__, file=file_name
+        ) as record:
+            data = fmtobj.from_system(file_name, **kwargs)
         if data:
             if isinstance(data, (list, tuple)):
                 for dd in data:
                     self.append(System(data=dd))
             else:
                 self.data = {**self.data, **data}
-                self.check_data()
+                with dpdata.profiling.stage("check", "check_data"):
+                    self.check_data()
+            record.nframes = self.get_nframes()
             if hasattr(fmtobj.from_system, "post_func"):
                 for post_f in fmtobj.from_system.post_func:  # type: ignore
-                    self.post_funcs.get_plugin(post_f)(self)
+                    with dpdata.profiling.stage("post_func", post_f):
+                        self.post_funcs.get_plugin(post_f)(self)
         return self
 
     def to(self, fmt: str, *args: Any, **kwargs: Any) -> System:
@@ -267,7 +280,11 @@ class System:
         return self.to_fmt_obj(load_format(fmt), *args, **kwargs)
 
     def to_fmt_obj(self, fmtobj: Format, *args: Any, **kwargs: Any):
-        return fmtobj.to_system(self.data, *args, **kwargs)
+        with dpdata.profiling.stage(
+            "write", type(fmtobj).__name__, file=args[0] if args else None, mode="w"
+        ) as record:
+            record.nframes = self.get_nframes()
+            return fmtobj.to_system(self.data, *args, **kwargs)
 
     def __repr__(self):
         return self.__str__()
@@ -329,7 +346,24 @@ class System:
         return self.__class__.from_dict({"data": self_copy.data})
 
     def dump(self, filename: str, indent: int = 4):
-        """Dump .json or .yaml file."""
+        """Dump the system to a file.
+
+        The format is selected by the extension of `filename`:
+
+        - ``.npz``: NumPy archive
+        - ``.bin``: dpdata/bin file, whose arrays are memory-mapped when loaded
+        - otherwise, .json or .yaml file
+
+        Parameters
+        ----------
+        filename : str
+            the file name
+        indent : int, default=4
+            indent of .json or .yaml file
+        """
+        if str(filename).lower().endswith(dpdata.bin.serialization.BINARY_SUFFIXES):
+            dpdata.bin.serialization.dump(filename, self.as_dict())
+            return
         from monty.serialization import dumpfn
 
         dumpfn(self.as_dict(), filename, indent=indent)
@@ -367,16 +401,25 @@ class System:
         _set2 = set(list(type_map.keys()))
         assert _set1.issubset(_set2)
 
-        atom_types_list = []
-        for name, numb in zip(self.get_atom_names(), self.get_atom_numbs()):
-            atom_types_list.extend([name] * numb)
-        new_atom_types = np.array([type_map[ii] for ii in atom_types_list], dtype=int)
+        name_types = np.array(
+            [type_map[name] for name in self.get_atom_names()], dtype=int
+        )
+        new_atom_types = np.repeat(name_types, self.get_atom_numbs())
 
         return new_atom_types
 
     @staticmethod
     def load(filename: str):
-        """Rebuild System obj. from .json or .yaml file."""
+        """Rebuild System obj. from a file written by :meth:`dump`.
+
+        The format is selected by the extension of `filename`: ``.npz``,
+        ``.bin``, or otherwise .json or .yaml file. The class of the
+        returned object is the one recorded in the file.
+        """
+        if str(filename).lower().endswith(dpdata.bin.serialization.BINARY_SUFFIXES):
+            d = dpdata.bin.serialization.load(filename)
+            module = importlib.import_module(d["@module"])
+            return getattr(module, d["@class"])(data=d["data"])
         from monty.serialization import loadfn
 
         return loadfn(filename)
@@ -556,7 +599,8 @@ class System:
         type_map : list
             type_map
         """
-        self.data = sort_atom_names(self.data, type_map=type_map)
+        with dpdata.profiling.stage("transform", "sort_atom_names"):
+            self.data = sort_atom_names(self.data, type_map=type_map)
 
     def check_type_map(self, type_map: list[str] | None):
         """Assign atom_names to type_map if type_map is given and different from
@@ -931,6 +975,80 @@ class System:
         self.data = self.sub_system(idx).data
         return idx
 
+    def unique_frames(self, tol: float = 1e-4) -> tuple[System, np.ndarray]:
+        """Remove duplicated frames from the system.
+
+        Frames are compared by structural fingerprints: the coordinates
+        are wrapped into the cell, quantized with the tolerance, and the
+        atoms of the same type are sorted, so that periodic images and
+        permutations of atoms of the same type are regarded as identical.
+        The first occurrence of each structure is kept.
+
+        Parameters
+        ----------
+        tol : float, default=1e-4
+            The tolerance of coordinates and cells, in Angstrom
+
+        Returns
+        -------
+        System
+            The system without duplicated frames
+        np.ndarray
+            The indices of the removed frames
+        """
+        if "real_atom_types" in self.data:
+            atom_types = self.data["real_atom_types"]
+        else:
+            atom_types = self.data["atom_types"]
+        fingerprints = frame_fingerprints(
+            self.data["coords"],
+            self.data["cells"],
+            atom_types,
+            tol=tol,
+            nopbc=self.nopbc,
+        )
+        keep_idx, removed_idx = unique_frame_index(fingerprints)
+        return self.sub_system(keep_idx), removed_idx
+
+    def select_diverse(
+        self,
+        n: int,
+        descriptor: DescriptorType = "radial",
+        descriptor_file: str | None = None,
+        **kwargs: Any,
+    ) -> tuple[System, np.ndarray]:
+        """Select the most diverse frames by farthest point sampling.
+
+        Parameters
+        ----------
+        n : int
+            The number of frames to select
+        descriptor : str or callable, default="radial"
+            The per-frame descriptor. ``"radial"`` uses the histogram of
+            pair distances resolved by atom types; a callable takes a system
+            and returns an array in the shape of (nframes, ndescriptor)
+        descriptor_file : str, optional
+            The ``.npy`` file in which the descriptors are stored as a
+            memory map, which bounds the memory for many frames. By default,
+            the descriptors are kept in memory
+        **kwargs : dict
+            Other parameters passed to the descriptor, such as `rcut` and
+            `nbins` of :func:`dpdata.diversity.radial_descriptor`, or
+            `chunk_size`, the number of frames described at once
+
+        Returns
+        -------
+        System
+            The system containing the selected frames
+        np.ndarray
+            The indices of the selected frames, in the order of selection
+        """
+        descriptors = get_descriptors(
+            self, descriptor, descriptor_file=descriptor_file, **kwargs
+        )
+        selected_idx = farthest_point_sampling(descriptors, n)
+        return self.sub_system(selected_idx), selected_idx
+
     def predict(
         self, *args: Any, driver: str | Driver = "dp", **kwargs: Any
     ) -> LabeledSystem:
@@ -958,7 +1076,9 @@ class System:
         """
         if not isinstance(driver, Driver):
             driver = Driver.get_driver(driver)(*args, **kwargs)
-        data = driver.label(self.data.copy())
+        with dpdata.profiling.stage("driver", type(driver).__name__) as record:
+            record.nframes = self.get_nframes()
+            data = driver.label(self.data.copy())
         return LabeledSystem(data=data)
 
     def minimize(
@@ -982,7 +1102,9 @@ class System:
         """
         if not isinstance(minimizer, Minimizer):
             minimizer = Minimizer.get_minimizer(minimizer)(*args, **kwargs)
-        data = minimizer.minimize(self.data.copy())
+        with dpdata.profiling.stage("minimizer", type(minimizer).__name__) as record:
+            record.nframes = self.get_nframes()
+            data = minimizer.minimize(self.data.copy())
         return LabeledSystem(data=data)
 
     def pick_atom_idx(
@@ -1221,21 +1343,31 @@ class LabeledSystem(System):
     post_funcs = Plugin() + System.post_funcs
 
     def from_fmt_obj(self, fmtobj, file_name, **kwargs):
-        data = fmtobj.from_labeled_system(file_name, **kwargs)
+        with dpdata.profiling.stage(
+            "read", type(fmtobj).__name__, file=file_name
+        ) as record:
+            data = fmtobj.from_labeled_system(file_name, **kwargs)
         if data:
             if isinstance(data, (list, tuple)):
                 for dd in data:
                     self.append(LabeledSystem(data=dd))
             else:
                 self.data = {**self.data, **data}
-                self.check_data()
+                with dpdata.profiling.stage("check", "check_data"):
+                    self.check_data()
+            record.nframes = self.get_nframes()
             if hasattr(fmtobj.from_labeled_system, "post_func"):
                 for post_f in fmtobj.from_labeled_system.post_func:  # type: ignore
-                    self.post_funcs.get_plugin(post_f)(self)
+                    with dpdata.profiling.stage("post_func", post_f):
+                        self.post_funcs.get_plugin(post_f)(self)
         return self
 
     def to_fmt_obj(self, fmtobj, *args, **kwargs):
-        return fmtobj.to_labeled_system(self.data, *args, **kwargs)
+        with dpdata.profiling.stage(
+            "write", type(fmtobj).__name__, file=args[0] if args else None, mode="w"
+        ) as record:
+            record.nframes = self.get_nframes()
+            return fmtobj.to_labeled_system(self.data, *args, **kwargs)
 
     def __str__(self):
         ret = "Data Summary"
@@ -1357,6 +1489,55 @@ class LabeledSystem(System):
         return self.sub_system(idx)
 
 
+class _SystemDict(dict):
+    """A dict of systems that caches the list of its values, so that systems can
+    be indexed by integers in O(1).
+    """
+
+    # class attribute as the default, since unpickling sets items before
+    # the instance attributes
+    _value_list: list[System] | None = None
+
+    def value_list(self) -> list[System]:
+        """Returns the list of systems in the order of insertion."""
+        if self._value_list is None:
+            self._value_list = list(self.values())
+        return self._value_list
+
+    def __setitem__(self, key, value):
+        if key not in self and self._value_list is not None:
+            # a new key is inserted at the end
+            self._value_list.append(value)
+        else:
+            self._value_list = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._value_list = None
+        super().__delitem__(key)
+
+    def pop(self, *args):
+        self._value_list = None
+        return super().pop(*args)
+
+    def popitem(self):
+        self._value_list = None
+        return super().popitem()
+
+    def clear(self):
+        self._value_list = None
+        super().clear()
+
+    def update(self, *args, **kwargs):
+        self._value_list = None
+        super().update(*args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+
 class MultiSystems:
     """A set containing several systems."""
 
@@ -1368,7 +1549,7 @@ class MultiSystems:
         type_map : list of str
             Maps atom type to name
         """
-        self.systems: dict[str, System] = {}
+        self.systems = {}
         if type_map is not None:
             self.atom_names: list[str] = type_map
         else:
@@ -1385,7 +1566,9 @@ class MultiSystems:
                 else:
                     system = System().from_fmt_obj(fmtobj, dd, **kwargs)
                 system.sort_atom_names()
-                self.append(system)
+                # the loaded system is owned here, so its arrays, e.g.
+                # memory-mapped ones, are not copied
+                self._append(system, copy=False)
             return self
         else:
             system_list = []
@@ -1398,7 +1581,7 @@ class MultiSystems:
                     data_list = fmtobj.from_system_mix(dd, **kwargs)
                     for data_item in data_list:
                         system_list.append(System(data=data_item, **kwargs))
-            self.append(*system_list)
+            self._append(*system_list, copy=False)
             return self
 
     def to_fmt_obj(self, fmtobj: Format, directory, *args: Any, **kwargs: Any):
@@ -1439,10 +1622,19 @@ class MultiSystems:
         """
         return self.to_fmt_obj(load_format(fmt), *args, **kwargs)
 
+    @property
+    def systems(self) -> dict[str, System]:
+        """The systems, with their formulas as keys."""
+        return self._systems
+
+    @systems.setter
+    def systems(self, systems: dict[str, System]):
+        self._systems = _SystemDict(systems)
+
     def __getitem__(self, key):
         """Returns proerty stored in System by key or by idx."""
         if isinstance(key, int):
-            return list(self.systems.values())[key]
+            return self._systems.value_list()[key]
         return self.systems[key]
 
     def __len__(self):
@@ -1504,26 +1696,77 @@ class MultiSystems:
         *systems : System
             The system to append
         """
+        self._append(*systems, copy=True)
+
+    def _append(self, *systems: System | MultiSystems, copy: bool = True):
+        """Append systems or MultiSystems to systems.
+
+        Parameters
+        ----------
+        *systems : System
+            The system to append
+        copy : bool, default=True
+            Whether to copy the systems. If False, the systems are taken
+            over without copying their arrays, which keeps memory-mapped
+            arrays of loaded files, and they should not be used by the
+            caller anymore.
+        """
+        flat_systems: list[System] = []
         for system in systems:
             if isinstance(system, System):
-                self.__append(system)
+                flat_systems.append(system)
             elif isinstance(system, MultiSystems):
-                for sys in system:
-                    self.__append(sys)
+                flat_systems.extend(system)
             else:
                 raise RuntimeError("Object must be System or MultiSystems!")
-
-    def __append(self, system: System):
+        with dpdata.profiling.stage("append", "MultiSystems.append") as record:
+            record.nframes = sum(len(system) for system in flat_systems)
+            # add all new atom_names at once, so that the existing systems are
+            # sorted only once
+            known_atom_names = set(self.atom_names)
+            new_atom_names = []
+            for system in flat_systems:
+                if not system.formula:
+                    continue
+                for name in system["atom_names"]:
+                    if name not in known_atom_names:
+                        known_atom_names.add(name)
+                        new_atom_names.append(name)
+            self.add_atom_names(new_atom_names)
+            for system in flat_systems:
+                self.__append(system, copy=copy)
+
+    def __append(self, system: System, copy: bool = True):
         if not system.formula:
             return
-        # prevent changing the original system
-        system = system.copy()
+        if copy:
+            # prevent changing the original system
+            system = system.copy()
         self.check_atom_names(system)
         formula = system.formula
         if formula in self.systems:
             self.systems[formula].append(system)
         else:
-            self.systems[formula] = system.copy()
+            self.systems[formula] = system
+
+    def add_atom_names(self, atom_names: list[str]):
+        """Add atom_names to all systems.
+
+        Parameters
+        ----------
+        atom_names : list of str
+            The atom names that do not exist in this MultiSystems
+        """
+        if not len(atom_names):
+            return
+        self.atom_names.extend(atom_names)
+        # Add this atom_name to each system, and change their names
+        new_systems = {}
+        for each_system in self.systems.values():
+            each_system.add_atom_names(atom_names)
+            each_system.sort_atom_names(type_map=self.atom_names)
+            new_systems[each_system.formula] = each_system
+        self.systems = new_systems
 
     def check_atom_names(self, system: System):
         """Make atom_names in all systems equal, prevent inconsistent atom_types."""
@@ -1533,14 +1776,7 @@ class MultiSystems:
         new_in_self = [e for e in self.atom_names if e not in system["atom_names"]]
         if len(new_in_system):
             # A new atom_name appear, add to self.atom_names
-            self.atom_names.extend(new_in_system)
-            # Add this atom_name to each system, and change their names
-            new_systems = {}
-            for each_system in self.systems.values():
-                each_system.add_atom_names(new_in_system)
-                each_system.sort_atom_names(type_map=self.atom_names)
-                new_systems[each_system.formula] = each_system
-            self.systems = new_systems
+            self.add_atom_names(new_in_system)
         if len(new_in_self):
             # Previous atom_name not in this system
             system.add_atom_names(new_in_self)
@@ -1603,8 +1839,10 @@ class MultiSystems:
         if not isinstance(minimizer, Minimizer):
             minimizer = Minimizer.get_minimizer(minimizer)(*args, **kwargs)
         new_multisystems = dpdata.MultiSystems(type_map=self.atom_names)
-        for ss in self:
-            new_multisystems.append(ss.minimize(*args, minimizer=minimizer, **kwargs))
+        with dpdata.profiling.stage("minimizer", type(minimizer).__name__) as record:
+            record.nframes = self.get_nframes()
+            for data in minimizer.minimize_many(ss.data.copy() for ss in self):
+                new_multisystems.append(LabeledSystem(data=data))
         return new_multisystems
 
     def pick_atom_idx(
@@ -1728,6 +1966,88 @@ class MultiSystems:
             test_system_idx[nn] = select_test[system_idx[ii] : system_idx[ii + 1]]
         return train_systems, test_systems, test_system_idx
 
+    def deduplicate(
+        self, tol: float = 1e-4
+    ) -> tuple[MultiSystems, dict[str, np.ndarray]]:
+        """Remove duplicated frames from all systems.
+
+        See :meth:`System.unique_frames` for how frames are compared.
+        Frames with different formulas are never duplicated.
+
+        Parameters
+        ----------
+        tol : float, default=1e-4
+            The tolerance of coordinates and cells, in Angstrom
+
+        Returns
+        -------
+        MultiSystems
+            The systems without duplicated frames
+        Dict[str, np.ndarray]
+            The indices of the removed frames for each system
+        """
+        unique_systems = MultiSystems(type_map=self.atom_names)
+        removed_idx = {}
+        for nn, ss in self.systems.items():
+            uniq_ss, removed_idx[nn] = ss.unique_frames(tol=tol)
+            unique_systems.append(uniq_ss)
+        return unique_systems, removed_idx
+
+    def select_diverse(
+        self,
+        n: int,
+        descriptor: DescriptorType = "radial",
+        descriptor_file: str | None = None,
+        **kwargs: Any,
+    ) -> tuple[MultiSystems, dict[str, np.ndarray]]:
+        """Select the most diverse frames among all systems by farthest point
+        sampling.
+
+        See :meth:`System.select_diverse` for the parameters. The radial
+        descriptor is resolved by :attr:`atom_names`, so that frames of
+        different systems are comparable.
+
+        Parameters
+        ----------
+        n : int
+            The number of frames to select
+        descriptor : str or callable, default="radial"
+            The per-frame descriptor
+        descriptor_file : str, optional
+            The ``.npy`` file in which the descriptors are stored as a
+            memory map
+        **kwargs : dict
+            Other parameters passed to the descriptor
+
+        Returns
+        -------
+        MultiSystems
+            The systems containing the selected frames
+        Dict[str, np.ndarray]
+            The indices of the selected frames for each system
+        """
+        system_names = list(self.systems.keys())
+        # the descriptors of all systems are written into a single array
+        descriptors = get_descriptors(
+            [self.systems[nn] for nn in system_names],
+            descriptor,
+            ntypes=len(self.atom_names),
+            descriptor_file=descriptor_file,
+            **kwargs,
+        )
+        system_idx = np.cumsum(
+            [0] + [self.systems[nn].get_nframes() for nn in system_names]
+        )
+        selected = farthest_point_sampling(descriptors, n)
+        selected_systems = MultiSystems(type_map=self.atom_names)
+        selected_idx = {}
+        for ii, nn in enumerate(system_names):
+            mask = (selected >= system_idx[ii]) & (selected < system_idx[ii + 1])
+            selected_idx[nn] = selected[mask] - system_idx[ii]
+            if len(selected_idx[nn]):
+                selected_systems.append(self.systems[nn][selected_idx[nn]])
+        return selected_systems, selected_idx
+
 
 def get_cls_name(cls: type[Any]) -> str:
     """Returns the fully qualified name of a class, such as `np.ndarray`.
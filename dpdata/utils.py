@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import bz2
+import gzip
 import io
+import lzma
 import os
 from contextlib import contextmanager
 from typing import TYPE_CHECKING, Generator, Literal, overload
@@ -99,6 +102,61 @@ def sort_atom_names(data, type_map=None):
     return data
 
 
+def encode_species(
+    species, atom_names: list | None = None
+) -> tuple[list, list[int], np.ndarray]:
+    """Encode the species of atoms into atom names, numbers, and types.
+
+    Parameters
+    ----------
+    species : array_like
+        the species of each atom, such as chemical symbols or atomic numbers
+    atom_names : list, optional
+        the atom names, which should contain all the species. By default,
+        the atom names are the unique species in the order of first appearance.
+
+    Returns
+    -------
+    atom_names : list
+        the atom names
+    atom_numbs : list[int]
+        the number of atoms of each name
+    atom_types : np.ndarray
+        the index of the name of each atom
+
+    Raises
+    ------
+    RuntimeError
+        if a species is not in the given atom names
+
+    Examples
+    --------
+    >>> encode_species(["O", "H", "H"])
+    (['O', 'H'], [1, 2], array([0, 1, 1]))
+    """
+    species = np.asarray(species)
+    uniq, first, inverse, counts = np.unique(
+        species, return_index=True, return_inverse=True, return_counts=True
+    )
+    inverse = inverse.reshape(-1)
+    if atom_names is None:
+        order = np.argsort(first, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        atom_names = uniq[order].tolist()
+        atom_numbs = counts[order].tolist()
+        atom_types = rank[inverse]
+    else:
+        name_index = {name: ii for ii, name in enumerate(atom_names)}
+        missing = [name for name in uniq.tolist() if name not in name_index]
+        if missing:
+            raise RuntimeError(f"Species {missing} are not in atom names {atom_names}")
+        lookup = np.array([name_index[name] for name in uniq.tolist()], dtype=int)
+        atom_types = lookup[inverse]
+        atom_numbs = np.bincount(atom_types, minlength=len(atom_names)).tolist()
+    return atom_names, atom_numbs, atom_types.astype(int)
+
+
 def uniq_atom_names(data):
     """Make the atom names uniq. For example
     ['O', 'H', 'O', 'H', 'O'] -> ['O', 'H'].
@@ -109,18 +167,10 @@ def uniq_atom_names(data):
         data dict of `System`, `LabeledSystem`
 
     """
-    unames = []
-    uidxmap = []
-    for idx, ii in enumerate(data["atom_names"]):
-        if ii not in unames:
-            unames.append(ii)
-        uidxmap.append(unames.index(ii))
+    unames, _, uidxmap = encode_species(data["atom_names"])
     data["atom_names"] = unames
-    tmp_type = list(data["atom_types"]).copy()
-    data["atom_types"] = np.array([uidxmap[jj] for jj in tmp_type], dtype=int)
-    data["atom_numbs"] = [
-        sum(ii == data["atom_types"]) for ii in range(len(data["atom_names"]))
-    ]
+    data["atom_types"] = uidxmap[np.asarray(data["atom_types"], dtype=int)]
+    data["atom_numbs"] = np.bincount(data["atom_types"], minlength=len(unames)).tolist()
     return data
 
 
@@ -133,10 +183,108 @@ if TYPE_CHECKING:
     FileType = io.IOBase | str | os.PathLike
 
 
+# file suffixes and magic numbers of the supported compression formats
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".lzma": "xz",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+COMPRESSION_MAGICS = (
+    (b"\x1f\x8b", "gzip"),
+    *((b"BZh%d" % level, "bz2") for level in range(1, 10)),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+
+
+def detect_compression(file: str | os.PathLike, mode: str = "r") -> str | None:
+    """Detect the compression format of a file.
+
+    When a regular file is read, the format is detected by its magic
+    number; otherwise, the format is detected by the file suffix.
+
+    Parameters
+    ----------
+    file : str or os.PathLike
+        the file path
+    mode : str, default="r"
+        the mode to open the file
+
+    Returns
+    -------
+    str or None
+        ``"gzip"``, ``"bz2"``, ``"xz"``, ``"zstd"``, or None if the file
+        is not compressed
+    """
+    if "r" in mode and os.path.isfile(file):
+        with open(file, "rb") as f:
+            head = f.read(6)
+        for magic, compression in COMPRESSION_MAGICS:
+            if head.startswith(magic):
+                return compression
+        return None
+    return COMPRESSION_SUFFIXES.get(os.path.splitext(file)[1].lower())
+
+
+def _open_zstd(file, mode, **kwargs):
+    try:
+        # Python 3.14+
+        from compression import zstd
+    except ImportError:
+        try:
+            import zstandard as zstd
+        except ImportError as e:
+            raise ImportError(
+                "zstandard is required to open zstd compressed files"
+            ) from e
+    return zstd.open(file, mode, **kwargs)
+
+
+def open_path(file: str | os.PathLike, mode: str = "r", **kwargs) -> io.IOBase:
+    """Open a file path, compressed or not.
+
+    gzip, bz2, xz, and zstd (requiring Python 3.14+ or the zstandard
+    package) compressed files are decompressed or compressed on the fly.
+
+    Parameters
+    ----------
+    file : str or os.PathLike
+        the file path
+    mode : str, default="r"
+        the mode to open the file
+    **kwargs : dict
+        other parameters passed to :func:`open`
+
+    Returns
+    -------
+    io.IOBase
+        the file object
+    """
+    compression = detect_compression(file, mode)
+    if compression is None:
+        return open(file, mode, **kwargs)
+    if "b" not in mode and "t" not in mode:
+        mode += "t"
+    if compression == "gzip":
+        return gzip.open(file, mode, **kwargs)
+    elif compression == "bz2":
+        return bz2.open(file, mode, **kwargs)
+    elif compression == "xz":
+        return lzma.open(file, mode, **kwargs)
+    return _open_zstd(file, mode, **kwargs)
+
+
 @contextmanager
 def open_file(file: FileType, *args, **kwargs) -> Generator[io.IOBase, None, None]:
     """A context manager that yields a file object.
 
+    Compressed files are detected by their magic numbers (when read) or
+    suffixes (when written), and decompressed or compressed on the fly.
+    See :func:`open_path` for the supported formats.
+
     Parameters
     ----------
     file : file object or file path
@@ -164,7 +312,7 @@ def open_file(file: FileType, *args, **kwargs) -> Generator[io.IOBase, None, Non
     if isinstance(file, io.IOBase):
         yield file
     elif isinstance(file, (str, os.PathLike)):
-        with open(file, *args, **kwargs) as f:
+        with open_path(file, *args, **kwargs) as f:
             yield f
     else:
         raise ValueError("file must be a file object or a file path.")
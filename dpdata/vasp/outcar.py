@@ -5,6 +5,8 @@ import warnings
 
 import numpy as np
 
+from ..utils import open_file
+
 
 def atom_name_from_potcar_string(instr: str) -> str:
     """Get atom name from a potcar element name.
@@ -138,7 +140,7 @@ def check_outputs(coord, cell, force):
 
 # we assume that the force is printed ...
 def get_frames(fname, begin=0, step=1, ml=False, convergence_check=True):
-    with open(fname) as fp:
+    with open_file(fname) as fp:
         return _get_frames_lower(
             fp,
             fname,
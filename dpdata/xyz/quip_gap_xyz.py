@@ -8,13 +8,14 @@ from collections import OrderedDict
 import numpy as np
 
 from dpdata.periodic_table import Element
+from dpdata.utils import open_path
 
 
 class QuipGapxyzSystems:
     """deal with QuipGapxyzFile."""
 
     def __init__(self, file_name):
-        self.file_object = open(file_name)
+        self.file_object = open_path(file_name)
         self.block_generator = self.get_block_generator()
 
     def __iter__(self):
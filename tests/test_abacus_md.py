@@ -4,8 +4,10 @@ import os
 import unittest
 
 import numpy as np
+from comp_sys import CompLabeledSys, IsPBC
 from context import dpdata
 
+from dpdata.abacus.md import iter_dump_chunks, load_dump
 from dpdata.unit import LengthConversion
 
 bohr2ang = LengthConversion("bohr", "angstrom").value()
@@ -250,5 +252,36 @@ class TestABACUSMD(unittest.TestCase):
                 self.assertEqual(iline, 30)
 
 
+class TestABACUSMDBeginStep(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+        self.system_1 = dpdata.LabeledSystem(
+            "abacus.md.newversion", fmt="abacus/md", begin=1, step=3
+        )
+        self.system_2 = dpdata.LabeledSystem("abacus.md.newversion", fmt="abacus/md")[
+            1::3
+        ]
+
+
+class TestABACUSMDDumpChunks(unittest.TestCase):
+    def test_chunks(self):
+        with open("abacus.md.newversion/OUT.Sn_nve/MD_dump") as fp:
+            data = load_dump(fp, [64])
+        with open("abacus.md.newversion/OUT.Sn_nve/MD_dump") as fp:
+            chunks = list(iter_dump_chunks(fp, [64], chunk_size=4, begin=2))
+        self.assertEqual(data["nframes"], 11)
+        self.assertEqual([len(cc["frame_index"]) for cc in chunks], [4, 4, 1])
+        for kk in ("cells", "coords", "forces", "stresses", "velocities"):
+            np.testing.assert_array_equal(
+                np.concatenate([cc[kk] for cc in chunks]), data[kk][2:]
+            )
+        np.testing.assert_allclose(
+            data["velocities"][0, 0], [0.001244557166, -0.000346684288, 0.000768457739]
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
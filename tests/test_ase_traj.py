@@ -91,5 +91,45 @@ class TestASEtraj4Labeled(unittest.TestCase, CompLabeledSys, IsPBC):
         self.v_places = 4
 
 
+@unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
+class TestASEtrajSkip(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        self.system_1 = dpdata.LabeledSystem(
+            "ase_traj/MoS2.traj", fmt="ase/traj", begin=1, step=1
+        )
+        self.system_2 = dpdata.LabeledSystem("ase_traj/MoS2.traj", fmt="ase/traj")[1:]
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 4
+
+
+@unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
+class TestASEtrajChunks(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        from dpdata.plugins.ase import ASETrajFormat
+
+        chunks = list(
+            ASETrajFormat().iter_chunks(
+                "ase_traj/MoS2.traj", chunk_size=2, labeled=True
+            )
+        )
+        self.assertEqual([len(cc["coords"]) for cc in chunks], [2, 1])
+        self.system_1 = dpdata.LabeledSystem(data=chunks[0])
+        self.system_1.append(dpdata.LabeledSystem(data=chunks[1]))
+        self.system_2 = dpdata.LabeledSystem("ase_traj/MoS2.traj", fmt="ase/traj")
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 4
+
+
+@unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
+class TestASEtrajChangedSymbols(unittest.TestCase):
+    def test_changed_symbols(self):
+        with self.assertRaises(RuntimeError):
+            dpdata.System("ase_traj/HeAlO.traj", fmt="ase/traj")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from comp_sys import CompLabeledSys, CompSys, IsNoPBC, IsPBC, MultiSystems
+from context import dpdata
+
+from dpdata.bin.columnar import BinFile
+
+
+class TestBinLoadDump(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.fname = os.path.join(self.tmpdir.name, "data.bin")
+        self.system_1 = dpdata.LabeledSystem("poscars/OUTCAR.h2o.md", fmt="vasp/outcar")
+        self.system_1.to("dpdata/bin", self.fname)
+        self.system_2 = dpdata.LabeledSystem(self.fname, fmt="dpdata/bin")
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_mmap(self):
+        self.assertIsInstance(self.system_2.data["coords"], np.memmap)
+        # copy-on-write does not modify the file
+        self.system_2.data["coords"][:] = 0.0
+        system = dpdata.LabeledSystem(self.fname, fmt="dpdata/bin")
+        np.testing.assert_array_equal(
+            system.data["coords"], self.system_1.data["coords"]
+        )
+
+    def test_no_mmap(self):
+        system = dpdata.LabeledSystem(self.fname, fmt="dpdata/bin", mmap_mode=None)
+        self.assertNotIsInstance(system.data["coords"], np.memmap)
+        np.testing.assert_array_equal(
+            system.data["coords"], self.system_1.data["coords"]
+        )
+
+
+class TestBinNoLabels(unittest.TestCase, CompSys, IsNoPBC):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        fname = os.path.join(self.tmpdir.name, "data.bin")
+        self.system_1 = dpdata.System("poscars/POSCAR.h2o.md", fmt="vasp/poscar")
+        self.system_1.nopbc = True
+        self.system_1.to("dpdata/bin", fname)
+        self.system_2 = dpdata.System(fname, fmt="dpdata/bin")
+        self.places = 6
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+
+class TestBinMulti(unittest.TestCase, CompLabeledSys, MultiSystems, IsNoPBC):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.fname = os.path.join(self.tmpdir.name, "data.bin")
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+
+        system_1 = dpdata.LabeledSystem(
+            "gaussian/methane.gaussianlog", fmt="gaussian/log"
+        )
+        system_2 = dpdata.LabeledSystem(
+            "gaussian/methane_reordered.gaussianlog", fmt="gaussian/log"
+        )
+        system_3 = dpdata.LabeledSystem(
+            "gaussian/methane_sub.gaussianlog", fmt="gaussian/log"
+        )
+        dpdata.MultiSystems(system_1, system_3).to("dpdata/bin", self.fname)
+        dpdata.MultiSystems(system_2).to("dpdata/bin", self.fname, append=True)
+
+        self.systems = dpdata.MultiSystems().from_file(self.fname, fmt="dpdata/bin")
+        self.system_names = ["C1H4", "C1H3"]
+        self.system_sizes = {"C1H4": 2, "C1H3": 1}
+        self.atom_names = ["C", "H"]
+        self.system_1 = self.systems["C1H3"]
+        self.system_2 = system_3
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_index(self):
+        with BinFile(self.fname) as f:
+            self.assertEqual([entry.name for entry in f], ["C1H4", "C1H3", "C1H4"])
+
+    def test_mmap(self):
+        # systems loaded into MultiSystems are not copied
+        for kk in ("coords", "forces", "energies"):
+            self.assertIsInstance(self.systems["C1H3"].data[kk], np.memmap)
+
+    def test_interrupted_append(self):
+        system = dpdata.LabeledSystem("poscars/OUTCAR.h2o.md", fmt="vasp/outcar")
+        f = BinFile(self.fname, "a")
+        f.dump(system.data, "H2O1")
+        # the arrays are written, but the append fails before the index
+        with mock.patch.object(BinFile, "_write_index", side_effect=OSError):
+            with self.assertRaises(OSError):
+                f.close()
+        f._fp.close()
+        systems = dpdata.MultiSystems().from_file(self.fname, fmt="dpdata/bin")
+        self.assertEqual(systems.get_nframes(), 3)
+        with BinFile(self.fname) as f:
+            self.assertEqual([entry.name for entry in f], ["C1H4", "C1H3", "C1H4"])
+
+    def test_system_name(self):
+        system = dpdata.LabeledSystem(self.fname + "#C1H3", fmt="dpdata/bin")
+        self.assertEqual(system.get_nframes(), 1)
+        with self.assertRaises(RuntimeError):
+            dpdata.LabeledSystem(self.fname, fmt="dpdata/bin")
+
+
+class TestBinCustomData(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.fname = os.path.join(self.tmpdir.name, "data.bin")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_custom_data(self):
+        system = dpdata.System("poscars/POSCAR.h2o.md", fmt="vasp/poscar")
+        fparam = np.arange(system.get_nframes() * 2, dtype=np.float32).reshape(-1, 2)
+        system.data["fparam"] = fparam
+        # empty arrays are also supported
+        system.data["empty"] = np.zeros((0, 3), dtype=np.int32)
+        with BinFile(self.fname, "w") as f:
+            f.dump(system.data, "custom")
+        with BinFile(self.fname) as f:
+            data = f.load(0)
+        np.testing.assert_array_equal(data["fparam"], fparam)
+        self.assertEqual(data["fparam"].dtype, np.float32)
+        self.assertEqual(data["empty"].shape, (0, 3))
+        self.assertEqual(data["atom_names"], system.data["atom_names"])
+
+    def test_not_bin(self):
+        with open(self.fname, "wb") as f:
+            f.write(b"\0" * 64)
+        with self.assertRaises(RuntimeError):
+            BinFile(self.fname)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import os
+import shutil
 import subprocess as sp
 import sys
+import tempfile
 import unittest
 
+import numpy as np
 from context import dpdata
 from poscars.poscar_ref_oh import TestPOSCARoh
 
+from dpdata.cli import convert_batch
+
 
 class TestCli(unittest.TestCase, TestPOSCARoh):
     @classmethod
@@ -38,3 +44,99 @@ class TestClassScript(unittest.TestCase):
             "ascii"
         )
         assert output.splitlines()[0] == f"dpdata v{expected_version}"
+
+
+class TestCliBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        for ii, fn in enumerate(
+            [
+                "poscars/OUTCAR.h2o.md",
+                "poscars/OUTCAR.ch4.ml",
+                "poscars/OUTCAR.h2o.md",
+            ]
+        ):
+            task = os.path.join(self.tmpdir.name, f"task.{ii:03d}")
+            os.makedirs(task)
+            shutil.copy(fn, os.path.join(task, "OUTCAR"))
+        # a broken file
+        task = os.path.join(self.tmpdir.name, "task.003")
+        os.makedirs(task)
+        with open(os.path.join(task, "OUTCAR"), "w") as f:
+            f.write("broken\n")
+        self.ref = dpdata.MultiSystems(
+            dpdata.LabeledSystem("poscars/OUTCAR.h2o.md", fmt="vasp/outcar"),
+            dpdata.LabeledSystem("poscars/OUTCAR.ch4.ml", fmt="vasp/outcar"),
+            dpdata.LabeledSystem("poscars/OUTCAR.h2o.md", fmt="vasp/outcar"),
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_cli(self, out, *args):
+        return sp.run(
+            [
+                sys.executable,
+                "-m",
+                "dpdata",
+                os.path.join(self.tmpdir.name, "task.*", "OUTCAR"),
+                "-ivasp/outcar",
+                "-odeepmd/npy",
+                "-O",
+                out,
+                *args,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+    def test_batch(self):
+        out = os.path.join(self.tmpdir.name, "data")
+        output = self.run_cli(out, "-j", "2")
+        self.assertIn("1 of 4 files failed", output.stderr)
+        self.assertIn("task.003", output.stderr)
+        ms = dpdata.MultiSystems(type_map=self.ref.atom_names).from_deepmd_npy(out)
+        self.assertEqual(ms.get_nframes(), self.ref.get_nframes())
+        self.assertEqual(ms.atom_names, self.ref.atom_names)
+        for formula, ss in self.ref.systems.items():
+            np.testing.assert_allclose(ms[formula]["coords"], ss["coords"])
+            np.testing.assert_allclose(ms[formula]["energies"], ss["energies"])
+
+    def test_deterministic(self):
+        out_1 = os.path.join(self.tmpdir.name, "data1")
+        out_2 = os.path.join(self.tmpdir.name, "data2")
+        self.run_cli(out_1, "-j", "1")
+        self.run_cli(out_2, "-j", "3")
+        files_1 = sorted(
+            os.path.relpath(os.path.join(root, ff), out_1)
+            for root, _, files in os.walk(out_1)
+            for ff in files
+        )
+        self.assertTrue(files_1)
+        for ff in files_1:
+            with open(os.path.join(out_1, ff), "rb") as f1, open(
+                os.path.join(out_2, ff), "rb"
+            ) as f2:
+                self.assertEqual(f1.read(), f2.read(), ff)
+
+    def test_file_list(self):
+        file_list = os.path.join(self.tmpdir.name, "files.txt")
+        with open(file_list, "w") as f:
+            f.write("# comment\n")
+            f.write(os.path.join(self.tmpdir.name, "task.001", "OUTCAR") + "\n\n")
+        ms = convert_batch(
+            from_files=[],
+            file_list=file_list,
+            from_format="vasp/outcar",
+            jobs=1,
+        )
+        self.assertEqual(ms.get_nframes(), 4)
+
+    def test_all_failed(self):
+        with self.assertRaises(RuntimeError):
+            convert_batch(
+                from_files=[os.path.join(self.tmpdir.name, "task.003", "OUTCAR")],
+                from_format="vasp/outcar",
+                jobs=1,
+            )
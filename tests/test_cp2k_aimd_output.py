@@ -1,8 +1,12 @@
 # %%
 from __future__ import annotations
 
+import re
+import shutil
+import tempfile
 import unittest
 
+import numpy as np
 from comp_sys import CompLabeledSys
 from context import dpdata
 
@@ -30,6 +34,41 @@ class TestCp2kAimdStressOutput(unittest.TestCase, CompLabeledSys):
         self.v_places = 4
 
 
+class TestCp2kAimdBeginStep(unittest.TestCase, CompLabeledSys):
+    def setUp(self):
+        # build a trajectory consistent with all MD steps in the log
+        self.tmpdir = tempfile.mkdtemp()
+        shutil.copy("cp2k/aimd_stress/cp2k.log", self.tmpdir)
+        with open("cp2k/aimd_stress/cp2k.log") as fp:
+            energies = re.findall(r"POTENTIAL ENERGY\[hartree\]\s+=\s+(\S+)", fp.read())
+        with open("cp2k/aimd_stress/DPGEN-pos-1.xyz") as fp:
+            lines = fp.readlines()
+        with open(f"{self.tmpdir}/DPGEN-pos-1.xyz", "w") as fp:
+            for ii, ee in enumerate(energies):
+                fp.write(lines[0])
+                fp.write(f" i = {ii:8d}, time = 0.000, E = {float(ee):.11f}\n")
+                for line in lines[2:]:
+                    ss = line.split()
+                    coord = np.array(ss[1:], dtype=float) + 0.01 * ii
+                    fp.write(
+                        f"  {ss[0]} {coord[0]:.5f} {coord[1]:.5f} {coord[2]:.5f}\n"
+                    )
+        self.system_1 = dpdata.LabeledSystem(
+            self.tmpdir, fmt="cp2k/aimd_output", begin=1, step=2
+        )
+        self.system_2 = dpdata.LabeledSystem(self.tmpdir, fmt="cp2k/aimd_output")[1::2]
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 4
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_nframes(self):
+        self.assertEqual(self.system_1.get_nframes(), 3)
+
+
 # class TestCp2kAimdRestartOutput(unittest.TestCase, CompLabeledSys):
 #    def setUp(self):
 #        self.system_1 = dpdata.LabeledSystem('cp2k/restart_aimd',fmt='cp2k/aimd_output', restart=True)
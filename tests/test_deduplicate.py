@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+from comp_sys import CompLabeledSys, IsPBC
+from context import dpdata
+
+
+def _make_system():
+    rng = np.random.default_rng(42)
+    cell = np.diag([5.0, 6.0, 7.0])
+    coords = rng.random((3, 4, 3)) @ cell
+    # frame 1: frame 0 with permuted H atoms and shifted by a cell vector
+    coords[1] = coords[0][[0, 2, 1, 3]]
+    coords[1, 1] += cell[1]
+    # frame 3: frame 2 with the two O atoms swapped
+    coords = np.concatenate((coords, coords[2:3][:, [3, 1, 2, 0]]), axis=0)
+    nframes = coords.shape[0]
+    return dpdata.LabeledSystem(
+        data={
+            "atom_names": ["O", "H"],
+            "atom_numbs": [2, 2],
+            "atom_types": np.array([0, 1, 1, 0]),
+            "coords": coords,
+            "cells": np.tile(cell, (nframes, 1, 1)),
+            "orig": np.zeros(3),
+            "energies": np.arange(nframes, dtype=float),
+            "forces": rng.random((nframes, 4, 3)),
+        }
+    )
+
+
+class TestUniqueFrames(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+        system = _make_system()
+        self.system_1, self.removed_idx = system.unique_frames()
+        self.system_2 = system[[0, 2]]
+
+    def test_removed_idx(self):
+        np.testing.assert_array_equal(self.removed_idx, [1, 3])
+
+    def test_tol(self):
+        system = _make_system()
+        system.data["coords"][1, 0] += 1e-3
+        _, removed_idx = system.unique_frames(tol=1e-4)
+        np.testing.assert_array_equal(removed_idx, [3])
+        _, removed_idx = system.unique_frames(tol=1e-1)
+        np.testing.assert_array_equal(removed_idx, [1, 3])
+
+
+class TestUniqueFramesNoPBC(unittest.TestCase):
+    def test_nopbc(self):
+        system = _make_system()
+        system.nopbc = True
+        _, removed_idx = system.unique_frames()
+        # the shifted frame is no longer a duplicate
+        np.testing.assert_array_equal(removed_idx, [3])
+
+
+class TestDeduplicate(unittest.TestCase):
+    def setUp(self):
+        system = _make_system()
+        other = dpdata.LabeledSystem("gaussian/methane.gaussianlog", fmt="gaussian/log")
+        self.ms = dpdata.MultiSystems(system, other, other)
+        self.unique_ms, self.removed_idx = self.ms.deduplicate()
+
+    def test_nframes(self):
+        self.assertEqual(self.unique_ms.get_nframes(), 3)
+        self.assertEqual(self.unique_ms.atom_names, self.ms.atom_names)
+
+    def test_removed_idx(self):
+        np.testing.assert_array_equal(self.removed_idx["O2H2C0"], [1, 3])
+        np.testing.assert_array_equal(self.removed_idx["O0H4C1"], [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
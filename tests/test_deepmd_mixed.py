@@ -597,3 +597,81 @@ class TestMixedSystemWithFparamAparam(
                     self.systems[formula].data["aparam"],
                     decimal=self.places,
                 )
+
+
+class TestMixedInterleavedTypes(unittest.TestCase):
+    def setUp(self):
+        system = dpdata.LabeledSystem(
+            "gaussian/methane.gaussianlog", fmt="gaussian/log"
+        )
+        system = system.sub_system([0, 0, 0, 0, 0])
+        system.data["energies"] = np.arange(5, dtype=float)
+        system.convert_to_mixed_type(type_map=["C", "H"])
+        # frames 0, 2, 3 are C1H4; frames 1, 4 are C2H3
+        system.data["real_atom_types"][[1, 4], 1] = 0
+        system.to("deepmd/npy/mixed", "tmp.deepmd.mixed.interleaved")
+
+    def tearDown(self):
+        if os.path.exists("tmp.deepmd.mixed.interleaved"):
+            shutil.rmtree("tmp.deepmd.mixed.interleaved")
+
+    def test_split(self):
+        data_list = dpdata.deepmd.mixed.to_system_data(
+            "tmp.deepmd.mixed.interleaved", labels=True
+        )
+        self.assertEqual(len(data_list), 2)
+        self.assertEqual(data_list[0]["atom_numbs"], [1, 4])
+        np.testing.assert_array_equal(data_list[0]["energies"], [0.0, 2.0, 3.0])
+        self.assertEqual(data_list[1]["atom_numbs"], [2, 3])
+        np.testing.assert_array_equal(data_list[1]["energies"], [1.0, 4.0])
+        np.testing.assert_array_equal(data_list[1]["atom_types"], [0, 0, 1, 1, 1])
+
+
+class TestMixSystem(unittest.TestCase):
+    def setUp(self):
+        # C1H4
+        self.system_1 = dpdata.LabeledSystem(
+            "gaussian/methane.gaussianlog", fmt="gaussian/log"
+        )
+        # C1H3
+        self.system_2 = dpdata.LabeledSystem(
+            "gaussian/methane_sub.gaussianlog", fmt="gaussian/log"
+        )
+        tmp_data = self.system_1.data.copy()
+        tmp_data["atom_numbs"] = [2, 3]
+        tmp_data["atom_names"] = ["H", "C"]
+        tmp_data["atom_types"] = np.array([1, 1, 0, 0, 0])
+        # C2H3
+        self.system_3 = dpdata.LabeledSystem(data=tmp_data)
+        self.mixed_systems = dpdata.deepmd.mixed.mix_system(
+            self.system_1,
+            self.system_2,
+            self.system_3,
+            type_map=["C", "H", "O"],
+        )
+
+    def test_keys(self):
+        self.assertEqual(list(self.mixed_systems.keys()), ["5", "4"])
+
+    def test_real_atom_types(self):
+        mixed = self.mixed_systems["5"]
+        self.assertEqual(mixed.get_nframes(), 2)
+        self.assertEqual(mixed.data["real_atom_names"], ["C", "H", "O"])
+        np.testing.assert_array_equal(
+            mixed.data["real_atom_types"], [[0, 1, 1, 1, 1], [0, 0, 1, 1, 1]]
+        )
+
+    def test_labels(self):
+        mixed = self.mixed_systems["5"]
+        np.testing.assert_array_equal(
+            mixed.data["coords"],
+            np.concatenate((self.system_1["coords"], self.system_3["coords"])),
+        )
+        np.testing.assert_array_equal(
+            mixed.data["energies"],
+            np.concatenate((self.system_1["energies"], self.system_3["energies"])),
+        )
+
+    def test_original_unchanged(self):
+        self.assertEqual(self.system_1.data["atom_names"], ["C", "H"])
+        self.assertNotIn("real_atom_types", self.system_1.data)
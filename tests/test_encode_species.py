@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+from context import dpdata  # noqa: F401
+
+from dpdata.utils import encode_species
+
+
+class TestEncodeSpecies(unittest.TestCase):
+    def test_first_appearance(self):
+        atom_names, atom_numbs, atom_types = encode_species(
+            ["O", "H", "H", "C", "O", "H"]
+        )
+        self.assertEqual(atom_names, ["O", "H", "C"])
+        self.assertEqual(atom_numbs, [2, 3, 1])
+        np.testing.assert_array_equal(atom_types, [0, 1, 1, 2, 0, 1])
+
+    def test_atomic_numbers(self):
+        atom_names, atom_numbs, atom_types = encode_species(np.array([8, 1, 1]))
+        self.assertEqual(atom_names, [8, 1])
+        self.assertEqual(atom_numbs, [1, 2])
+        np.testing.assert_array_equal(atom_types, [0, 1, 1])
+
+    def test_atom_names(self):
+        atom_names, atom_numbs, atom_types = encode_species(
+            ["O", "H", "H"], atom_names=["C", "H", "O"]
+        )
+        self.assertEqual(atom_names, ["C", "H", "O"])
+        self.assertEqual(atom_numbs, [0, 2, 1])
+        np.testing.assert_array_equal(atom_types, [2, 1, 1])
+
+    def test_missing_name(self):
+        with self.assertRaises(RuntimeError):
+            encode_species(["O", "H"], atom_names=["O"])
+
+    def test_empty(self):
+        atom_names, atom_numbs, atom_types = encode_species([])
+        self.assertEqual(atom_names, [])
+        self.assertEqual(atom_numbs, [])
+        self.assertEqual(atom_types.shape, (0,))
+
+
+if __name__ == "__main__":
+    unittest.main()
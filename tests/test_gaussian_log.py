@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import io
 import unittest
 
 import numpy as np
 from context import dpdata
 
+from dpdata.gaussian.log import _iter_blocks, iter_frames
+
 
 class TestGaussianLog:
     def test_atom_names(self):
@@ -115,5 +118,50 @@ class TestGaussianNoInputOrientation(unittest.TestCase):
             )
 
 
+class TestGaussianLoadMDBeginStep(unittest.TestCase, TestGaussianLog):
+    def setUp(self):
+        self.system = dpdata.LabeledSystem(
+            "gaussian/aimd_gaussian_CH4_output", fmt="gaussian/md", begin=3, step=5
+        )
+        self.atom_names = ["C", "H"]
+        self.atom_numbs = [1, 4]
+        self.nframes = 4
+        self.atom_types = [1, 1, 1, 1, 0]
+
+    def test_frames(self):
+        system = dpdata.LabeledSystem(
+            "gaussian/aimd_gaussian_CH4_output", fmt="gaussian/md"
+        )
+        for key in ("coords", "energies", "forces", "cells"):
+            np.testing.assert_array_equal(self.system.data[key], system.data[key][3::5])
+
+
+class TestGaussianIterFrames(unittest.TestCase):
+    def test_chunk_size(self):
+        with open("gaussian/aimd_gaussian_CH4_output") as f:
+            text = f.read()
+        ref = list(_iter_blocks(io.StringIO(text)))
+        self.assertEqual(sum(kind == "forces" for kind, _ in ref), 22)
+        # the blocks split across chunks
+        for chunk_size in (1, 17, 1000):
+            self.assertEqual(
+                list(_iter_blocks(io.StringIO(text), chunk_size=chunk_size)), ref
+            )
+
+    def test_iter_frames(self):
+        system = dpdata.LabeledSystem(
+            "gaussian/aimd_gaussian_CH4_output", fmt="gaussian/md"
+        )
+        with open("gaussian/aimd_gaussian_CH4_output") as f:
+            frames = iter_frames(f, begin=20)
+            frame = next(frames)
+            np.testing.assert_array_equal(frame["coords"], system["coords"][20])
+            np.testing.assert_array_equal(frame["forces"], system["forces"][20])
+            self.assertEqual(frame["energies"], system["energies"][20])
+            self.assertEqual(frame["atom_symbols"], ["H", "H", "H", "H", "C"])
+            self.assertIsNone(frame["cells"])
+            self.assertEqual(len(list(frames)), 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import os
+import tempfile
 import unittest
 
-from comp_sys import CompLabeledSys, IsPBC
+import numpy as np
+from comp_sys import CompLabeledSys, CompSys, IsPBC
 from context import dpdata
 
 
@@ -26,5 +29,63 @@ class TestAsDict(unittest.TestCase, CompLabeledSys, IsPBC):
         self.v_places = 4
 
 
+class TestBinaryDumpLoad(unittest.TestCase, CompLabeledSys, IsPBC):
+    ext = ".npz"
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        fname = os.path.join(self.tmpdir.name, "system" + self.ext)
+        self.system_1 = dpdata.LabeledSystem("poscars/OUTCAR.h2o.md", fmt="vasp/outcar")
+        self.system_1.dump(fname)
+        self.system_2 = dpdata.System.load(fname)
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_class(self):
+        self.assertIs(type(self.system_2), dpdata.LabeledSystem)
+
+
+class TestBinaryDumpLoadBin(TestBinaryDumpLoad):
+    ext = ".bin"
+
+    def test_mmap(self):
+        self.assertIsInstance(self.system_2.data["coords"], np.memmap)
+
+    def test_multi_systems(self):
+        fname = os.path.join(self.tmpdir.name, "multi.bin")
+        dpdata.MultiSystems(self.system_1, self.system_1.pick_atom_idx([0, 1])).to(
+            "dpdata/bin", fname
+        )
+        with self.assertRaisesRegex(RuntimeError, "MultiSystems"):
+            dpdata.System.load(fname)
+
+    def test_not_dumped(self):
+        fname = os.path.join(self.tmpdir.name, "format.bin")
+        self.system_1.to("dpdata/bin", fname)
+        with self.assertRaisesRegex(RuntimeError, "dpdata/bin"):
+            dpdata.System.load(fname)
+
+
+class TestBinaryDumpLoadNoLabels(unittest.TestCase, CompSys, IsPBC):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        fname = os.path.join(self.tmpdir.name, "system.npz")
+        self.system_1 = dpdata.System("poscars/POSCAR.h2o.md", fmt="vasp/poscar")
+        self.system_1.dump(fname)
+        self.system_2 = dpdata.LabeledSystem.load(fname)
+        self.places = 6
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_class(self):
+        self.assertIs(type(self.system_2), dpdata.System)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import io
 import os
 import unittest
 
 import numpy as np
+from comp_sys import CompSys, IsPBC
 from context import dpdata
 from poscars.poscar_ref_oh import TestPOSCARoh
 
+from dpdata.lammps.dump import dump_frames
 from dpdata.lammps.lmp import rotate_to_lower_triangle
 
 
@@ -40,6 +43,48 @@ class TestDumpToFunc(unittest.TestCase, TestPOSCARoh):
         self.system.from_fmt("tmp.dump", fmt="lammps/dump", type_map=["O", "H"])
 
 
+class TestDumpMultiFrames(unittest.TestCase, CompSys, IsPBC):
+    def setUp(self):
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+        self.system_1 = dpdata.System(
+            os.path.join("poscars", "conf.5.dump"), type_map=["O", "H"]
+        )
+        self.system_1.to("lammps/dump", "tmp.multi.dump", frame_idx=None)
+        self.system_2 = dpdata.System(
+            "tmp.multi.dump", fmt="lammps/dump", type_map=["O", "H"]
+        )
+
+    def tearDown(self):
+        if os.path.isfile("tmp.multi.dump"):
+            os.remove("tmp.multi.dump")
+
+    def test_timestep(self):
+        with open("tmp.multi.dump") as f:
+            lines = f.read().split("\n")
+        timesteps = [lines[ii + 1] for ii, ll in enumerate(lines) if "TIMESTEP" in ll]
+        self.assertEqual(timesteps, ["0", "1", "2", "3", "4"])
+
+
+class TestDumpForces(unittest.TestCase):
+    def test_forces(self):
+        system = dpdata.LabeledSystem(
+            os.path.join("poscars", "OUTCAR.h2o.md"), fmt="vasp/outcar"
+        )
+        buffer = io.StringIO()
+        dump_frames(
+            buffer, system.data, frame_idx=[1, 2], timestep=[10, 20], write_forces=True
+        )
+        lines = buffer.getvalue().split("\n")
+        self.assertEqual(lines[1], "10")
+        self.assertEqual(lines[8], "ITEM: ATOMS id type x y z fx fy fz")
+        values = np.array(lines[9].split(), dtype=float)
+        np.testing.assert_allclose(values[2:5], system["coords"][1][0], atol=1e-10)
+        np.testing.assert_allclose(values[5:8], system["forces"][1][0], atol=1e-10)
+
+
 class TestLmpRotateTriAngle(unittest.TestCase):
     def test_simple_cubic(self):
         cubic_cell = np.diag([5, 5, 5])
@@ -236,5 +236,41 @@ class TestLongFilename(unittest.TestCase):
             ms.to_deepmd_npy(tmpdir)
 
 
+class TestMultiSystemsIndex(unittest.TestCase):
+    def setUp(self):
+        self.systems = [
+            dpdata.System(
+                data={
+                    "atom_names": [name],
+                    "atom_numbs": [1],
+                    "atom_types": np.zeros(1, dtype=int),
+                    "coords": np.zeros((1, 1, 3)),
+                    "orig": np.zeros(3),
+                    "cells": np.eye(3)[None],
+                }
+            )
+            for name in ["A", "B", "C"]
+        ]
+
+    def test_append_new_names(self):
+        ms = dpdata.MultiSystems(self.systems[0])
+        ms.append(*self.systems[1:])
+        self.assertEqual(ms.atom_names, ["A", "B", "C"])
+        self.assertEqual(list(ms.systems.keys()), ["A1B0C0", "A0B1C0", "A0B0C1"])
+        for ii, ss in enumerate(ms.systems.values()):
+            self.assertIs(ms[ii], ss)
+            self.assertEqual(ss["atom_names"], ["A", "B", "C"])
+            np.testing.assert_array_equal(ss["atom_types"], [ii])
+
+    def test_index_after_modification(self):
+        ms = dpdata.MultiSystems(*self.systems)
+        self.assertEqual(ms[0].formula, "A1B0C0")
+        ss = ms.systems.pop("A1B0C0")
+        ms.systems[ss.formula] = ss
+        self.assertEqual(ms[0].formula, "A0B1C0")
+        self.assertEqual(ms[-1].formula, "A1B0C0")
+        self.assertEqual(len(list(ms)), 3)
+
+
 if __name__ == "__main__":
     unittest.main()
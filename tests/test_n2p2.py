@@ -69,6 +69,24 @@ class TestN2P2(unittest.TestCase):
 
         self.assertListEqual(file1_lines, file2_lines)
 
+    def test_n2p2_from_labeled_system_reordered(self):
+        with open("n2p2/input.data") as f:
+            lines = f.read().splitlines()
+        # reorder atoms in the second frame: H, O, H
+        lines[14], lines[15] = lines[15], lines[14]
+        with open("n2p2/reordered.data", "w") as f:
+            f.write("\n".join(lines))
+        data = dpdata.LabeledSystem("n2p2/reordered.data", fmt="n2p2")
+        self.assertEqual(data["atom_names"], self.data_ref["atom_names"])
+        np.testing.assert_array_equal(data["atom_types"], self.data_ref["atom_types"])
+        np.testing.assert_array_almost_equal(
+            data["coords"], self.data_ref["coords"], decimal=5
+        )
+        np.testing.assert_array_almost_equal(
+            data["forces"], self.data_ref["forces"], decimal=5
+        )
+
     def tearDown(self):
-        if os.path.isfile("n2p2/output.data"):
-            os.remove("n2p2/output.data")
+        for fn in ("n2p2/output.data", "n2p2/reordered.data"):
+            if os.path.isfile(fn):
+                os.remove(fn)
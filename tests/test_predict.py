@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+import time
 import unittest
 
 import numpy as np
@@ -36,6 +38,26 @@ class OneDriver(dpdata.driver.Driver):
         return data
 
 
+@dpdata.driver.Driver.register("harmonic")
+class HarmonicDriver(dpdata.driver.Driver):
+    def label(self, data):
+        coords = data["coords"]
+        data["energies"] = 0.5 * np.sum(np.square(coords), axis=(1, 2))
+        data["forces"] = -coords
+        data["virials"] = np.zeros((coords.shape[0], 3, 3))
+        return data
+
+
+@dpdata.driver.Driver.register("hang_far")
+class HangFarDriver(dpdata.driver.Driver):
+    """Hang on frames with an atom far from the origin."""
+
+    def label(self, data):
+        if np.any(np.abs(data["coords"]) > 50.0):
+            time.sleep(60)
+        return HarmonicDriver().label(data)
+
+
 class TestPredict(unittest.TestCase, CompLabeledSys):
     def setUp(self):
         ori_sys = dpdata.LabeledSystem(
@@ -83,6 +105,40 @@ class TestHybridDriver(unittest.TestCase, CompLabeledSys):
         self.v_places = 6
 
 
+class TestHybridDriverConcurrent(unittest.TestCase, CompLabeledSys):
+    """Test HybridDriver with drivers evaluated concurrently."""
+
+    def setUp(self):
+        ori_sys = dpdata.LabeledSystem(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        barrier = threading.Barrier(2, timeout=10)
+
+        class BarrierDriver(OneDriver):
+            def label(self, data):
+                # passes only if both drivers run at the same time
+                barrier.wait()
+                return super().label(data)
+
+        self.driver = dpdata.driver.HybridDriver(
+            [BarrierDriver(), BarrierDriver()], max_workers=2
+        )
+        self.system_1 = ori_sys.predict(driver=self.driver)
+        self.system_2 = dpdata.LabeledSystem(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        for pp in ("energies", "forces", "virials"):
+            self.system_2.data[pp][:] = 2.0
+
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+
+    def test_timings(self):
+        self.assertEqual(len(self.driver.timings), 2)
+
+
 @unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
 class TestASEDriver(unittest.TestCase, CompLabeledSys, IsPBC):
     def setUp(self):
@@ -98,6 +154,72 @@ class TestASEDriver(unittest.TestCase, CompLabeledSys, IsPBC):
         self.v_places = 4
 
 
+@unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
+class TestDPDataCalculator(unittest.TestCase):
+    def setUp(self):
+        self.system = dpdata.System(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        self.labeled = self.system.predict(driver="harmonic")
+        self.ncalls = 0
+        driver = HarmonicDriver()
+        label = driver.label
+
+        def counted_label(data):
+            self.ncalls += 1
+            return label(data)
+
+        driver.label = counted_label
+        self.calculator = driver.ase_calculator
+        self.images = self.system.to_ase_structure()
+
+    def test_calculate(self):
+        for ii, atoms in enumerate(self.images):
+            atoms.calc = self.calculator
+            self.assertAlmostEqual(
+                atoms.get_potential_energy(), self.labeled["energies"][ii]
+            )
+            np.testing.assert_allclose(atoms.get_forces(), self.labeled["forces"][ii])
+            atoms.get_stress()
+        # energy, forces and stress of each image are computed at once
+        self.assertEqual(self.ncalls, len(self.images))
+
+    def test_calculate_batch(self):
+        results = self.calculator.calculate_batch(self.images)
+        self.assertEqual(self.ncalls, 1)
+        for ii, atoms in enumerate(self.images):
+            self.assertAlmostEqual(results[ii]["energy"], self.labeled["energies"][ii])
+            atoms.calc = self.calculator
+            np.testing.assert_allclose(atoms.get_forces(), self.labeled["forces"][ii])
+        # the batch results are reused
+        self.assertEqual(self.ncalls, 1)
+        # and dropped once used
+        self.assertEqual(self.calculator._batch_results, {})
+
+    def test_reset(self):
+        self.calculator.calculate_batch(self.images)
+        self.calculator.reset()
+        self.assertEqual(self.calculator._batch_results, {})
+
+    def test_neb(self):
+        from dpdata.ase_calculator import DPDataNEB
+
+        for atoms in self.images:
+            atoms.calc = self.calculator
+        neb = DPDataNEB(
+            self.images, allow_shared_calculator=True, method="improvedtangent"
+        )
+        forces = neb.get_forces()
+        # all images are labeled in a single call
+        self.assertEqual(self.ncalls, 1)
+        np.testing.assert_allclose(
+            neb.energies, self.labeled["energies"][: len(self.images)]
+        )
+        self.assertEqual(
+            forces.shape, ((len(self.images) - 2) * self.system.get_natoms(), 3)
+        )
+
+
 @unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
 class TestMinimize(unittest.TestCase, CompLabeledSys, IsPBC):
     def setUp(self):
@@ -115,6 +237,93 @@ class TestMinimize(unittest.TestCase, CompLabeledSys, IsPBC):
         self.v_places = 4
 
 
+@unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
+class TestMinimizeParallel(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        ori_sys = dpdata.LabeledSystem(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        self.system_1 = ori_sys.minimize(
+            driver=HarmonicDriver(), minimizer="ase", max_steps=3
+        )
+        # each worker initializes its own driver
+        self.system_2 = ori_sys.minimize(
+            driver={"type": "harmonic"}, minimizer="ase", max_steps=3, nproc=2
+        )
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 4
+
+
+@unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
+class TestMinimizeTimeout(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        ori_sys = dpdata.LabeledSystem(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        self.system_1 = ori_sys.minimize(
+            driver=HarmonicDriver(), minimizer="ase", max_steps=0
+        )
+        self.system_2 = ori_sys.minimize(
+            driver=HarmonicDriver(), minimizer="ase", max_steps=100, timeout=0.0
+        )
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 4
+
+
+@unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
+class TestMinimizeHardTimeout(unittest.TestCase):
+    def test_hard_timeout(self):
+        ori_sys = dpdata.LabeledSystem(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        # the first atom of the second frame is moved away to hang the calculator
+        coords = ori_sys.data["coords"].copy()
+        coords[1, 0] += 100.0
+        ori_sys.data["coords"] = coords
+        minimizer = dpdata.driver.Minimizer.get_minimizer("ase")(
+            driver={"type": "hang_far"}, max_steps=3, nproc=2, hard_timeout=2.0
+        )
+        start = time.perf_counter()
+        with self.assertWarns(UserWarning):
+            minimized = ori_sys.minimize(minimizer=minimizer)
+        self.assertLess(time.perf_counter() - start, 30)
+        self.assertEqual(minimizer.timed_out_frames, [1])
+        # the other frames are still minimized
+        expected = ori_sys.sub_system([0, 2]).minimize(
+            driver=HarmonicDriver(), minimizer="ase", max_steps=3
+        )
+        self.assertEqual(minimized.get_nframes(), ori_sys.get_nframes() - 1)
+        np.testing.assert_allclose(minimized["coords"], expected["coords"])
+
+
+@unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
+class TestMinimizeMultiSystemsParallel(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        ori_sys = dpdata.LabeledSystem(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        multi_sys = dpdata.MultiSystems(ori_sys, ori_sys.pick_atom_idx([0, 1, 2]))
+        self.ms_1 = multi_sys.minimize(
+            driver=HarmonicDriver(), minimizer="ase", max_steps=3
+        )
+        self.ms_2 = multi_sys.minimize(
+            driver=HarmonicDriver(), minimizer="ase", max_steps=3, nproc=2
+        )
+        self.system_1 = self.ms_1[ori_sys.formula]
+        self.system_2 = self.ms_2[ori_sys.formula]
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 4
+
+    def test_nframes(self):
+        self.assertEqual(self.ms_1.get_nframes(), self.ms_2.get_nframes())
+
+
 @unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
 class TestMinimizeMultiSystems(unittest.TestCase, CompLabeledSys, IsPBC):
     def setUp(self):
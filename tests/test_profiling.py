@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from context import dpdata
+
+from dpdata.profiling import profile, stage
+
+
+class TestProfile(unittest.TestCase):
+    def test_disabled(self):
+        with stage("read", "foo") as record:
+            record.nframes = 1
+        self.assertIsNone(record.nframes)
+        with profile() as prof:
+            pass
+        # the records are only kept inside the context
+        dpdata.System("poscars/POSCAR.h2o.md", fmt="vasp/poscar")
+        self.assertEqual(prof.records, [])
+
+    def test_read_write(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            trace = os.path.join(tmpdir, "trace.json")
+            with profile(trace=trace) as prof:
+                system = dpdata.LabeledSystem(
+                    "poscars/OUTCAR.h2o.md", fmt="vasp/outcar"
+                )
+                system.to("deepmd/npy", os.path.join(tmpdir, "data"))
+                dpdata.MultiSystems(system, system)
+            report = {(ss["category"], ss["name"]): ss for ss in prof.report()}
+            read = report[("read", "VASPOutcarFormat")]
+            self.assertEqual(read["calls"], 1)
+            self.assertEqual(read["nframes"], len(system))
+            self.assertEqual(read["nbytes"], os.path.getsize("poscars/OUTCAR.h2o.md"))
+            self.assertIn(("check", "check_data"), report)
+            self.assertIn(("post_func", "rot_lower_triangular"), report)
+            write = report[("write", "DeePMDCompFormat")]
+            self.assertEqual(write["nframes"], len(system))
+            self.assertGreater(write["nbytes"], 0)
+            append = report[("append", "MultiSystems.append")]
+            self.assertEqual(append["nframes"], 2 * len(system))
+            self.assertIn("VASPOutcarFormat", prof.summary())
+            with open(trace) as f:
+                events = json.load(f)["traceEvents"]
+            self.assertEqual(len(events), len(prof.records))
+            self.assertTrue(all(ee["ph"] == "X" for ee in events))
+
+    def test_nested(self):
+        with profile() as outer:
+            with profile() as inner:
+                dpdata.System("poscars/POSCAR.h2o.md", fmt="vasp/poscar")
+            dpdata.System("poscars/POSCAR.h2o.md", fmt="vasp/poscar")
+        self.assertEqual(sum(rr.category == "read" for rr in inner.records), 1)
+        self.assertEqual(sum(rr.category == "read" for rr in outer.records), 1)
+
+
+class TestProfileEnv(unittest.TestCase):
+    def test_env(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            trace = os.path.join(tmpdir, "trace.json")
+            env = os.environ.copy()
+            env["DPDATA_PROFILE"] = trace
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    "import dpdata; dpdata.System('poscars/POSCAR.h2o.md', fmt='vasp/poscar')",
+                ],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            self.assertIn("VASPPoscarFormat", output.stderr)
+            self.assertTrue(os.path.isfile(trace))
+
+
+if __name__ == "__main__":
+    unittest.main()
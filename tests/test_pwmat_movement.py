@@ -128,5 +128,16 @@ class TestpwmatLabeledOutput1(unittest.TestCase, TestpwmatSinglePointEnergy1):
         self.system = dpdata.LabeledSystem("pwmat/MOVEMENT_1", fmt="pwmat/movement")
 
 
+class TestpwmatMovementBeginStep(unittest.TestCase):
+    def test_begin_step(self):
+        system = dpdata.LabeledSystem("pwmat/MOVEMENT", fmt="pwmat/movement")
+        sub_system = dpdata.LabeledSystem(
+            "pwmat/MOVEMENT", fmt="pwmat/movement", begin=3, step=7
+        )
+        self.assertEqual(sub_system.get_nframes(), len(range(3, len(system), 7)))
+        for key in ("cells", "coords", "energies", "forces"):
+            np.testing.assert_array_equal(sub_system[key], system[key][3::7])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import os
+import tempfile
 import unittest
+from unittest import mock
 
 import numpy as np
 from comp_sys import CompLabeledSys, CompSys, IsPBC
@@ -75,3 +77,63 @@ class TestPWSCFLabeledTrajSkip(unittest.TestCase, CompLabeledSys, IsPBC):
                 self.assertEqual(
                     self.system_1.data["cells"][-1][ii][jj], ref_cell[ii][jj]
                 )
+
+
+class TestPWSCFLabeledTrajMemoryMap(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        self.system_1 = dpdata.LabeledSystem(
+            os.path.join("qe.traj", "traj6"),
+            fmt="qe/cp/traj",
+            begin=1,
+            step=2,
+            memory_map=True,
+        )
+        self.system_2 = dpdata.LabeledSystem(
+            os.path.join("qe.traj", "traj6"), fmt="qe/cp/traj", begin=1, step=2
+        )
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 4
+
+
+class TestCPTrajBlocks(unittest.TestCase):
+    def test_random_access(self):
+        fname = os.path.join("qe.traj", "traj6.pos")
+        natoms = 2
+        with dpdata.qe.traj.CPTrajBlocks(fname, natoms, memory_map=True) as blocks:
+            self.assertEqual(len(blocks), 6)
+            coords = blocks.get_blocks([4, 1])
+            steps = blocks.get_steps([4, 1])
+        ref_coords, ref_steps = dpdata.qe.traj.load_data(fname, natoms)
+        np.testing.assert_array_equal(coords, ref_coords[[4, 1]])
+        self.assertEqual(steps, [ref_steps[4], ref_steps[1]])
+
+    def test_small_chunks(self):
+        fname = os.path.join("qe.traj", "traj6.pos")
+        natoms = 2
+        ref_coords, ref_steps = dpdata.qe.traj.load_data(fname, natoms)
+        # blocks and lines span the boundaries of the chunks
+        for chunk_size in (1, 7, 64):
+            with mock.patch.object(dpdata.qe.traj, "SCAN_CHUNK_SIZE", chunk_size):
+                coords, steps = dpdata.qe.traj.load_data(fname, natoms, memory_map=True)
+            np.testing.assert_array_equal(coords, ref_coords)
+            self.assertEqual(steps, ref_steps)
+
+    def test_incomplete_block(self):
+        with open(os.path.join("qe.traj", "traj6.pos")) as f:
+            text = f.read()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "traj.pos")
+            # two complete blocks without the last newline, and a header
+            lines = text.split("\n")
+            with open(fname, "w") as f:
+                f.write("\n".join(lines[:6]))
+            with dpdata.qe.traj.CPTrajBlocks(fname, 2) as blocks:
+                self.assertEqual(len(blocks), 2)
+                coords = blocks.get_blocks([1])
+            with open(fname, "w") as f:
+                f.write("\n".join(lines[:7]) + "\n")
+            with dpdata.qe.traj.CPTrajBlocks(fname, 2) as blocks:
+                self.assertEqual(len(blocks), 2)
+                np.testing.assert_array_equal(blocks.get_blocks([1]), coords)
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import bz2
+import gzip
 import io
+import lzma
+import os
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
 
-from dpdata.utils import open_file
+from comp_sys import CompLabeledSys, CompSys, IsPBC
+from context import dpdata
+
+from dpdata.utils import detect_compression, open_file
 
 
 class TestReadFile(unittest.TestCase):
@@ -20,3 +29,78 @@ class TestReadFile(unittest.TestCase):
     def test_open_file_from_file_path(self):
         with open_file(Path("/dev/null")) as file:
             self.assertEqual(file.read(), Path("/dev/null").read_text())
+
+
+class TestOpenCompressedFile(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.content = "Hello, world!\nSecond line\n"
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _roundtrip(self, suffix, opener):
+        fname = os.path.join(self.tmpdir.name, "file.txt" + suffix)
+        with open_file(fname, "w") as file:
+            file.write(self.content)
+        # the written file is compressed
+        with opener(fname, "rt") as file:
+            self.assertEqual(file.read(), self.content)
+        with open_file(fname) as file:
+            self.assertEqual(file.read(), self.content)
+
+    def test_gzip(self):
+        self._roundtrip(".gz", gzip.open)
+
+    def test_bz2(self):
+        self._roundtrip(".bz2", bz2.open)
+
+    def test_xz(self):
+        self._roundtrip(".xz", lzma.open)
+
+    def test_magic(self):
+        # the compression is detected by the magic number instead of the suffix
+        fname = os.path.join(self.tmpdir.name, "file.txt")
+        with gzip.open(fname, "wt") as file:
+            file.write(self.content)
+        self.assertEqual(detect_compression(fname), "gzip")
+        with open_file(fname) as file:
+            self.assertEqual(file.read(), self.content)
+
+    def test_plain(self):
+        fname = os.path.join(self.tmpdir.name, "file.gz")
+        with open(fname, "w") as file:
+            file.write(self.content)
+        self.assertIsNone(detect_compression(fname))
+        with open_file(fname) as file:
+            self.assertEqual(file.read(), self.content)
+
+
+class TestCompressedSystem(unittest.TestCase, CompSys, IsPBC):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.system_1 = dpdata.System("poscars/POSCAR.oh.d", fmt="vasp/poscar")
+        fname = os.path.join(self.tmpdir.name, "POSCAR.gz")
+        self.system_1.to("vasp/poscar", fname)
+        self.system_2 = dpdata.System(fname, fmt="vasp/poscar")
+        self.places = 6
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+
+class TestCompressedOUTCAR(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        fname = os.path.join(self.tmpdir.name, "OUTCAR.xz")
+        with open("poscars/OUTCAR.h2o.md", "rb") as fin, lzma.open(fname, "wb") as fout:
+            shutil.copyfileobj(fin, fout)
+        self.system_1 = dpdata.LabeledSystem("poscars/OUTCAR.h2o.md", fmt="vasp/outcar")
+        self.system_2 = dpdata.LabeledSystem(fname, fmt="vasp/outcar")
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
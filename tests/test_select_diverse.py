@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from context import dpdata
+
+from dpdata.diversity import (
+    farthest_point_sampling,
+    get_descriptors,
+    radial_descriptor,
+)
+
+
+class TestFarthestPointSampling(unittest.TestCase):
+    def test_line(self):
+        descriptors = np.array([[0.0], [1.0], [10.0], [5.0], [9.0]])
+        selected = farthest_point_sampling(descriptors, 3, chunk_size=2)
+        np.testing.assert_array_equal(selected, [0, 2, 3])
+
+    def test_duplicated(self):
+        descriptors = np.zeros((4, 2))
+        selected = farthest_point_sampling(descriptors, 4)
+        self.assertEqual(sorted(selected), [0, 1, 2, 3])
+
+    def test_too_many(self):
+        with self.assertRaises(RuntimeError):
+            farthest_point_sampling(np.zeros((2, 1)), 3)
+
+
+class TestRadialDescriptor(unittest.TestCase):
+    def test_pbc(self):
+        cell = np.eye(3) * 10.0
+        coords = np.array([[[0.5, 0.0, 0.0], [9.5, 0.0, 0.0]]])
+        desc = radial_descriptor(
+            coords, cell[None], np.array([0, 1]), 2, rcut=2.0, nbins=2
+        )
+        # only the O-H pair at distance 1.0 contributes
+        expected = np.zeros((1, 6))
+        expected[0, 2] = 0.5
+        np.testing.assert_allclose(desc, expected)
+
+    def test_chunk(self):
+        rng = np.random.default_rng(0)
+        cells = np.tile(np.eye(3) * 8.0, (5, 1, 1))
+        coords = rng.random((5, 6, 3)) * 8.0
+        atom_types = np.array([0, 0, 1, 1, 1, 1])
+        desc1 = radial_descriptor(coords, cells, atom_types, 2)
+        desc2 = radial_descriptor(coords, cells, atom_types, 2, chunk_size=2)
+        np.testing.assert_allclose(desc1, desc2)
+
+
+class TestSelectDiverse(unittest.TestCase):
+    def setUp(self):
+        self.system = dpdata.System("poscars/POSCAR.oh.d", fmt="vasp/poscar")
+        self.system = self.system.replicate((1, 1, 2))
+        # two identical frames and one expanded frame
+        expanded = self.system.copy()
+        expanded.data["coords"] *= 1.2
+        expanded.data["cells"] *= 1.2
+        self.system.append(self.system.copy())
+        self.system.append(expanded)
+
+    def test_system(self):
+        selected, idx = self.system.select_diverse(2)
+        np.testing.assert_array_equal(idx, [0, 2])
+        self.assertEqual(selected.get_nframes(), 2)
+
+    def test_multi_systems(self):
+        other = dpdata.System("poscars/POSCAR.oh.d", fmt="vasp/poscar")
+        ms = dpdata.MultiSystems(self.system, other)
+        selected, idx = ms.select_diverse(3)
+        self.assertEqual(selected.get_nframes(), 3)
+        self.assertEqual(sum(len(ii) for ii in idx.values()), 3)
+        np.testing.assert_array_equal(idx["O2H2"], [0, 2])
+
+    def test_custom_descriptor(self):
+        selected, idx = self.system.select_diverse(
+            1, descriptor=lambda ss: ss["cells"].reshape(len(ss), -1)
+        )
+        np.testing.assert_array_equal(idx, [0])
+
+    def test_custom_descriptor_kwargs(self):
+        def descriptor(ss, scale):
+            return ss["cells"].reshape(len(ss), -1) * scale
+
+        desc = get_descriptors(self.system, descriptor, chunk_size=2, scale=2.0)
+        np.testing.assert_allclose(
+            desc, self.system["cells"].reshape(len(self.system), -1) * 2.0
+        )
+
+    def test_chunk(self):
+        desc1 = get_descriptors(self.system)
+        desc2 = get_descriptors(self.system, chunk_size=2)
+        np.testing.assert_allclose(desc1, desc2)
+
+    def test_descriptor_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "descriptors.npy")
+            other = dpdata.System("poscars/POSCAR.oh.d", fmt="vasp/poscar")
+            ms = dpdata.MultiSystems(self.system, other)
+            selected, idx = ms.select_diverse(3, descriptor_file=fname, chunk_size=2)
+            np.testing.assert_array_equal(idx["O2H2"], [0, 2])
+            descriptors = np.load(fname, mmap_mode="r")
+            self.assertEqual(len(descriptors), ms.get_nframes())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ from __future__ import annotations
 import unittest
 
 import numpy as np
+from comp_sys import CompLabeledSys, IsPBC
 from context import dpdata
 
 
@@ -158,5 +159,22 @@ class TestAimdSIESTALabeledOutput(unittest.TestCase, TestSIESTASinglePointEnergy
         # self.system.data = dpdata.siesta.output.obtain_frame('siesta/siesta_output')
 
 
+class TestAimdSIESTABeginStep(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        self.system_1 = dpdata.LabeledSystem(
+            "siesta/aimd/output", fmt="siesta/aiMD_output", begin=1, step=2
+        )
+        self.system_2 = dpdata.LabeledSystem(
+            "siesta/aimd/output", fmt="siesta/aiMD_output"
+        )[1::2]
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+
+    def test_nframes(self):
+        self.assertEqual(self.system_1.get_nframes(), 2)
+
+
 if __name__ == "__main__":
     unittest.main()
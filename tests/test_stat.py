@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import gc
 import unittest
+import weakref
 
+import numpy as np
 from context import dpdata
 
 
@@ -31,3 +34,102 @@ class TestStat(unittest.TestCase):
         self.assertAlmostEqual(e.e_rmse, 1014.7946598792427, 6)
         self.assertAlmostEqual(e.f_mae, 0.004113640526088011, 6)
         self.assertAlmostEqual(e.f_rmse, 0.005714011247538185, 6)
+
+
+class TestStreamingErrors(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.system_1 = dpdata.LabeledSystem("poscars/OUTCAR.h2o.md", fmt="vasp/outcar")
+        self.system_2 = self.system_1.copy()
+        self.system_2.data["energies"] += rng.normal(size=self.system_2.get_nframes())
+        self.system_2.data["forces"] += rng.normal(size=self.system_2["forces"].shape)
+        self.system_2.data["virials"] += rng.normal(size=self.system_2["virials"].shape)
+        self.other_1 = dpdata.LabeledSystem(
+            "gaussian/methane.gaussianlog", fmt="gaussian/log"
+        )
+        self.other_2 = dpdata.LabeledSystem("amber/sqm_opt.out", fmt="sqm/out")
+
+    def test_system(self):
+        ref = dpdata.stat.Errors(self.system_1, self.system_2)
+        e = dpdata.stat.StreamingErrors(self.system_1, self.system_2, chunk_size=1)
+        self.assertAlmostEqual(e.e_mae, ref.e_mae, 10)
+        self.assertAlmostEqual(e.e_rmse, ref.e_rmse, 10)
+        self.assertAlmostEqual(e.f_mae, ref.f_mae, 10)
+        self.assertAlmostEqual(e.f_rmse, ref.f_rmse, 10)
+        self.assertAlmostEqual(e.f_max, np.max(np.abs(ref.f_errors)), 10)
+        self.assertEqual(e.force.n, ref.f_errors.size)
+        v_errors = self.system_1["virials"] - self.system_2["virials"]
+        self.assertAlmostEqual(e.virial.rmse, np.sqrt(np.mean(v_errors**2)), 10)
+
+    def test_by_element(self):
+        e = dpdata.stat.StreamingErrors(self.system_1, self.system_2, chunk_size=2)
+        f_errors = self.system_1["forces"] - self.system_2["forces"]
+        for ii, name in enumerate(self.system_1["atom_names"]):
+            mask = self.system_1["atom_types"] == ii
+            self.assertAlmostEqual(
+                e.by_element[name].mae, np.mean(np.abs(f_errors[:, mask])), 10
+            )
+
+    def test_multi_systems(self):
+        ms_1 = dpdata.MultiSystems(self.system_1, self.other_1)
+        ms_2 = dpdata.MultiSystems(self.system_2, self.other_2)
+        ref = dpdata.stat.MultiErrors(ms_1, ms_2)
+        e = dpdata.stat.StreamingErrors(ms_1, ms_2)
+        self.assertAlmostEqual(e.e_mae, ref.e_mae, 10)
+        self.assertAlmostEqual(e.e_rmse, ref.e_rmse, 10)
+        self.assertAlmostEqual(e.f_mae, ref.f_mae, 10)
+        self.assertAlmostEqual(e.f_rmse, ref.f_rmse, 10)
+        self.assertEqual(set(e.by_formula), set(ms_1.systems))
+        for formula, ss in ms_1.systems.items():
+            self.assertEqual(e.by_formula[formula]["energy"].n, len(ss))
+        # the methane system has no virials
+        self.assertEqual(e.virial.n, self.system_1["virials"].size)
+
+    def test_iterable(self):
+        def systems(ss):
+            # systems loaded lazily
+            yield from ss
+
+        e = dpdata.stat.StreamingErrors(
+            systems([self.system_1, self.other_1]),
+            systems([self.system_2, self.other_2]),
+        )
+        ref = dpdata.stat.StreamingErrors(
+            dpdata.MultiSystems(self.system_1, self.other_1),
+            dpdata.MultiSystems(self.system_2, self.other_2),
+        )
+        self.assertAlmostEqual(e.f_rmse, ref.f_rmse, 10)
+        with self.assertRaises(RuntimeError):
+            dpdata.stat.StreamingErrors(
+                systems([self.system_1, self.other_1]), systems([self.system_2])
+            )
+
+    def test_histogram(self):
+        bins = np.linspace(-10.0, 10.0, 41)
+        e = dpdata.stat.StreamingErrors(
+            self.system_1, self.system_2, chunk_size=1, f_bins=bins
+        )
+        f_errors = self.system_1["forces"] - self.system_2["forces"]
+        counts, edges = e.force.histogram
+        np.testing.assert_array_equal(counts, np.histogram(f_errors, bins=bins)[0])
+        np.testing.assert_array_equal(edges, bins)
+        with self.assertRaises(RuntimeError):
+            e.energy.histogram
+
+
+class TestErrorsRelease(unittest.TestCase):
+    def test_release(self):
+        system = dpdata.LabeledSystem(
+            "gaussian/methane.gaussianlog", fmt="gaussian/log"
+        )
+        e = dpdata.stat.Errors(system, system.copy())
+        self.assertEqual(e.f_mae, 0.0)
+        ref = weakref.ref(e)
+        del e
+        gc.collect()
+        # the cached errors do not keep the object alive
+        self.assertIsNone(ref())
+
+
+if __name__ == "__main__":
+    unittest.main()